@@ -0,0 +1,78 @@
+"""
+Micro-benchmark for the time codec, reports the per-value cost of decoding/encoding LSS time (and datetime) strings.
+
+Usage:
+    python -m benchmarks.bench_codec [--n-values 100000] [--repeat 5]
+"""
+
+import re
+import argparse
+import timeit
+import numpy as np
+import pandas as pd
+from pandas import Timedelta
+from saltysplits.annotations import decode_datetime, decode_time, encode_time
+from saltysplits.constants import DATETIME_FORMAT
+from saltysplits.codec import decode_datetimes, decode_nanoseconds, decode_times, encode_times
+
+
+def legacy_decode_time(value: str) -> Timedelta:
+    # decode_time as it was before saltysplits.codec (compiles the pattern and builds Timedelta from kwargs)
+    pattern = re.compile(
+        r"^(?:(?P<days>\d+)\.)?(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)(?:\.(?P<fraction>\d+))?$"
+    )
+    match = pattern.match(value)
+    groups = match.group("days", "hours", "minutes", "seconds", "fraction")
+    days, hours, minutes, seconds, fraction = map(lambda x: int(x) if x else 0, groups)
+    return Timedelta(
+        days=days, hours=hours, minutes=minutes, seconds=seconds, nanoseconds=fraction * 100
+    )
+
+
+def time_strings(n_values: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    nanoseconds = rng.integers(0, 3 * 3600 * 10**9, size=n_values) // 100 * 100
+    return list(encode_times(nanoseconds))
+
+
+def datetime_strings(n_values: int, seed: int = 0) -> list:
+    rng = np.random.default_rng(seed)
+    seconds = rng.integers(1_300_000_000, 1_800_000_000, size=n_values)
+    return list(pd.to_datetime(seconds, unit="s").strftime(DATETIME_FORMAT))
+
+
+def per_value(statement, n_values: int, repeat: int) -> float:
+    # best of repeat, in nanoseconds per value
+    return min(timeit.repeat(statement, number=1, repeat=repeat)) / n_values * 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--n-values", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    values = time_strings(args.n_values)
+    deltas = decode_times(values)
+    timedeltas = [Timedelta(value) for value in deltas]
+    datetimes = datetime_strings(args.n_values)
+
+    results = {
+        "legacy_decode_time": lambda: [legacy_decode_time(value) for value in values],
+        "decode_time": lambda: [decode_time(value) for value in values],
+        "decode_nanoseconds": lambda: [decode_nanoseconds(value) for value in values],
+        "decode_times": lambda: decode_times(values),
+        "encode_time": lambda: [encode_time(value) for value in timedeltas],
+        "encode_times": lambda: encode_times(deltas),
+        "decode_datetime": lambda: [decode_datetime(value) for value in datetimes],
+        "pd.to_datetime": lambda: pd.to_datetime(datetimes, format=DATETIME_FORMAT),
+        "decode_datetimes": lambda: decode_datetimes(datetimes),
+    }
+
+    print(f"{'function':<20} {'ns/value':>10}  (n={args.n_values}, best of {args.repeat})")
+    for name, statement in results.items():
+        print(f"{name:<20} {per_value(statement, args.n_values, args.repeat):>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
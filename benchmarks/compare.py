@@ -0,0 +1,39 @@
+"""
+Compares two result files written by benchmarks/run.py, reports the change in best time per case.
+
+Usage:
+    python -m benchmarks.compare baseline.json results.json [--threshold 1.1]
+"""
+
+import json
+import argparse
+from pathlib import Path
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("results", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.1, help="ratio above which a case is flagged as a regression")  # fmt: skip
+    args = parser.parse_args()
+
+    baseline = {result["name"]: result for result in json.loads(args.baseline.read_text())["results"]}  # fmt: skip
+    results = json.loads(args.results.read_text())["results"]
+
+    regressions = 0
+    print(f"{'case':<90} {'baseline':>12} {'current':>12} {'ratio':>8}")
+    for result in results:
+        if result["name"] not in baseline:
+            continue
+        before, after = baseline[result["name"]]["best"], result["best"]
+        ratio = after / before if before else float("inf")
+        flag = "  <-" if ratio > args.threshold else ""
+        regressions += ratio > args.threshold
+        print(
+            f"{result['name']:<90} {before * 1e3:>10.2f}ms {after * 1e3:>10.2f}ms {ratio:>8.2f}{flag}"
+        )
+    print(f"\n{regressions} case(s) slower than {args.threshold:.2f}x the baseline")
+
+
+if __name__ == "__main__":
+    main()
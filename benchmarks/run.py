@@ -0,0 +1,210 @@
+"""
+Benchmark suite for saltysplits, times parsing, validation and analysis on a synthetic LiveSplit file and writes the results as JSON.
+
+Usage:
+    python -m benchmarks.run [--segments 30] [--attempts 1000] [--repeat 5] [--filter to_df] [--output results.json]
+"""
+
+import re
+import sys
+import json
+import time
+import argparse
+import platform
+import tempfile
+import itertools
+import importlib.util
+import statistics
+from pathlib import Path
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+from pandas import Timedelta
+from saltysplits import SaltySplits
+from saltysplits.enums import DownsampleMethod, TimeType
+from saltysplits.annotations import encode_time
+from saltysplits.dashboard import DashboardBundle
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.downsample import downsample_indices
+from saltysplits.offsets import index_lss, load_segment, scan_offsets
+from saltysplits.rolling import RollingStats
+from saltysplits.simulate import PBSimulator
+from benchmarks.synthetic import generate_lss
+
+# bump whenever the layout of the JSON output changes
+RESULTS_FORMAT = 1
+PACKAGES = ["saltysplits", "numpy", "pandas", "lxml", "pydantic", "pydantic-xml", "pillow", "pyarrow"]
+
+
+def measure(statement: Callable[[], object], repeat: int, setup: Optional[Callable[[], object]] = None) -> Dict[str, float]:  # fmt: skip
+    """
+    Times a statement repeat times (setup runs before every repetition, but isn't timed)
+
+    Args:
+        statement (Callable[[], object]): Code to time
+        repeat (int): Number of repetitions
+        setup (Optional[Callable[[], object]], optional): Code to run before every repetition (e.g. to drop caches). Defaults to None.
+
+    Returns:
+        Dict[str, float]: Best, median and mean duration in seconds
+    """
+
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        start = time.perf_counter()
+        statement()
+        durations.append(time.perf_counter() - start)
+    return {
+        "best": min(durations),
+        "median": statistics.median(durations),
+        "mean": statistics.fmean(durations),
+    }
+
+
+def dashboard_metrics(splits: SaltySplits, time_type: TimeType) -> List[str]:
+    # same aggregates the Streamlit dashboard shows (see splits_metrics in saltysplits.streamlit)
+    summary = splits.columns.summary(time_type=time_type)
+    values = [summary.best_run_time, summary.sum_of_best, summary.possible_timesave, summary.life_playtime]  # fmt: skip
+    return [encode_time(Timedelta(value), include_ns=False) for value in values] + list(summary.top_k(2).index)  # fmt: skip
+
+
+def cases(lss_path: Path, lss_bytes: bytes, output_dir: Path) -> Iterator[Tuple[str, Callable, Optional[Callable]]]:  # fmt: skip
+    """
+    Yields all benchmark cases as (name, statement, setup), setup is None if the statement can run back to back
+
+    Args:
+        lss_path (Path): Path to the synthetic LiveSplit file
+        lss_bytes (bytes): Contents of the synthetic LiveSplit file
+        output_dir (Path): Directory for files written by the benchmarks
+
+    Yields:
+        Tuple[str, Callable, Optional[Callable]]: Name, statement and optional setup of every case
+    """
+
+    splits = SaltySplits.read_lss(lss_path, lazy_icons=True)
+    eager = SaltySplits.read_lss(lss_path)
+
+    yield "read_lss", lambda: SaltySplits.read_lss(lss_path), None
+    yield "read_lss[lazy_icons=True]", lambda: SaltySplits.read_lss(lss_path, lazy_icons=True), None  # fmt: skip
+    yield "read_lss[compact=True]", lambda: SaltySplits.read_lss(lss_path, compact=True), None
+    yield "from_xml", lambda: SaltySplits.from_xml(lss_bytes), None
+    yield "_collect_ids", splits._collect_ids, None
+    yield "run_index[cold]", lambda: splits.run_index, splits.reset_columns
+    last_id = splits.attempt_history[-1].id
+    yield "get_run", lambda: splits.get_run(last_id), None
+    yield "to_columns", splits.to_columns, None
+
+    # rolling statistics of all runs at once, compared to continuing them with the last 10 runs
+    columns = splits.to_columns()
+    matrix, head = columns.real_time, len(columns.run_ids) - 10
+    yield "rolling[batch]", lambda: RollingStats.from_matrix(matrix, columns.segment_names, columns.run_ids, quantiles=(0.1, 0.9)), None  # fmt: skip
+    head_stats = RollingStats.from_matrix(matrix[:, :head], columns.segment_names, columns.run_ids[:head], quantiles=(0.1, 0.9))  # fmt: skip
+    yield "rolling[append]", lambda: head_stats.append(matrix[:, head:], columns.run_ids[head:]), None  # fmt: skip
+
+    # live PB prediction from halfway through a run (DEFAULT_RUNS runs, as after every split)
+    simulator = PBSimulator.from_matrix(matrix, columns.segment_names, half_life=50)
+    yield "simulate", lambda: simulator.run(completed=len(columns.segment_names) // 2), None
+    yield "attempts_to_df", splits.attempts_to_df, None
+
+    # to_df builds the columns from the models on every call, columns.to_df only builds the frame from the cached snapshot
+    yield "to_df", lambda: splits.to_df(allow_partial=True), None
+    flags = itertools.product(list(TimeType), *[[False, True]] * 5)
+    for time_type, allow_partial, allow_empty, cumulative, lss_repr, lss_ns in flags:
+        if lss_ns and not lss_repr:
+            # lss_ns only affects the string representation
+            continue
+        name = f"columns.to_df[{time_type.name.lower()},partial={allow_partial:d},empty={allow_empty:d},cumulative={cumulative:d},lss_repr={lss_repr:d},lss_ns={lss_ns:d}]"  # fmt: skip
+        kwargs = dict(time_type=time_type, allow_partial=allow_partial, allow_empty=allow_empty, cumulative=cumulative, lss_repr=lss_repr, lss_ns=lss_ns)  # fmt: skip
+        yield name, lambda kwargs=kwargs: splits.columns.to_df(**kwargs), None
+
+    yield "to_xml", eager.to_xml, None
+    yield "write_lss", lambda: splits.write_lss(output_dir / "splits.lss", source=lss_path), None
+    # exports of all splits, CSV (through the wide frame) as the baseline for Arrow/Parquet (skipped without pyarrow)
+    yield "to_csv", lambda: splits.to_df(allow_partial=True).to_csv(output_dir / "splits.csv"), None
+    if importlib.util.find_spec("pyarrow") is not None:
+        yield "to_arrow", splits.to_arrow, None
+        yield "to_parquet", lambda: splits.to_parquet(output_dir / "splits.parquet"), None
+    yield "scan_offsets", lambda: scan_offsets(lss_path), None
+    index_lss(lss_path, index_path=output_dir / "offsets.json")
+    yield "load_segment", lambda: load_segment(lss_path, -1, index_path=output_dir / "offsets.json"), None  # fmt: skip
+    yield "dashboard_bundle", lambda: DashboardBundle.from_bytes(lss_bytes), None
+    # splits of every run for the first segment, reduced to a tenth
+    first_splits = splits.columns.real_time[0][splits.columns.real_time[0] != NANOSECONDS_NAT]
+    for method in DownsampleMethod:
+        yield f"downsample[{method.value}]", lambda method=method: downsample_indices(first_splits, max_points=max(len(first_splits) // 10, 10), method=method), None  # fmt: skip
+    for time_type in TimeType:
+        yield f"dashboard_metrics[{time_type.name.lower()},cold]", lambda time_type=time_type: dashboard_metrics(splits, time_type), splits.reset_columns  # fmt: skip
+        yield f"dashboard_metrics[{time_type.name.lower()},warm]", lambda time_type=time_type: dashboard_metrics(splits, time_type), None  # fmt: skip
+
+
+def environment() -> Dict[str, object]:
+    packages = {}
+    for package in PACKAGES:
+        try:
+            packages[package] = version(package)
+        except PackageNotFoundError:
+            packages[package] = None
+    return {
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "packages": packages,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--segments", type=int, default=30)
+    parser.add_argument("--attempts", type=int, default=1000)
+    parser.add_argument("--reset-rate", type=float, default=0.05)
+    parser.add_argument("--reset-distribution", choices=["geometric", "uniform"], default="geometric")  # fmt: skip
+    parser.add_argument("--no-game-time", action="store_true")
+    parser.add_argument("--icon-size", type=int, default=64)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--filter", type=str, default=None, help="only runs cases whose name matches this regex")  # fmt: skip
+    parser.add_argument("--output", type=Path, default=None, help="defaults to stdout")
+    args = parser.parse_args()
+
+    generator = dict(
+        n_segments=args.segments,
+        n_attempts=args.attempts,
+        reset_rate=args.reset_rate,
+        reset_distribution=args.reset_distribution,
+        game_time=not args.no_game_time,
+        icon_size=args.icon_size,
+        seed=args.seed,
+    )
+    lss_bytes = generate_lss(**generator)
+    results = []
+    with tempfile.TemporaryDirectory(prefix="saltysplits-bench-") as temp_dir:
+        lss_path = Path(temp_dir) / "synthetic.lss"
+        lss_path.write_bytes(lss_bytes)
+        n_splits = sum(len(segment.segment_history or []) for segment in SaltySplits.read_lss(lss_path, compact=True).segments)  # fmt: skip
+
+        for name, statement, setup in cases(lss_path, lss_bytes, Path(temp_dir)):
+            if args.filter is not None and not re.search(args.filter, name):
+                continue
+            timings = measure(statement, repeat=args.repeat, setup=setup)
+            results.append({"name": name, "repeat": args.repeat, **timings})
+            print(f"{name:<90} {timings['best'] * 1e3:>10.2f} ms", file=sys.stderr)
+
+    report = {
+        "format": RESULTS_FORMAT,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "environment": environment(),
+        "generator": {**generator, "n_bytes": len(lss_bytes)},
+        "n_splits": n_splits,
+        "results": results,
+    }
+    output = json.dumps(report, indent=2)
+    if args.output is None:
+        print(output)
+    else:
+        args.output.write_text(output + "\n", encoding="utf-8")
+
+
+if __name__ == "__main__":
+    main()
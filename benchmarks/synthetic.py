@@ -0,0 +1,193 @@
+"""
+Deterministic generator of synthetic LiveSplit files (LSS), used to benchmark saltysplits at arbitrary scales.
+
+Usage:
+    python -m benchmarks.synthetic out.lss [--segments 30] [--attempts 1000] [--reset-rate 0.05] [--icon-size 64]
+"""
+
+import io
+import base64
+import argparse
+import numpy as np
+from PIL import Image
+from pathlib import Path
+from datetime import datetime, timedelta
+from typing import Literal, Optional
+from xml.sax.saxutils import escape
+from saltysplits.codec import encode_times
+from saltysplits.constants import DATETIME_FORMAT, NANOSECONDS_NAT, NANOSECONDS_SECOND
+
+# header of a BinaryFormatter serialized System.Drawing.Bitmap, the PNG stream is appended as is (see saltysplits.icons)
+BITMAP_HEADER = base64.b64decode(
+    "AAEAAAD/////AQAAAAAAAAAMAgAAAFFTeXN0ZW0uRHJhd2luZywgVmVyc2lvbj00LjAuMC4wLCBDdWx0dXJlPW5ldXRyYWws"
+    "IFB1YmxpY0tleVRva2VuPWIwM2Y1ZjdmMTFkNTBhM2EFAQAAABVTeXN0ZW0uRHJhd2luZy5CaXRtYXABAAAABERhdGEHAgIA"
+    "AAAJAwAAAA8="
+)
+START_DATE = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def icon_payload(rng: np.random.Generator, icon_size: int) -> str:
+    # noise compresses poorly, so the payload size is representative of real (photo-like) icons
+    pixels = rng.integers(0, 256, size=(icon_size, icon_size, 4), dtype=np.uint8)
+    buffer = io.BytesIO()
+    Image.fromarray(pixels, mode="RGBA").save(buffer, format="PNG")
+    png = buffer.getvalue()
+    # object ID, length and element type (byte) of the array that holds the PNG, followed by the end of the stream
+    array_header = (3).to_bytes(4, "little") + len(png).to_bytes(4, "little") + b"\x02"
+    return base64.b64encode(BITMAP_HEADER + array_header + png + b"\x0b").decode()
+
+
+def _time_elements(real_time: Optional[str], game_time: Optional[str], indent: str) -> str:
+    elements = ""
+    if real_time is not None:
+        elements += f"\n{indent}<RealTime>{real_time}</RealTime>"
+    if game_time is not None:
+        elements += f"\n{indent}<GameTime>{game_time}</GameTime>"
+    return elements
+
+
+def _timed(tag: str, attributes: str, real_time: Optional[str], game_time: Optional[str], depth: int) -> str:  # fmt: skip
+    indent = "  " * depth
+    children = _time_elements(real_time, game_time, indent + "  ")
+    if not children:
+        return f"\n{indent}<{tag}{attributes} />"
+    return f"\n{indent}<{tag}{attributes}>{children}\n{indent}</{tag}>"
+
+
+def generate_lss(
+    n_segments: int = 30,
+    n_attempts: int = 1000,
+    reset_rate: float = 0.05,
+    reset_distribution: Literal["geometric", "uniform"] = "geometric",
+    game_time: bool = True,
+    icon_size: int = 0,
+    seed: int = 0,
+) -> bytes:
+    """
+    Generates a synthetic LiveSplit file with the same layout as the files written by LiveSplit itself.
+    The same arguments always produce the same bytes
+
+    Args:
+        n_segments (int, optional): Number of segments. Defaults to 30.
+        n_attempts (int, optional): Number of attempts (i.e. runs). Defaults to 1000.
+        reset_rate (float, optional): Chance to reset in every segment (geometric) or chance that a run resets at all (uniform). Defaults to 0.05.
+        reset_distribution (Literal["geometric", "uniform"], optional): Whether resets happen with the same chance in every segment (so early resets
+            are more common) or at a uniformly distributed segment. Defaults to "geometric".
+        game_time (bool, optional): Whether splits have GameTime values (next to RealTime). Defaults to True.
+        icon_size (int, optional): Width and height of the (random) game and segment icons in pixels, 0 for no icons. Defaults to 0.
+        seed (int, optional): Seed of the random number generator. Defaults to 0.
+
+    Returns:
+        bytes: Contents of the LiveSplit file (UTF-8 with BOM)
+    """
+
+    rng = np.random.default_rng(seed)
+
+    # segment durations drift down over time (i.e. the runner improves), with lognormal noise per split
+    base = rng.uniform(30, 300, size=n_segments) * NANOSECONDS_SECOND
+    improvement = np.linspace(1.15, 1.0, n_attempts)
+    noise = rng.lognormal(mean=0.0, sigma=0.05, size=(n_segments, n_attempts))
+    real_times = (base[:, None] * improvement[None, :] * noise).astype(np.int64) // 100 * 100
+    loading = rng.uniform(0.0, 2.0, size=(n_segments, n_attempts)) * NANOSECONDS_SECOND
+    game_times = np.maximum(real_times - loading.astype(np.int64) // 100 * 100, 0)
+
+    # number of completed segments per attempt (n_segments if the run was finished)
+    if reset_distribution == "geometric":
+        completed = np.minimum(rng.geometric(reset_rate, size=n_attempts) - 1, n_segments) if reset_rate > 0 else np.full(n_attempts, n_segments)  # fmt: skip
+    elif reset_distribution == "uniform":
+        resets = rng.random(n_attempts) < reset_rate
+        completed = np.where(resets, rng.integers(0, n_segments, size=n_attempts), n_segments)
+    else:
+        raise ValueError(f"Unknown reset distribution '{reset_distribution}', expected 'geometric' or 'uniform'")  # fmt: skip
+
+    missing = np.arange(n_segments)[:, None] >= completed[None, :]
+    real_times[missing] = NANOSECONDS_NAT
+    game_times[missing] = NANOSECONDS_NAT
+    real_strings = encode_times(real_times)
+    game_strings = encode_times(game_times) if game_time else np.full(real_times.shape, None)
+
+    finished = completed == n_segments
+    totals = np.where(finished, real_times.sum(axis=0, where=~missing), NANOSECONDS_NAT)
+    game_totals = np.where(finished, game_times.sum(axis=0, where=~missing), NANOSECONDS_NAT)
+    total_strings = encode_times(totals)
+    game_total_strings = encode_times(game_totals) if game_time else np.full(n_attempts, None)
+
+    def icon(tag: str) -> str:
+        if not icon_size:
+            return f"<{tag} />"
+        return f"<{tag}><![CDATA[{icon_payload(rng, icon_size)}]]></{tag}>"
+
+    parts = ['\ufeff<?xml version="1.0" encoding="UTF-8"?>', '\n<Run version="1.7.0">']
+    parts.append(f"\n  {icon('GameIcon')}")
+    parts.append("\n  <GameName>Synthetic Game</GameName>\n  <CategoryName>Any%</CategoryName>")
+    parts.append("\n  <LayoutPath>\n  </LayoutPath>")
+    parts.append(
+        '\n  <Metadata>\n    <Run id="" />\n    <Platform usesEmulator="False">\n    </Platform>'
+    )
+    parts.append(
+        "\n    <Region>\n    </Region>\n    <Variables />\n    <CustomVariables />\n  </Metadata>"
+    )
+    parts.append(f"\n  <Offset>00:00:00</Offset>\n  <AttemptCount>{n_attempts}</AttemptCount>")
+
+    parts.append("\n  <AttemptHistory>")
+    started = START_DATE
+    for attempt in range(n_attempts):
+        duration = int(real_times[:, attempt].sum(where=~missing[:, attempt])) // 10**9 + 5
+        ended = started + timedelta(seconds=duration)
+        attributes = f' id="{attempt + 1}" started="{started.strftime(DATETIME_FORMAT)}" isStartedSynced="True" ended="{ended.strftime(DATETIME_FORMAT)}" isEndedSynced="True"'  # fmt: skip
+        parts.append(_timed("Attempt", attributes, total_strings[attempt], game_total_strings[attempt], 2))  # fmt: skip
+        started = ended + timedelta(seconds=30)
+    parts.append("\n  </AttemptHistory>")
+
+    best_run = np.argmin(np.where(finished, totals, np.iinfo(np.int64).max)) if finished.any() else None  # fmt: skip
+    parts.append("\n  <Segments>")
+    for segment in range(n_segments):
+        parts.append(f"\n    <Segment>\n      <Name>{escape(f'Segment {segment + 1}')}</Name>")
+        parts.append(f"\n      {icon('Icon')}")
+
+        pb_real = encode_times(real_times[: segment + 1, best_run].sum(keepdims=True))[0] if best_run is not None else None  # fmt: skip
+        pb_game = encode_times(game_times[: segment + 1, best_run].sum(keepdims=True))[0] if best_run is not None and game_time else None  # fmt: skip
+        parts.append("\n      <SplitTimes>")
+        parts.append(_timed("SplitTime", ' name="Personal Best"', pb_real, pb_game, 4))
+        parts.append("\n      </SplitTimes>")
+
+        present = ~missing[segment]
+        best_real = encode_times(real_times[segment][present].min(keepdims=True))[0] if present.any() else None  # fmt: skip
+        best_game = encode_times(game_times[segment][present].min(keepdims=True))[0] if present.any() and game_time else None  # fmt: skip
+        parts.append(_timed("BestSegmentTime", "", best_real, best_game, 3))
+
+        parts.append("\n      <SegmentHistory>")
+        for attempt in np.flatnonzero(present):
+            parts.append(_timed("Time", f' id="{attempt + 1}"', real_strings[segment, attempt], game_strings[segment, attempt], 4))  # fmt: skip
+        parts.append("\n      </SegmentHistory>\n    </Segment>")
+    parts.append("\n  </Segments>")
+    parts.append("\n  <AutoSplitterSettings />\n</Run>")
+    return "".join(parts).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("lss_path", type=Path)
+    parser.add_argument("--segments", type=int, default=30)
+    parser.add_argument("--attempts", type=int, default=1000)
+    parser.add_argument("--reset-rate", type=float, default=0.05)
+    parser.add_argument("--reset-distribution", choices=["geometric", "uniform"], default="geometric")  # fmt: skip
+    parser.add_argument("--no-game-time", action="store_true")
+    parser.add_argument("--icon-size", type=int, default=0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    lss_bytes = generate_lss(
+        n_segments=args.segments,
+        n_attempts=args.attempts,
+        reset_rate=args.reset_rate,
+        reset_distribution=args.reset_distribution,
+        game_time=not args.no_game_time,
+        icon_size=args.icon_size,
+        seed=args.seed,
+    )
+    args.lss_path.write_bytes(lss_bytes)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,61 @@
 import pathlib
-from .main import SaltySplits
+from typing import TYPE_CHECKING
 from .enums import TimeType as TimeType
-from functools import partial as _partial
+from .metadata import read_metadata as read_metadata, LssMetadata as LssMetadata
+from .profiling import profile as profile, add_hook as add_hook, remove_hook as remove_hook
+
+if TYPE_CHECKING:
+    from .main import SaltySplits as SaltySplits
+    from .stream import (
+        iter_lss as iter_lss,
+        read_lss_columns as read_lss_columns,
+        read_lss_frame as read_lss_frame,
+    )
+    from .batch import read_many as read_many, iter_many as iter_many
+    from .corpus import SplitsCorpus as SplitsCorpus
+    from .icons import load_icon as load_icon
+    from .watch import SplitsWatcher as SplitsWatcher
+    from .offsets import index_lss as index_lss, load_segment as load_segment
+
+    read_lss = SaltySplits.read_lss
 
 DEMO_SPLITS = pathlib.Path(__file__).parents[2] / "tests/run_files/gcb.lss"
 LOGO_PATH = pathlib.Path(__file__).parents[2] / "docs/assets/images/logo.png"
 
-# forwarding read_lss to main module (+ docs)
-read_lss = _partial(SaltySplits.read_lss)
-read_lss.__doc__ = SaltySplits.read_lss.__doc__
+# attributes that pull in pandas/NumPy/pydantic(-xml)/Pillow, only imported on first access (see __getattr__)
+_LAZY_ATTRIBUTES = {
+    "SaltySplits": "main",
+    "iter_lss": "stream",
+    "read_lss_columns": "stream",
+    "read_lss_frame": "stream",
+    "read_many": "batch",
+    "iter_many": "batch",
+    "SplitsCorpus": "corpus",
+    "load_icon": "icons",
+    "SplitsWatcher": "watch",
+    "index_lss": "offsets",
+    "load_segment": "offsets",
+}
+
+
+def __getattr__(name: str) -> object:
+    if name == "read_lss":
+        # forwarding read_lss to main module (+ docs)
+        from functools import partial
+
+        saltysplits = __getattr__("SaltySplits")
+        value = partial(saltysplits.read_lss)
+        value.__doc__ = saltysplits.read_lss.__doc__
+    elif name in _LAZY_ATTRIBUTES:
+        # same as `from .module import name` (unlike importlib.import_module, shows up in python -X importtime)
+        module = __import__(_LAZY_ATTRIBUTES[name], globals(), fromlist=[name], level=1)
+        value = getattr(module, name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    # cached as a regular attribute, so __getattr__ only runs once per name
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES) | {"read_lss"})
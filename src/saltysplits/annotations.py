@@ -1,8 +1,9 @@
-import re
+from numpy import timedelta64
 from pandas import Timedelta
 from datetime import datetime
 from pydantic import BeforeValidator, PlainSerializer
 from typing import Optional, Annotated, List
+from saltysplits.codec import decode_nanoseconds
 from saltysplits.constants import (
     DATETIME_FORMAT,
     NANOSECONDS_DAY,
@@ -23,24 +24,9 @@ def decode_time(value: str) -> Timedelta:
         Timedelta: Timedelta representation of the input string
     """
 
-    pattern = re.compile(
-        r"^(?:(?P<days>\d+)\.)?(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)(?:\.(?P<fraction>\d+))?$"
-    )
-    match = pattern.match(value)
-    assert match, (
-        "Invalid time format, expected 'HH:MM:SS' (with optional days prefix and fraction suffix)"
-    )
-    groups = match.group("days", "hours", "minutes", "seconds", "fraction")
-    days, hours, minutes, seconds, fraction = map(lambda x: int(x) if x else 0, groups)
-    nanoseconds = fraction * 100
-
-    return Timedelta(
-        days=days,
-        hours=hours,
-        minutes=minutes,
-        seconds=seconds,
-        nanoseconds=nanoseconds,
-    )
+    # pattern is precompiled in saltysplits.codec, fixed-format values don't even reach it
+    # (going through timedelta64 is considerably cheaper than Timedelta's integer constructor)
+    return Timedelta(timedelta64(decode_nanoseconds(value), "ns"))
 
 
 def parse_timedelta(timedelta: Timedelta) -> List[int]:
@@ -0,0 +1,91 @@
+from __future__ import annotations
+import numpy as np
+from pathlib import Path
+from typing import Any, Dict
+from saltysplits.columnar import SplitsColumns
+from saltysplits.constants import NANOSECONDS_NAT
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.parquet as pq
+except ImportError as error:
+    raise ImportError(
+        "Arrow/Parquet export requires pyarrow, install it with `pip install saltysplits[arrow]`"
+    ) from error
+
+SCHEMA = pa.schema(
+    [
+        ("run_id", pa.string()),
+        ("segment_index", pa.int32()),
+        ("segment_name", pa.string()),
+        ("real_time", pa.duration("ns")),
+        ("game_time", pa.duration("ns")),
+        ("attempt_started", pa.timestamp("ns")),
+        ("attempt_ended", pa.timestamp("ns")),
+    ]
+)
+
+
+def _durations(values: np.ndarray) -> pa.Array:
+    # wraps the int64 buffer as is, NANOSECONDS_NAT becomes null
+    return pa.array(values.view("timedelta64[ns]"), type=pa.duration("ns"), mask=values == NANOSECONDS_NAT)  # fmt: skip
+
+
+def _timestamps(values: np.ndarray) -> pa.Array:
+    return pa.array(values, type=pa.timestamp("ns"), mask=np.isnat(values))
+
+
+def columns_to_arrow(columns: SplitsColumns) -> pa.Table:
+    """
+    Represents the splits as a long-format Arrow table, with one row per run and segment that has a RealTime or GameTime split
+    (ordered by run, then segment). Built from the int64 matrices with whole-array operations, strings are only created once per run
+    ID/segment name and gathered with pyarrow.compute.take. Game and category are kept in the schema metadata
+
+    Args:
+        columns (SplitsColumns): Columnar representation of the splits (see SaltySplits.columns)
+
+    Returns:
+        pa.Table: Table with the columns of SCHEMA (times as duration[ns], attempt start/end as timestamp[ns], nulls if missing)
+    """
+
+    present = (columns.real_time != NANOSECONDS_NAT) | (columns.game_time != NANOSECONDS_NAT)
+    run_rows, segment_rows = np.nonzero(present.T)
+
+    # attempt start/end per run (position -1 picks the appended NaT for runs without an Attempt)
+    attempt_positions = {attempt_id: i for i, attempt_id in enumerate(columns.attempt_ids)}
+    run_attempts = np.array([attempt_positions.get(run_id, -1) for run_id in columns.run_ids], dtype=np.intp)  # fmt: skip
+    started = np.append(columns.attempt_started, np.datetime64("NaT", "ns"))[run_attempts]
+    ended = np.append(columns.attempt_ended, np.datetime64("NaT", "ns"))[run_attempts]
+
+    run_ids = pa.array(columns.run_ids, type=pa.string())
+    segment_names = pa.array(columns.segment_names, type=pa.string())
+    metadata: Dict[Any, Any] = {
+        "saltysplits.game_name": columns.game_name or "",
+        "saltysplits.category_name": columns.category_name or "",
+    }
+    return pa.Table.from_arrays(
+        [
+            pc.take(run_ids, pa.array(run_rows)),
+            pa.array(segment_rows.astype(np.int32)),
+            pc.take(segment_names, pa.array(segment_rows)),
+            _durations(columns.real_time[segment_rows, run_rows]),
+            _durations(columns.game_time[segment_rows, run_rows]),
+            _timestamps(started[run_rows]),
+            _timestamps(ended[run_rows]),
+        ],
+        schema=SCHEMA.with_metadata(metadata),
+    )
+
+
+def write_parquet(table: pa.Table, path: Path, **kwargs: Any) -> None:
+    """
+    Writes a table (e.g. from columns_to_arrow) as a Parquet file
+
+    Args:
+        table (pa.Table): Long-format table of the splits
+        path (Path): Destination of the Parquet file
+        **kwargs: Forwarded to pyarrow.parquet.write_table (e.g. compression)
+    """
+
+    pq.write_table(table, str(path), **kwargs)
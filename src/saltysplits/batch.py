@@ -0,0 +1,123 @@
+from __future__ import annotations
+import os
+from collections import deque
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    ThreadPoolExecutor,
+    wait,
+)
+from pathlib import Path
+from typing import Iterable, Iterator, List, Literal, NamedTuple, Optional
+from saltysplits.columnar import SplitsColumns
+from saltysplits.stream import read_lss_columns
+
+# number of files submitted ahead per worker (bounds memory use for large batches)
+PREFETCH_PER_WORKER = 4
+
+
+class BatchResult(NamedTuple):
+    path: Path
+    columns: Optional[SplitsColumns]
+    error: Optional[BaseException]
+
+
+def _read_columns(lss_path: Path, cache_dir: Optional[Path]) -> BatchResult:
+    # runs in the worker, errors are returned (not raised) so one bad file doesn't abort the batch
+    try:
+        return BatchResult(lss_path, read_lss_columns(lss_path, cache_dir=cache_dir), None)
+    except Exception as error:
+        return BatchResult(lss_path, None, error)
+
+
+def _create_executor(executor: Literal["process", "thread"], workers: int) -> Executor:
+    if executor == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    elif executor == "thread":
+        return ThreadPoolExecutor(max_workers=workers)
+    raise ValueError(f"Unknown executor '{executor}', expected 'process' or 'thread'")
+
+
+def _collect(path: Path, future: Future) -> BatchResult:
+    # covers errors that happen outside of _read_columns (e.g. a worker that died or a result that failed to pickle)
+    try:
+        return future.result()
+    except Exception as error:
+        return BatchResult(path, None, error)
+
+
+def iter_many(
+    lss_paths: Iterable[Path],
+    workers: Optional[int] = None,
+    executor: Literal["process", "thread"] = "process",
+    ordered: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> Iterator[BatchResult]:
+    """
+    Reads many LiveSplit files (LSS) in parallel through read_lss_columns and yields their results as they become available.
+    Workers return SplitsColumns (compact numpy arrays) instead of pydantic-xml models, errors are yielded instead of raised
+
+    Args:
+        lss_paths (Iterable[Path]): Paths to the LiveSplit files (.LSS)
+        workers (Optional[int], optional): Number of workers. Defaults to None (os.cpu_count()).
+        executor (Literal["process", "thread"], optional): Whether to parse in a process pool or thread pool. Defaults to "process".
+        ordered (bool, optional): Whether to yield results in the order of lss_paths or as soon as they complete. Defaults to True.
+        cache_dir (Optional[Path], optional): Directory for a persistent ColumnsCache (see read_lss_columns). Defaults to None.
+
+    Yields:
+        BatchResult: Path with either its SplitsColumns or the error that was raised while reading it
+    """
+
+    workers = workers or os.cpu_count() or 1
+    prefetch = workers * PREFETCH_PER_WORKER
+    pending_paths = iter(lss_paths)
+    in_flight: deque = deque()
+
+    with _create_executor(executor, workers) as pool:
+
+        def submit() -> bool:
+            path = next(pending_paths, None)
+            if path is None:
+                return False
+            in_flight.append((path, pool.submit(_read_columns, path, cache_dir)))
+            return True
+
+        while len(in_flight) < prefetch and submit():
+            pass
+
+        while in_flight:
+            if ordered:
+                path, future = in_flight.popleft()
+            else:
+                done, _ = wait([future for _, future in in_flight], return_when=FIRST_COMPLETED)
+                path, future = next((path, future) for path, future in in_flight if future in done)
+                in_flight.remove((path, future))
+
+            submit()
+            yield _collect(path, future)
+
+
+def read_many(
+    lss_paths: Iterable[Path],
+    workers: Optional[int] = None,
+    executor: Literal["process", "thread"] = "process",
+    cache_dir: Optional[Path] = None,
+) -> List[BatchResult]:
+    """
+    Reads many LiveSplit files (LSS) in parallel through read_lss_columns (see iter_many)
+
+    Args:
+        lss_paths (Iterable[Path]): Paths to the LiveSplit files (.LSS)
+        workers (Optional[int], optional): Number of workers. Defaults to None (os.cpu_count()).
+        executor (Literal["process", "thread"], optional): Whether to parse in a process pool or thread pool. Defaults to "process".
+        cache_dir (Optional[Path], optional): Directory for a persistent ColumnsCache (see read_lss_columns). Defaults to None.
+
+    Returns:
+        List[BatchResult]: Results in the same order as lss_paths (check BatchResult.error for files that failed)
+    """
+
+    return list(
+        iter_many(lss_paths, workers=workers, executor=executor, ordered=True, cache_dir=cache_dir)
+    )
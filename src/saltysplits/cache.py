@@ -0,0 +1,134 @@
+from __future__ import annotations
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import numpy as np
+from pathlib import Path
+from importlib.metadata import PackageNotFoundError, version
+from typing import Optional
+from saltysplits.columnar import SplitsColumns
+
+# bump whenever the on-disk layout changes (invalidates all existing entries)
+CACHE_FORMAT = 1
+DEFAULT_CACHE_SIZE = 512 * 2**20
+META_FIELDS = ("game_name", "category_name", "attempt_count", "segment_names", "run_ids", "attempt_ids")  # fmt: skip
+ARRAY_FIELDS = (
+    "real_time",
+    "game_time",
+    "attempt_started",
+    "attempt_ended",
+    "attempt_started_synced",
+    "attempt_ended_synced",
+    "attempt_real_time",
+    "attempt_game_time",
+)
+
+
+def _library_version() -> str:
+    try:
+        return version("saltysplits")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+class ColumnsCache:
+    """
+    On-disk cache of SplitsColumns instances, keyed by a hash of the LSS bytes and the library version.
+    Every entry is a directory with a meta.json (names and IDs) and one .npy file per array (loaded as read-only memmap).
+    Loading an entry marks it as recently used, storing one evicts the least recently used entries beyond max_bytes
+
+    Args:
+        cache_dir (Path): Directory that holds the cache entries (created if missing)
+        max_bytes (int, optional): Upper bound for the total size of all entries. Defaults to DEFAULT_CACHE_SIZE (512 MiB).
+    """
+
+    def __init__(self, cache_dir: Path, max_bytes: int = DEFAULT_CACHE_SIZE) -> None:
+        self.cache_dir = Path(cache_dir).expanduser()
+        self.max_bytes = max_bytes
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    @staticmethod
+    def key(lss_bytes: bytes) -> str:
+        """
+        Computes the cache key for the contents of a LiveSplit file
+
+        Args:
+            lss_bytes (bytes): Contents of the LiveSplit file (.LSS)
+
+        Returns:
+            str: Hex digest of the LSS bytes, library version and cache format
+        """
+
+        digest = hashlib.sha256(f"{_library_version()}/{CACHE_FORMAT}/".encode())
+        digest.update(lss_bytes)
+        return digest.hexdigest()
+
+    def load(self, key: str) -> Optional[SplitsColumns]:
+        """
+        Loads a cache entry as SplitsColumns (arrays are memory-mapped, so this doesn't read them into memory)
+
+        Args:
+            key (str): Cache key (see ColumnsCache.key)
+
+        Returns:
+            Optional[SplitsColumns]: Cached columns or None if there is no (complete) entry for this key
+        """
+
+        entry_dir = self.cache_dir / key
+        try:
+            with open(entry_dir / "meta.json", "r", encoding="utf-8") as file:
+                meta = json.load(file)
+            arrays = {name: np.load(entry_dir / f"{name}.npy", mmap_mode="r") for name in ARRAY_FIELDS}  # fmt: skip
+        except (OSError, ValueError):
+            return None
+
+        # marks entry as most recently used (eviction is based on mtime)
+        os.utime(entry_dir)
+        return SplitsColumns(**meta, **arrays)
+
+    def store(self, key: str, columns: SplitsColumns) -> None:
+        """
+        Stores SplitsColumns as a cache entry (written to a temporary directory first, so readers never see partial entries)
+
+        Args:
+            key (str): Cache key (see ColumnsCache.key)
+            columns (SplitsColumns): Columns to store
+        """
+
+        entry_dir = self.cache_dir / key
+        staging_dir = Path(tempfile.mkdtemp(prefix=f".{key}.", dir=self.cache_dir))
+        try:
+            with open(staging_dir / "meta.json", "w", encoding="utf-8") as file:
+                json.dump({name: getattr(columns, name) for name in META_FIELDS}, file)
+            for name in ARRAY_FIELDS:
+                np.save(staging_dir / f"{name}.npy", np.asarray(getattr(columns, name)))
+            os.replace(staging_dir, entry_dir)
+        except OSError:
+            # another process already stored this key (or the disk is full), either way we don't need this entry
+            shutil.rmtree(staging_dir, ignore_errors=True)
+        self.evict()
+
+    def evict(self) -> None:
+        """
+        Removes the least recently used entries until the total size of the cache is within max_bytes
+        """
+
+        entries = []
+        for entry_dir in self.cache_dir.iterdir():
+            if not entry_dir.is_dir() or entry_dir.name.startswith("."):
+                continue
+            try:
+                size = sum(path.stat().st_size for path in entry_dir.iterdir())
+                entries.append((entry_dir.stat().st_mtime, size, entry_dir))
+            except OSError:
+                # entry was removed by someone else in the meantime
+                continue
+
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, entry_dir in sorted(entries):
+            if total_size <= self.max_bytes:
+                break
+            shutil.rmtree(entry_dir, ignore_errors=True)
+            total_size -= size
@@ -0,0 +1,225 @@
+from __future__ import annotations
+import re
+import numpy as np
+from datetime import datetime
+from typing import Optional, Sequence
+from saltysplits.constants import (
+    DATETIME_FORMAT,
+    NANOSECONDS_DAY,
+    NANOSECONDS_HOUR,
+    NANOSECONDS_MINUTE,
+    NANOSECONDS_NAT,
+    NANOSECONDS_SECOND,
+)
+
+TIME_PATTERN = re.compile(
+    r"^(?:(?P<days>\d+)\.)?(?P<hours>\d+):(?P<minutes>\d+):(?P<seconds>\d+)(?:\.(?P<fraction>\d+))?$"
+)
+TIME_ERROR = (
+    "Invalid time format, expected 'HH:MM:SS' (with optional days prefix and fraction suffix)"
+)
+
+# fixed-format layout written by LiveSplit, i.e. 'HH:MM:SS.fffffff' (no days prefix)
+FIXED_WIDTH = 16
+FIXED_SEPARATORS = {2: ord(":"), 5: ord(":"), 8: ord(".")}
+FIXED_DIGITS = [0, 1, 3, 4, 6, 7, 9, 10, 11, 12, 13, 14, 15]
+# nanoseconds per digit position in FIXED_DIGITS (fraction is in ticks of 100 nanoseconds)
+FIXED_WEIGHTS = np.array(
+    [
+        10 * NANOSECONDS_HOUR,
+        NANOSECONDS_HOUR,
+        10 * NANOSECONDS_MINUTE,
+        NANOSECONDS_MINUTE,
+        10 * NANOSECONDS_SECOND,
+        NANOSECONDS_SECOND,
+    ]
+    + [10**i * 100 for i in range(6, -1, -1)],
+    dtype=np.int64,
+)
+# fixed-format layout of Attempt.started/ended written by LiveSplit, i.e. 'MM/DD/YYYY HH:MM:SS' (see DATETIME_FORMAT)
+DATETIME_WIDTH = 19
+DATETIME_SEPARATORS = {2: ord("/"), 5: ord("/"), 10: ord(" "), 13: ord(":"), 16: ord(":")}
+# digit positions of month, day, year, hours, minutes and seconds
+DATETIME_FIELDS = [(0, 2), (3, 5), (6, 10), (11, 13), (14, 16), (17, 19)]
+
+
+def decode_nanoseconds(value: str) -> int:
+    """
+    Decodes a string using LSS' time representation as integer nanoseconds (including optional days prefix).
+    Uses slicing for the fixed 'HH:MM:SS.fffffff' layout written by LiveSplit and falls back to TIME_PATTERN otherwise
+
+    Args:
+        value (str): String using LSS' time representation (e.g. "1.01:55:11.1422649")
+
+    Returns:
+        int: Nanoseconds represented by the input string
+    """
+
+    if len(value) == FIXED_WIDTH and value[2] == ":" and value[5] == ":" and value[8] == ".":
+        # single int conversion of 'HHMMSSfffffff', split back up with divmod
+        digits = value[0:2] + value[3:5] + value[6:8] + value[9:16]
+        if digits.isdecimal():
+            clock, ticks = divmod(int(digits), 10**7)
+            clock, seconds = divmod(clock, 100)
+            hours, minutes = divmod(clock, 100)
+            return (
+                hours * NANOSECONDS_HOUR
+                + minutes * NANOSECONDS_MINUTE
+                + seconds * NANOSECONDS_SECOND
+                + ticks * 100
+            )
+
+    match = TIME_PATTERN.match(value)
+    assert match, TIME_ERROR
+    groups = match.group("days", "hours", "minutes", "seconds", "fraction")
+    days, hours, minutes, seconds, fraction = map(lambda x: int(x) if x else 0, groups)
+    return (
+        days * NANOSECONDS_DAY
+        + hours * NANOSECONDS_HOUR
+        + minutes * NANOSECONDS_MINUTE
+        + seconds * NANOSECONDS_SECOND
+        + fraction * 100
+    )
+
+
+def decode_times(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Decodes a batch of strings using LSS' time representation as a timedelta64[ns] array (None becomes NaT).
+    Strings in the fixed 'HH:MM:SS.fffffff' layout are decoded as a single uint8 matrix, others through decode_nanoseconds
+
+    Args:
+        values (Sequence[Optional[str]]): Strings using LSS' time representation (or None if missing)
+
+    Returns:
+        np.ndarray: timedelta64[ns] array with the same length as values
+    """
+
+    nanoseconds = np.full(len(values), NANOSECONDS_NAT, dtype=np.int64)
+    fixed = np.array([value is not None and len(value) == FIXED_WIDTH for value in values], dtype=bool)  # fmt: skip
+    fixed_positions = np.flatnonzero(fixed)
+
+    if len(fixed_positions):
+        joined = "".join([values[i] for i in fixed_positions]).encode("ascii", errors="replace")
+        characters = np.frombuffer(joined, dtype=np.uint8).reshape(-1, FIXED_WIDTH)
+        digits = characters[:, FIXED_DIGITS].astype(np.int64) - ord("0")
+
+        valid = np.all((digits >= 0) & (digits <= 9), axis=1)
+        for position, separator in FIXED_SEPARATORS.items():
+            valid &= characters[:, position] == separator
+
+        nanoseconds[fixed_positions[valid]] = digits[valid] @ FIXED_WEIGHTS
+        fixed[fixed_positions[~valid]] = False
+
+    # anything that isn't in the fixed layout (days prefix, missing fraction, etc) is decoded one by one
+    for i in np.flatnonzero(~fixed):
+        if values[i] is not None:
+            nanoseconds[i] = decode_nanoseconds(values[i])
+
+    return nanoseconds.view("timedelta64[ns]")
+
+
+def encode_times(values: np.ndarray, include_ns: bool = True, offset: bool = False) -> np.ndarray:
+    """
+    Encodes a batch of timedelta64[ns] (or int64 nanosecond) values as strings using LSS' time representation.
+    Matches encode_time (or encode_offset if offset is set) for every value, NaT becomes None
+
+    Args:
+        values (np.ndarray): timedelta64[ns] or int64 array with nanoseconds (NaT or NANOSECONDS_NAT if missing)
+        include_ns (bool, optional): Whether to include nanoseconds in the formatted strings. Defaults to True.
+        offset (bool, optional): Whether to only include nanoseconds (and days) if not 0, as in encode_offset. Defaults to False.
+
+    Returns:
+        np.ndarray: object array with the same shape as values, containing strings (or None if missing)
+    """
+
+    nanoseconds = np.ascontiguousarray(values).view(np.int64)
+    shape = nanoseconds.shape
+    nanoseconds = nanoseconds.ravel()
+    missing = nanoseconds == NANOSECONDS_NAT
+
+    # divmod with floor semantics (same as parse_timedelta)
+    days, remainder = np.divmod(nanoseconds, NANOSECONDS_DAY)
+    hours, remainder = np.divmod(remainder, NANOSECONDS_HOUR)
+    minutes, remainder = np.divmod(remainder, NANOSECONDS_MINUTE)
+    seconds, remainder = np.divmod(remainder, NANOSECONDS_SECOND)
+    ticks = remainder // 100
+
+    # writes all digits and separators as ASCII codes, i.e. a (n, 16) matrix of 'HH:MM:SS.fffffff' characters
+    characters = np.empty((len(nanoseconds), FIXED_WIDTH), dtype=np.uint8)
+    for position, separator in FIXED_SEPARATORS.items():
+        characters[:, position] = separator
+    for position, (component, power) in zip(
+        FIXED_DIGITS,
+        [(hours, 1), (hours, 0), (minutes, 1), (minutes, 0), (seconds, 1), (seconds, 0)]
+        + [(ticks, i) for i in range(6, -1, -1)],
+    ):
+        characters[:, position] = (component // 10**power) % 10 + ord("0")
+
+    full_strings = characters.view(f"S{FIXED_WIDTH}").ravel()
+    short_strings = np.ascontiguousarray(characters[:, :8]).view("S8").ravel()
+    if offset:
+        strings = np.where(ticks != 0, full_strings, short_strings)
+    else:
+        strings = full_strings if include_ns else short_strings
+
+    encoded = strings.astype(str).astype(object)
+    # days prefix is rare (and of variable width) so we only prepend it where needed
+    for i in np.flatnonzero((days != 0) & ~missing):
+        encoded[i] = f"{days[i]}.{encoded[i]}"
+    encoded[missing] = None
+    return encoded.reshape(shape)
+
+
+def _digits(characters: np.ndarray, start: int, end: int) -> np.ndarray:
+    # integer value of a column range of an ASCII matrix (-1 where any character isn't a digit)
+    digits = characters[:, start:end].astype(np.int64) - ord("0")
+    values = digits @ 10 ** np.arange(end - start - 1, -1, -1, dtype=np.int64)
+    return np.where(np.all((digits >= 0) & (digits <= 9), axis=1), values, -1)
+
+
+def decode_datetimes(values: Sequence[Optional[str]]) -> np.ndarray:
+    """
+    Decodes a batch of Attempt.started/ended strings (see DATETIME_FORMAT) as a datetime64[ns] array (None becomes NaT).
+    Strings in the fixed 'MM/DD/YYYY HH:MM:SS' layout are decoded as a single uint8 matrix, others through datetime.strptime
+
+    Args:
+        values (Sequence[Optional[str]]): Strings using LSS' datetime representation (or None if missing)
+
+    Raises:
+        ValueError: If a string doesn't match DATETIME_FORMAT (same as decode_datetime)
+
+    Returns:
+        np.ndarray: datetime64[ns] array with the same length as values
+    """
+
+    nanoseconds = np.full(len(values), NANOSECONDS_NAT, dtype=np.int64)
+    fixed = np.array([value is not None and len(value) == DATETIME_WIDTH for value in values], dtype=bool)  # fmt: skip
+    fixed_positions = np.flatnonzero(fixed)
+
+    if len(fixed_positions):
+        joined = "".join([values[i] for i in fixed_positions]).encode("ascii", errors="replace")
+        characters = np.frombuffer(joined, dtype=np.uint8).reshape(-1, DATETIME_WIDTH)
+        month, day, year, hours, minutes, seconds = [_digits(characters, *span) for span in DATETIME_FIELDS]  # fmt: skip
+
+        # first day of the month (and the next one) as days since epoch, so impossible dates (e.g. 02/30) are caught
+        months = (year - 1970) * 12 + month - 1
+        month_start = months.astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        month_end = (months + 1).astype("datetime64[M]").astype("datetime64[D]").astype(np.int64)
+        valid = (year >= 0) & (month >= 1) & (month <= 12) & (day >= 1) & (day <= month_end - month_start)  # fmt: skip
+        valid &= (hours >= 0) & (hours < 24) & (minutes >= 0) & (minutes < 60) & (seconds >= 0) & (seconds < 60)  # fmt: skip
+        for position, separator in DATETIME_SEPARATORS.items():
+            valid &= characters[:, position] == separator
+
+        days = month_start + day - 1
+        clock = (
+            hours * NANOSECONDS_HOUR + minutes * NANOSECONDS_MINUTE + seconds * NANOSECONDS_SECOND
+        )
+        nanoseconds[fixed_positions[valid]] = (days * NANOSECONDS_DAY + clock)[valid]
+        fixed[fixed_positions[~valid]] = False
+
+    # anything that isn't in the fixed layout (no zero padding, invalid dates, etc) goes through strptime (which raises)
+    for i in np.flatnonzero(~fixed):
+        if values[i] is not None:
+            nanoseconds[i] = np.datetime64(datetime.strptime(values[i], DATETIME_FORMAT), "ns").astype(np.int64)  # fmt: skip
+
+    return nanoseconds.view("datetime64[ns]")
@@ -0,0 +1,389 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from pandas import Timedelta
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from saltysplits.enums import TimeType
+from saltysplits.codec import encode_times
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.summary import RunSummary
+from saltysplits.rolling import DEFAULT_QUANTILES, DEFAULT_WINDOW, RollingStats
+from saltysplits.simulate import PBSimulator
+from saltysplits.kernels import cumulative_times, valid_mask
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def sort_run_ids(run_ids: Iterable[Optional[str]]) -> List[Optional[str]]:
+    """
+    Deduplicates run IDs and sorts them as integers if possible (same ordering as used for the columns of to_df)
+
+    Args:
+        run_ids (Iterable[Optional[str]]): Run IDs as found in AttemptHistory and SegmentHistory (may contain duplicates)
+
+    Returns:
+        List[Optional[str]]: A list of unique run IDs (sorted as integers if possible)
+    """
+
+    run_ids = list(set(run_ids))
+    if all(map(lambda x: str(int(x)) == x, run_ids)):
+        run_ids = sorted(run_ids, key=lambda x: int(x))
+    return run_ids
+
+
+def nanosecond_array(values: Iterable[Optional[Timedelta]]) -> np.ndarray:
+    """
+    Converts optional Timedelta objects to an int64 array of nanoseconds
+
+    Args:
+        values (Iterable[Optional[Timedelta]]): Timedelta objects (or None if missing)
+
+    Returns:
+        np.ndarray: int64 array of nanoseconds (NANOSECONDS_NAT for missing values)
+    """
+
+    return np.array([NANOSECONDS_NAT if value is None else value.value for value in values], dtype=np.int64)  # fmt: skip
+
+
+def flag_array(values: Iterable[Optional[bool]]) -> np.ndarray:
+    """
+    Converts optional booleans (e.g. Attempt.is_started_synced) to an int8 array
+
+    Args:
+        values (Iterable[Optional[bool]]): Booleans (or None if missing)
+
+    Returns:
+        np.ndarray: int8 array (1 if True, 0 if False, -1 if missing)
+    """
+
+    return np.array([-1 if value is None else int(value) for value in values], dtype=np.int8)
+
+
+def scatter_times(
+    shape: tuple,
+    segment_indices: Iterable[int],
+    run_indices: Iterable[int],
+    time_values: Iterable[int],
+) -> np.ndarray:
+    """
+    Scatters (segment, run, nanoseconds) triplets into an int64 matrix in a single assignment (unset cells are NaT)
+
+    Args:
+        shape (tuple): Shape of the resulting matrix, i.e. (n_segments, n_runs)
+        segment_indices (Iterable[int]): Row position for each time value
+        run_indices (Iterable[int]): Column position for each time value
+        time_values (Iterable[int]): Time values in nanoseconds
+
+    Returns:
+        np.ndarray: int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+    """
+
+    matrix = np.full(shape, NANOSECONDS_NAT, dtype=np.int64)
+    matrix[np.asarray(segment_indices, dtype=np.intp), np.asarray(run_indices, dtype=np.intp)] = np.asarray(time_values, dtype=np.int64)  # fmt: skip
+    return matrix
+
+
+def matrix_to_df(
+    matrix: np.ndarray,
+    segment_names: List[str],
+    run_ids: List[Optional[str]],
+    allow_partial: bool = False,
+    allow_empty: bool = False,
+    cumulative: bool = False,
+    lss_repr: bool = False,
+    lss_ns: bool = True,
+) -> pd.DataFrame:
+    """
+    Represents an int64 nanosecond matrix of shape (n_segments, n_runs) as the pandas.DataFrame returned by SaltySplits.to_df
+
+    Args:
+        matrix (np.ndarray): int64 matrix with split times in nanoseconds (NANOSECONDS_NAT for missing splits)
+        segment_names (List[str]): Segment names, used as index
+        run_ids (List[Optional[str]]): Run IDs, used as columns
+        allow_partial (bool, optional): Whether to allow runs that don't have values for all segments. Defaults to False.
+        allow_empty (bool, optional): Whether to allow runs that don't have values for any segments. Defaults to False.
+        cumulative (bool, optional): Whether succesive splits in a run have to add up to the total runtime. Defaults to False.
+        lss_repr (bool, optional): Whether to use LSS' string representation of time. Defaults to False.
+        lss_ns (bool, optional): Whether you want to include nanoseconds in LSS' string representation of time. Defaults to True.
+
+    Returns:
+        pd.DataFrame: pandas.DataFrame of shape (n_segments, n_runs) containing run data
+    """
+
+    # runs are filtered and accumulated on the int64 matrix (see saltysplits.kernels), the DataFrame is only built at the end
+    valid = valid_mask(matrix)
+    keep = np.ones(matrix.shape[1], dtype=bool)
+    if not allow_partial:
+        # drops runs that have one or more NaT values (i.e. incomplete runs)
+        keep &= valid.all(axis=0)
+
+    if not allow_empty:
+        # drops runs that only have NaT values (i.e. empty runs)
+        keep &= valid.any(axis=0)
+
+    if not keep.all():
+        matrix, valid = matrix[:, keep], valid[:, keep]
+        run_ids = [run_id for run_id, kept in zip(run_ids, keep) if kept]
+
+    if cumulative:
+        # stops accumulating if we miss a split in between
+        matrix = cumulative_times(matrix, valid)
+
+    if lss_repr:
+        # formats timedelta values to same string representation as used in LSS files
+        # (column-wise integer arithmetic on the int64 view, NaT becomes None)
+        return pd.DataFrame(
+            encode_times(matrix, include_ns=lss_ns), columns=run_ids, index=segment_names
+        )
+    return pd.DataFrame(matrix.view("timedelta64[ns]"), columns=run_ids, index=segment_names)
+
+
+def _flag_series(flags: np.ndarray) -> pd.arrays.BooleanArray:
+    # int8 flags (see flag_array) as a nullable boolean array
+    return pd.arrays.BooleanArray(flags == 1, flags < 0)
+
+
+@dataclass(eq=False)
+class SplitsColumns:
+    """
+    Columnar representation of the speedrunning data in a LiveSplit file (LSS), without the pydantic-xml object graph.
+    Times are int64 nanoseconds (NANOSECONDS_NAT if missing), sync flags are int8 (1 if True, 0 if False, -1 if missing)
+
+    Args:
+        game_name (str): GameName of the run
+        category_name (str): CategoryName of the run
+        attempt_count (int): AttemptCount of the run
+        segment_names (List[str]): Segment names, in order
+        run_ids (List[Optional[str]]): Unique run IDs, ordered as the columns of SaltySplits.to_df
+        real_time (np.ndarray): int64 matrix of shape (n_segments, n_runs) with RealTime splits
+        game_time (np.ndarray): int64 matrix of shape (n_segments, n_runs) with GameTime splits
+        attempt_ids (List[str]): Attempt IDs, in AttemptHistory order
+        attempt_started (np.ndarray): datetime64[ns] array with Attempt.started values
+        attempt_ended (np.ndarray): datetime64[ns] array with Attempt.ended values
+        attempt_started_synced (np.ndarray): int8 array with Attempt.isStartedSynced values
+        attempt_ended_synced (np.ndarray): int8 array with Attempt.isEndedSynced values
+        attempt_real_time (np.ndarray): int64 array with Attempt RealTime values
+        attempt_game_time (np.ndarray): int64 array with Attempt GameTime values
+    """
+
+    game_name: str
+    category_name: str
+    attempt_count: int
+    segment_names: List[str]
+    run_ids: List[Optional[str]]
+    real_time: np.ndarray
+    game_time: np.ndarray
+    attempt_ids: List[str]
+    attempt_started: np.ndarray
+    attempt_ended: np.ndarray
+    attempt_started_synced: np.ndarray
+    attempt_ended_synced: np.ndarray
+    attempt_real_time: np.ndarray
+    attempt_game_time: np.ndarray
+    _summaries: Dict[TimeType, RunSummary] = field(default_factory=dict, init=False, repr=False)
+    _rolling: Dict[Tuple, RollingStats] = field(default_factory=dict, init=False, repr=False)
+
+    def matrix(self, time_type: TimeType = TimeType.REAL_TIME) -> np.ndarray:
+        """
+        Returns the int64 nanosecond matrix of shape (n_segments, n_runs) for the given time type
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            np.ndarray: int64 matrix with split times in nanoseconds (NANOSECONDS_NAT for missing splits)
+        """
+
+        return self.game_time if time_type == TimeType.GAME_TIME else self.real_time
+
+    def summary(self, time_type: TimeType = TimeType.REAL_TIME) -> RunSummary:
+        """
+        Returns the precomputed run/segment aggregates for the given time type (built on first request, then reused)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            RunSummary: Per-run totals, completion, resets, ranking and per-segment statistics (see saltysplits.summary)
+        """
+
+        if time_type not in self._summaries:
+            self._summaries[time_type] = RunSummary.from_matrix(
+                self.matrix(time_type), self.segment_names, self.run_ids
+            )
+        return self._summaries[time_type]
+
+    def rolling(
+        self,
+        time_type: TimeType = TimeType.REAL_TIME,
+        window: int = DEFAULT_WINDOW,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> RollingStats:
+        """
+        Returns rolling statistics per segment and run total for the given time type and window (see saltysplits.rolling).
+        Built once per combination, then reused and continued by append
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            window (int, optional): Number of values per window. Defaults to DEFAULT_WINDOW.
+            quantiles (Sequence[float], optional): Quantiles to track (the median is always included). Defaults to DEFAULT_QUANTILES.
+
+        Returns:
+            RollingStats: Rolling mean/median/minimum/quantiles and best so far for every run
+        """
+
+        # normalised first (median added), so equivalent quantiles share an entry (and refresh continues it once)
+        quantiles = RollingStats._check(window, quantiles)
+        key = (time_type, window, quantiles)
+        if key not in self._rolling:
+            self._rolling[key] = RollingStats.from_matrix(
+                self.matrix(time_type), self.segment_names, self.run_ids, window, quantiles
+            )
+        return self._rolling[key]
+
+    def simulator(
+        self, time_type: TimeType = TimeType.REAL_TIME, half_life: Optional[float] = None
+    ) -> PBSimulator:
+        """
+        Returns a Monte Carlo finish time simulator drawing from the splits of every segment, with the best complete run as PB (see saltysplits.simulate)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            half_life (Optional[float], optional): Number of runs after which a split counts half as much. Defaults to None (all splits count the same).
+
+        Returns:
+            PBSimulator: Simulator for the current splits
+        """
+
+        pb_time = self.summary(time_type).best_run_time
+        return PBSimulator.from_matrix(
+            self.matrix(time_type), self.segment_names, pb_time, half_life
+        )
+
+    def to_df(
+        self,
+        time_type: TimeType = TimeType.REAL_TIME,
+        allow_partial: bool = False,
+        allow_empty: bool = False,
+        cumulative: bool = False,
+        lss_repr: bool = False,
+        lss_ns: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Represents the split matrix as a single pandas.DataFrame, identical to SaltySplits.to_df
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            allow_partial (bool, optional): Whether to allow runs that don't have values for all segments. Defaults to False.
+            allow_empty (bool, optional): Whether to allow runs that don't have values for any segments. Defaults to False.
+            cumulative (bool, optional): Whether succesive splits in a run have to add up to the total runtime. Defaults to False.
+            lss_repr (bool, optional): Whether to use LSS' string representation of time. Defaults to False.
+            lss_ns (bool, optional): Whether you want to include nanoseconds in LSS' string representation of time. Defaults to True.
+
+        Returns:
+            pd.DataFrame: pandas.DataFrame of shape (n_segments, n_runs) containing run data
+        """
+
+        return matrix_to_df(
+            matrix=self.matrix(time_type),
+            segment_names=self.segment_names,
+            run_ids=self.run_ids,
+            allow_partial=allow_partial,
+            allow_empty=allow_empty,
+            cumulative=cumulative,
+            lss_repr=lss_repr,
+            lss_ns=lss_ns,
+        )
+
+    def attempts_to_df(self) -> pd.DataFrame:
+        """
+        Represents the AttemptHistory as a single pandas.DataFrame, indexed by run ID (i.e. the column labels of to_df),
+        so attempts and splits can be joined on the index (e.g. to_df().T.join(attempts_to_df()))
+
+        Returns:
+            pd.DataFrame: started, ended (datetime64[ns]), duration (ended - started), started_synced, ended_synced (nullable boolean),
+            real_time and game_time (timedelta64[ns]) per attempt, in AttemptHistory order
+        """
+
+        started, ended = self.attempt_started, self.attempt_ended
+        return pd.DataFrame(
+            {
+                "started": started,
+                "ended": ended,
+                "duration": ended - started,
+                "started_synced": _flag_series(self.attempt_started_synced),
+                "ended_synced": _flag_series(self.attempt_ended_synced),
+                "real_time": self.attempt_real_time.view("timedelta64[ns]"),
+                "game_time": self.attempt_game_time.view("timedelta64[ns]"),
+            },
+            index=pd.Index(self.attempt_ids, dtype=object, name="id"),
+        )
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Represents the splits as a long-format Arrow table (one row per run and segment), see saltysplits.arrow. Requires pyarrow
+
+        Returns:
+            pa.Table: Table with run_id, segment_index, segment_name, real_time, game_time, attempt_started and attempt_ended columns
+        """
+
+        from saltysplits.arrow import columns_to_arrow
+
+        return columns_to_arrow(self)
+
+    def to_parquet(self, path: Path, **kwargs: Any) -> None:
+        """
+        Writes the long-format Arrow table (see to_arrow) as a Parquet file. Requires pyarrow
+
+        Args:
+            path (Path): Destination of the Parquet file
+            **kwargs: Forwarded to pyarrow.parquet.write_table (e.g. compression)
+        """
+
+        from saltysplits.arrow import write_parquet
+
+        write_parquet(self.to_arrow(), path, **kwargs)
+
+    def append(self, other: SplitsColumns) -> Optional[SplitsColumns]:
+        """
+        Appends the runs and attempts of another SplitsColumns instance (e.g. attempts that were added to the LSS file later on).
+        Only possible if both share the same segments and all runs of other come after ours (i.e. the combined run IDs keep their order)
+
+        Args:
+            other (SplitsColumns): Columns with the same segments and only new runs/attempts
+
+        Returns:
+            Optional[SplitsColumns]: Combined columns (header fields are taken from other) or None if runs can't simply be appended
+        """
+
+        run_ids = self.run_ids + other.run_ids
+        if self.segment_names != other.segment_names or sort_run_ids(run_ids) != run_ids:
+            return None
+
+        columns = SplitsColumns(
+            game_name=other.game_name,
+            category_name=other.category_name,
+            attempt_count=other.attempt_count,
+            segment_names=self.segment_names,
+            run_ids=run_ids,
+            real_time=np.hstack([self.real_time, other.real_time]),
+            game_time=np.hstack([self.game_time, other.game_time]),
+            attempt_ids=self.attempt_ids + other.attempt_ids,
+            attempt_started=np.concatenate([self.attempt_started, other.attempt_started]),
+            attempt_ended=np.concatenate([self.attempt_ended, other.attempt_ended]),
+            attempt_started_synced=np.concatenate(
+                [self.attempt_started_synced, other.attempt_started_synced]
+            ),
+            attempt_ended_synced=np.concatenate(
+                [self.attempt_ended_synced, other.attempt_ended_synced]
+            ),
+            attempt_real_time=np.concatenate([self.attempt_real_time, other.attempt_real_time]),
+            attempt_game_time=np.concatenate([self.attempt_game_time, other.attempt_game_time]),
+        )
+        # rolling statistics only have to go over the appended runs
+        for (time_type, window, quantiles), stats in self._rolling.items():
+            columns._rolling[(time_type, window, quantiles)] = stats.append(other.matrix(time_type), other.run_ids)  # fmt: skip
+        return columns
@@ -3,3 +3,4 @@ NANOSECONDS_DAY = 86400 * 10**9
 NANOSECONDS_HOUR = 3600 * 10**9
 NANOSECONDS_MINUTE = 60 * 10**9
 NANOSECONDS_SECOND = 10**9
+NANOSECONDS_NAT = -(2**63)  # int64 sentinel that numpy/pandas interpret as NaT
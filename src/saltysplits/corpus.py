@@ -0,0 +1,227 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from pathlib import Path
+from typing import TYPE_CHECKING, Iterable, List, Literal, Optional, Sequence
+from saltysplits.enums import TimeType
+from saltysplits.batch import BatchResult, read_many
+from saltysplits.columnar import SplitsColumns
+from saltysplits.constants import NANOSECONDS_NAT
+
+if TYPE_CHECKING:
+    from saltysplits.main import SaltySplits
+
+INDEX_NAMES = ["game_name", "category_name"]
+TIME_COLUMNS = {TimeType.REAL_TIME: "real_time", TimeType.GAME_TIME: "game_time"}
+
+
+class SplitsCorpus:
+    """
+    Long-format table of the splits in many LiveSplit files, indexed by (game_name, category_name).
+    Every row is a single split, i.e. (file, run_id, segment_index, segment_name, real_time, game_time),
+    which allows for vectorized queries across runners (sum of best, segment percentiles, leaderboards)
+
+    Args:
+        splits (pd.DataFrame): Long-format split table (see SplitsCorpus.from_columns)
+        files (pd.DataFrame): Table with game_name, category_name and n_segments per file (indexed by file)
+        errors (Optional[List[BatchResult]], optional): Files that couldn't be read (see SplitsCorpus.read). Defaults to None.
+    """
+
+    def __init__(
+        self,
+        splits: pd.DataFrame,
+        files: pd.DataFrame,
+        errors: Optional[List[BatchResult]] = None,
+    ) -> None:
+        self.splits = splits
+        self.files = files
+        self.errors = errors or []
+
+    @classmethod
+    def from_columns(
+        cls, columns: Iterable[SplitsColumns], names: Optional[Sequence[str]] = None
+    ) -> SplitsCorpus:
+        """
+        Builds a corpus from SplitsColumns instances (e.g. from read_lss_columns or read_many)
+
+        Args:
+            columns (Iterable[SplitsColumns]): Columnar representation of every file
+            names (Optional[Sequence[str]], optional): Name of every file (e.g. runner or path). Defaults to None (position as string).
+
+        Returns:
+            SplitsCorpus: Corpus with the splits of all files
+        """
+
+        columns = list(columns)
+        names = [str(i) for i in range(len(columns))] if names is None else list(names)
+        if len(set(names)) != len(names):
+            raise ValueError("File names need to be unique")
+
+        parts = {key: [] for key in ["file", "run_id", "segment_index", "real_time", "game_time"]}
+        segment_names = []
+        for file_index, file_columns in enumerate(columns):
+            # only keeps (segment, run) pairs with at least one time
+            present = (file_columns.real_time != NANOSECONDS_NAT) | (file_columns.game_time != NANOSECONDS_NAT)  # fmt: skip
+            segment_indices, run_indices = np.nonzero(present)
+            parts["file"].append(np.full(len(segment_indices), file_index))
+            parts["run_id"].append(np.asarray(file_columns.run_ids, dtype=object)[run_indices])
+            parts["segment_index"].append(segment_indices)
+            parts["real_time"].append(file_columns.real_time[segment_indices, run_indices])
+            parts["game_time"].append(file_columns.game_time[segment_indices, run_indices])
+            segment_names.append(np.asarray(file_columns.segment_names, dtype=object)[segment_indices])  # fmt: skip
+
+        files = pd.DataFrame(
+            {
+                "game_name": [file_columns.game_name for file_columns in columns],
+                "category_name": [file_columns.category_name for file_columns in columns],
+                "n_segments": [len(file_columns.segment_names) for file_columns in columns],
+            },
+            index=pd.Index(names, name="file"),
+        )
+
+        def concatenate(key: str, dtype: type) -> np.ndarray:
+            return np.concatenate(parts[key]) if columns else np.empty(0, dtype=dtype)
+
+        file_indices = concatenate("file", np.intp)
+        splits = pd.DataFrame(
+            {
+                "file": pd.Categorical.from_codes(file_indices, categories=names),
+                "run_id": concatenate("run_id", object),
+                "segment_index": concatenate("segment_index", np.intp),
+                "segment_name": np.concatenate(segment_names)
+                if columns
+                else np.empty(0, dtype=object),  # fmt: skip
+                "real_time": concatenate("real_time", np.int64).view("timedelta64[ns]"),
+                "game_time": concatenate("game_time", np.int64).view("timedelta64[ns]"),
+            },
+            index=pd.MultiIndex.from_frame(files.iloc[file_indices][INDEX_NAMES]),
+        )
+        return cls(splits=splits, files=files)
+
+    @classmethod
+    def from_splits(
+        cls, splits: Iterable[SaltySplits], names: Optional[Sequence[str]] = None
+    ) -> SplitsCorpus:
+        """
+        Builds a corpus from SaltySplits instances (columns are built from their models as they are now, see SaltySplits.to_columns)
+
+        Args:
+            splits (Iterable[SaltySplits]): SaltySplits instances
+            names (Optional[Sequence[str]], optional): Name of every file (e.g. runner or path). Defaults to None (position as string).
+
+        Returns:
+            SplitsCorpus: Corpus with the splits of all instances
+        """
+
+        return cls.from_columns([instance.to_columns() for instance in splits], names=names)
+
+    @classmethod
+    def read(
+        cls,
+        lss_paths: Iterable[Path],
+        workers: Optional[int] = None,
+        executor: Literal["process", "thread"] = "process",
+    ) -> SplitsCorpus:
+        """
+        Reads many LiveSplit files (LSS) in parallel (see read_many) and builds a corpus from them (named by path).
+        Files that can't be read are skipped and kept in SplitsCorpus.errors
+
+        Args:
+            lss_paths (Iterable[Path]): Paths to the LiveSplit files (.LSS)
+            workers (Optional[int], optional): Number of workers. Defaults to None (os.cpu_count()).
+            executor (Literal["process", "thread"], optional): Whether to parse in a process pool or thread pool. Defaults to "process".
+
+        Returns:
+            SplitsCorpus: Corpus with the splits of all readable files
+        """
+
+        results = read_many(lss_paths, workers=workers, executor=executor)
+        valid = [result for result in results if result.error is None]
+        corpus = cls.from_columns([result.columns for result in valid], names=[str(result.path) for result in valid])  # fmt: skip
+        corpus.errors = [result for result in results if result.error is not None]
+        return corpus
+
+    def _times(self, time_type: TimeType) -> pd.DataFrame:
+        # splits with a value for the given time type, with the (game_name, category_name) index as columns
+        time_column = TIME_COLUMNS[time_type]
+        times = self.splits.loc[self.splits[time_column].notna()].reset_index()
+        return times.rename(columns={time_column: "time"})[INDEX_NAMES + ["file", "run_id", "segment_index", "segment_name", "time"]]  # fmt: skip
+
+    def best_segments(self, time_type: TimeType = TimeType.REAL_TIME) -> pd.Series:
+        """
+        Computes the best time per segment for every file
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            pd.Series: Best segment times, indexed by (game_name, category_name, file, segment_index, segment_name)
+        """
+
+        times = self._times(time_type)
+        keys = INDEX_NAMES + ["file", "segment_index", "segment_name"]
+        return times.groupby(keys, observed=True, sort=True)["time"].min()
+
+    def sum_of_best(self, time_type: TimeType = TimeType.REAL_TIME) -> pd.Series:
+        """
+        Computes the sum of best segments for every file (i.e. for every runner)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            pd.Series: Sum of best segments, indexed by (game_name, category_name, file)
+        """
+
+        best_segments = self.best_segments(time_type)
+        return best_segments.groupby(INDEX_NAMES + ["file"], observed=True).sum()
+
+    def segment_percentiles(
+        self,
+        percentiles: Sequence[float] = (0.1, 0.5, 0.9),
+        time_type: TimeType = TimeType.REAL_TIME,
+        best_only: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Computes percentiles per segment across runners (segments are matched by game, category, index and name)
+
+        Args:
+            percentiles (Sequence[float], optional): Percentiles to compute (between 0 and 1). Defaults to (0.1, 0.5, 0.9).
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            best_only (bool, optional): Whether to only use the best segment of every runner (or all of their splits). Defaults to True.
+
+        Returns:
+            pd.DataFrame: Segment percentiles (as columns), indexed by (game_name, category_name, segment_index, segment_name)
+        """
+
+        keys = INDEX_NAMES + ["segment_index", "segment_name"]
+        times = self.best_segments(time_type).reset_index() if best_only else self._times(time_type)  # fmt: skip
+        nanoseconds = times["time"].to_numpy(dtype="timedelta64[ns]").view(np.int64)
+        grouped = pd.Series(nanoseconds, index=pd.MultiIndex.from_frame(times[keys])).groupby(level=keys, sort=True)  # fmt: skip
+        quantiles = grouped.quantile(list(percentiles)).unstack(level=-1)
+        return quantiles.round().astype(np.int64).apply(lambda column: column.to_numpy().view("timedelta64[ns]"))  # fmt: skip
+
+    def leaderboard(self, time_type: TimeType = TimeType.REAL_TIME) -> pd.DataFrame:
+        """
+        Ranks runners by their best complete run (i.e. with a time for all segments) per (game_name, category_name)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            pd.DataFrame: Table with file, run_id, time and rank, indexed by (game_name, category_name) and sorted by rank
+        """
+
+        times = self._times(time_type)
+        runs = times.groupby(INDEX_NAMES + ["file", "run_id"], observed=True, sort=False)["time"].agg(["sum", "count"])  # fmt: skip
+        runs = runs.reset_index()
+
+        # complete runs have a split for every segment of their file
+        n_segments = self.files["n_segments"].reindex(runs["file"].astype(object)).to_numpy()
+        complete = runs.loc[runs["count"].to_numpy() == n_segments]
+        best = complete.sort_values("sum").drop_duplicates(INDEX_NAMES + ["file"])
+
+        board = best.rename(columns={"sum": "time"})[INDEX_NAMES + ["file", "run_id", "time"]]
+        board = board.sort_values(INDEX_NAMES + ["time"]).set_index(INDEX_NAMES)
+        board["rank"] = board.groupby(level=INDEX_NAMES).cumcount() + 1
+        return board
@@ -0,0 +1,211 @@
+from __future__ import annotations
+import io
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+from typing import Dict, Optional, Tuple
+from saltysplits.enums import TimeType
+from saltysplits.cache import ColumnsCache
+from saltysplits.columnar import SplitsColumns
+from saltysplits.summary import RunSummary
+from saltysplits.stream import read_lss_columns
+from saltysplits.constants import NANOSECONDS_NAT
+
+
+def lss_digest(lss_bytes: bytes) -> str:
+    """
+    Computes the key of an uploaded LiveSplit file (same as ColumnsCache.key), hash it once per upload and pass it around instead of the bytes
+
+    Args:
+        lss_bytes (bytes): Contents of the LiveSplit file (.LSS)
+
+    Returns:
+        str: Hex digest of the LSS bytes and library version
+    """
+
+    return ColumnsCache.key(lss_bytes)
+
+
+def reset_counts(summary: RunSummary) -> pd.DataFrame:
+    """
+    Counts resets per segment, i.e. the first segment without a split of every run (complete and empty runs aren't resets)
+
+    Args:
+        summary (RunSummary): Precomputed aggregates of a single time type
+
+    Returns:
+        pd.DataFrame: Segment and Count columns, one row per segment with at least one reset (sorted by segment name)
+    """
+
+    reset_indices = summary.reset_indices[~summary.complete & ~summary.empty]
+    reset_segments = np.array(summary.segment_names)[reset_indices]
+    names, counts = np.unique(reset_segments, return_counts=True)
+    return pd.DataFrame({"Segment": names, "Count": counts})
+
+
+def segment_stats(matrix: np.ndarray, summary: RunSummary) -> pd.DataFrame:
+    """
+    Extends RunSummary.segment_stats with the worst (i.e. longest) split of every segment
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        summary (RunSummary): Aggregates of the same matrix
+
+    Returns:
+        pd.DataFrame: best, best_run_id, worst, worst_run_id, mean, median, std and count per segment, indexed by segment name
+    """
+
+    stats = summary.segment_stats()
+    if matrix.shape[1]:
+        # NANOSECONDS_NAT is the smallest int64, so missing splits never win
+        worst_positions = np.argmax(matrix, axis=1)
+        worst = matrix[np.arange(matrix.shape[0]), worst_positions]
+    else:
+        worst_positions = np.zeros(matrix.shape[0], dtype=np.intp)
+        worst = np.full(matrix.shape[0], NANOSECONDS_NAT, dtype=np.int64)
+    has_splits = worst != NANOSECONDS_NAT
+    stats.insert(2, "worst", worst.view("timedelta64[ns]"))
+    stats.insert(3, "worst_run_id", [summary.run_ids[i] if valid else None for i, valid in zip(worst_positions, has_splits)])  # fmt: skip
+    return stats
+
+
+@dataclass(eq=False)
+class DashboardBundle:
+    """
+    Everything the Streamlit dashboard shows for a single uploaded LiveSplit file, built in one pass over the bytes (see from_bytes).
+    Meant to be cached by digest (e.g. st.cache_resource), so widget interactions only slice precomputed arrays. Returned frames
+    are shared between calls, so don't modify them in place
+
+    Args:
+        digest (str): Key of the uploaded bytes (see lss_digest)
+        columns (SplitsColumns): RealTime/GameTime matrices and attempts (see saltysplits.columnar)
+        summaries (Dict[TimeType, RunSummary]): Precomputed aggregates per time type
+        resets (Dict[TimeType, pd.DataFrame]): Resets per segment per time type (see reset_counts)
+        segment_stats (Dict[TimeType, pd.DataFrame]): Per-segment statistics per time type (see segment_stats)
+    """
+
+    digest: str
+    columns: SplitsColumns
+    summaries: Dict[TimeType, RunSummary]
+    resets: Dict[TimeType, pd.DataFrame]
+    segment_stats: Dict[TimeType, pd.DataFrame]
+    _frames: Dict[Tuple, pd.DataFrame] = field(default_factory=dict, init=False, repr=False)
+
+    @classmethod
+    def from_bytes(cls, lss_bytes: bytes, digest: Optional[str] = None) -> DashboardBundle:
+        """
+        Reads an uploaded LiveSplit file once (through read_lss_columns, without building the pydantic models) and precomputes all aggregates
+
+        Args:
+            lss_bytes (bytes): Contents of the LiveSplit file (.LSS)
+            digest (Optional[str], optional): Precomputed lss_digest(lss_bytes). Defaults to None (computed here).
+
+        Returns:
+            DashboardBundle: Precomputed data for both time types
+        """
+
+        columns = read_lss_columns(io.BytesIO(lss_bytes))
+        summaries = {time_type: columns.summary(time_type) for time_type in TimeType}
+        return cls(
+            digest=digest if digest is not None else lss_digest(lss_bytes),
+            columns=columns,
+            summaries=summaries,
+            resets={time_type: reset_counts(summary) for time_type, summary in summaries.items()},
+            segment_stats={
+                time_type: segment_stats(columns.matrix(time_type), summary)
+                for time_type, summary in summaries.items()
+            },
+        )
+
+    @property
+    def game_name(self) -> str:
+        """
+        GameName of the run
+        """
+
+        return self.columns.game_name
+
+    @property
+    def category_name(self) -> str:
+        """
+        CategoryName of the run
+        """
+
+        return self.columns.category_name
+
+    @property
+    def attempt_count(self) -> int:
+        """
+        AttemptCount of the run
+        """
+
+        return self.columns.attempt_count
+
+    def frame(
+        self,
+        time_type: TimeType = TimeType.REAL_TIME,
+        allow_partial: bool = False,
+        allow_empty: bool = False,
+        cumulative: bool = False,
+        lss_repr: bool = False,
+        lss_ns: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Returns the same frame as SaltySplits.to_df, built once per flag combination and reused afterwards
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            allow_partial (bool, optional): Whether to allow runs that don't have values for all segments. Defaults to False.
+            allow_empty (bool, optional): Whether to allow runs that don't have values for any segments. Defaults to False.
+            cumulative (bool, optional): Whether succesive splits in a run have to add up to the total runtime. Defaults to False.
+            lss_repr (bool, optional): Whether to use LSS' string representation of time. Defaults to False.
+            lss_ns (bool, optional): Whether you want to include nanoseconds in LSS' string representation of time. Defaults to True.
+
+        Returns:
+            pd.DataFrame: pandas.DataFrame of shape (n_segments, n_runs) containing run data (shared, don't modify)
+        """
+
+        # lss_ns only affects the string representation
+        key = (time_type, allow_partial, allow_empty, cumulative, lss_repr, lss_ns and lss_repr)
+        if key not in self._frames:
+            self._frames[key] = self.columns.to_df(
+                time_type=time_type,
+                allow_partial=allow_partial,
+                allow_empty=allow_empty,
+                cumulative=cumulative,
+                lss_repr=lss_repr,
+                lss_ns=lss_ns,
+            )
+        return self._frames[key]
+
+    def run_times(self, time_type: TimeType = TimeType.REAL_TIME) -> pd.Series:
+        """
+        Returns the total time of every complete run, in run order
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            pd.Series: Total time per run (timedelta64[ns]), indexed by run ID
+        """
+
+        summary = self.summaries[time_type]
+        run_ids = np.array(summary.run_ids, dtype=object)
+        return pd.Series(summary.run_totals[summary.complete].view("timedelta64[ns]"), index=run_ids[summary.complete])  # fmt: skip
+
+    def segment_times(self, time_type: TimeType, segment_index: int) -> pd.Series:
+        """
+        Returns all splits of a single segment (a row of the split matrix, without missing splits)
+
+        Args:
+            time_type (TimeType): Whether to use GameTime or RealTime values
+            segment_index (int): Position of the segment
+
+        Returns:
+            pd.Series: Split per run (timedelta64[ns]), indexed by run ID
+        """
+
+        times = self.columns.matrix(time_type)[segment_index]
+        valid = times != NANOSECONDS_NAT
+        run_ids = np.array(self.columns.run_ids, dtype=object)
+        return pd.Series(times[valid].view("timedelta64[ns]"), index=run_ids[valid])
@@ -0,0 +1,144 @@
+from __future__ import annotations
+import numpy as np
+import pandas as pd
+from typing import Iterable, Optional
+from saltysplits.enums import DownsampleMethod
+from saltysplits.kernels import NANOSECONDS_MAX
+
+# points per chart, well within what Vega-Lite renders smoothly
+DEFAULT_MAX_POINTS = 1000
+
+
+def record_indices(values: np.ndarray) -> np.ndarray:
+    """
+    Returns the positions that set a new record (i.e. are strictly faster than everything before them), e.g. PB progression
+
+    Args:
+        values (np.ndarray): int64 nanoseconds in chronological order (no NANOSECONDS_NAT)
+
+    Returns:
+        np.ndarray: Positions of the records, in order
+    """
+
+    if not len(values):
+        return np.empty(0, dtype=np.intp)
+    previous_best = np.concatenate([[NANOSECONDS_MAX], np.minimum.accumulate(values)[:-1]])
+    return np.flatnonzero(values < previous_best)
+
+
+def lttb_indices(values: np.ndarray, n_out: int, x: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Selects n_out points with Largest-Triangle-Three-Buckets (keeps the visual shape of a line, first and last point included).
+    One iteration per bucket, every bucket is handled with array operations
+
+    Args:
+        values (np.ndarray): y values (e.g. int64 nanoseconds, no NANOSECONDS_NAT)
+        n_out (int): Number of points to keep
+        x (Optional[np.ndarray], optional): x values, increasing. Defaults to None (positions).
+
+    Returns:
+        np.ndarray: Positions of the kept points, in order
+    """
+
+    n = len(values)
+    if n_out >= n:
+        return np.arange(n)
+    if n_out < 3:
+        return np.array([0, n - 1][:n_out], dtype=np.intp)
+
+    y = values.astype(np.float64)
+    x = np.arange(n, dtype=np.float64) if x is None else x.astype(np.float64)
+    # n_out - 2 buckets between the first and last point
+    edges = np.floor(np.linspace(1, n - 1, n_out - 1)).astype(np.intp)
+    selected = np.empty(n_out, dtype=np.intp)
+    selected[0], selected[-1] = 0, n - 1
+
+    previous = 0
+    for i in range(n_out - 2):
+        start, end = edges[i], edges[i + 1]
+        next_start, next_end = (edges[i + 1], edges[i + 2]) if i + 2 < len(edges) else (n - 1, n)
+        next_x, next_y = x[next_start:next_end].mean(), y[next_start:next_end].mean()
+        # (twice the) area of the triangle between the previous point, each candidate and the average of the next bucket
+        areas = np.abs((x[previous] - next_x) * (y[start:end] - y[previous]) - (x[previous] - x[start:end]) * (next_y - y[previous]))  # fmt: skip
+        previous = start + int(np.argmax(areas))
+        selected[i + 1] = previous
+    return selected
+
+
+def minmax_indices(values: np.ndarray, n_out: int) -> np.ndarray:
+    """
+    Selects the minimum and maximum of n_out // 2 equally sized buckets (keeps every spike, at most n_out points)
+
+    Args:
+        values (np.ndarray): y values (e.g. int64 nanoseconds, no NANOSECONDS_NAT)
+        n_out (int): Number of points to keep
+
+    Returns:
+        np.ndarray: Positions of the kept points, in order
+    """
+
+    n = len(values)
+    if n_out >= n:
+        return np.arange(n)
+    n_buckets = max(n_out // 2, 1)
+    buckets = np.arange(n) * n_buckets // n
+    # sorted by bucket, then value, so every bucket starts with its minimum and ends with its maximum
+    order = np.lexsort((values, buckets))
+    ends = np.cumsum(np.bincount(buckets, minlength=n_buckets))
+    starts = np.concatenate([[0], ends[:-1]])
+    return np.unique(np.concatenate([order[starts], order[ends - 1]]))
+
+
+def downsample_indices(
+    values: np.ndarray,
+    max_points: int = DEFAULT_MAX_POINTS,
+    method: DownsampleMethod = DownsampleMethod.LTTB,
+    keep: Iterable[int] = (),
+) -> np.ndarray:
+    """
+    Reduces a time series to about max_points points for charting. The first and last point, the extremes and every record
+    (see record_indices, e.g. PBs or golds) are always kept, the rest of the budget goes to LTTB or min/max decimation
+
+    Args:
+        values (np.ndarray): int64 nanoseconds in chronological order (no NANOSECONDS_NAT)
+        max_points (int, optional): Target number of points (only exceeded if there are more points to keep). Defaults to DEFAULT_MAX_POINTS.
+        method (DownsampleMethod, optional): Decimation of the remaining points. Defaults to LTTB.
+        keep (Iterable[int], optional): Additional positions that are always kept. Defaults to ().
+
+    Returns:
+        np.ndarray: Positions of the kept points, in order (all positions if there are at most max_points)
+    """
+
+    n = len(values)
+    if n <= max_points:
+        return np.arange(n)
+
+    extremes = np.array([0, n - 1, np.argmin(values), np.argmax(values)], dtype=np.intp)
+    forced = np.unique(np.concatenate([extremes, record_indices(values), np.fromiter(keep, dtype=np.intp)]))  # fmt: skip
+    budget = max(max_points - len(forced), 2)
+    if method == DownsampleMethod.MINMAX:
+        sampled = minmax_indices(values, budget)
+    else:
+        sampled = lttb_indices(values, budget)
+    return np.union1d(forced, sampled)
+
+
+def downsample_series(
+    series: pd.Series,
+    max_points: int = DEFAULT_MAX_POINTS,
+    method: DownsampleMethod = DownsampleMethod.LTTB,
+) -> pd.Series:
+    """
+    Downsamples a series of times (e.g. DashboardBundle.run_times or segment_times) for charting, see downsample_indices
+
+    Args:
+        series (pd.Series): Times (timedelta64[ns]) in chronological order, without missing values
+        max_points (int, optional): Target number of points. Defaults to DEFAULT_MAX_POINTS.
+        method (DownsampleMethod, optional): Decimation of the remaining points. Defaults to LTTB.
+
+    Returns:
+        pd.Series: Subset of the series (same index labels and order)
+    """
+
+    values = series.to_numpy(dtype="timedelta64[ns]").view(np.int64)
+    return series.iloc[downsample_indices(values, max_points=max_points, method=method)]
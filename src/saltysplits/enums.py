@@ -4,3 +4,8 @@ from enum import Enum
 class TimeType(Enum):
     REAL_TIME = 0
     GAME_TIME = 1
+
+
+class DownsampleMethod(Enum):
+    LTTB = "lttb"
+    MINMAX = "minmax"
@@ -0,0 +1,189 @@
+from __future__ import annotations
+import numpy as np
+from lxml import etree
+from collections.abc import Sequence
+from numpy import timedelta64
+from pandas import Timedelta
+from typing import Iterable, Iterator, List, Optional, Union, overload
+from saltysplits.codec import decode_times
+from saltysplits.columnar import nanosecond_array
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.models import Time
+
+
+def encode_ids(ids: Iterable[str]) -> np.ndarray:
+    """
+    Packs run IDs as an int64 array if they're all canonical integers (e.g. "12" but not "012"), as an object array otherwise
+
+    Args:
+        ids (Iterable[str]): Run IDs as found in SegmentHistory
+
+    Returns:
+        np.ndarray: int64 (or object) array with one entry per run ID
+    """
+
+    ids = list(ids)
+    try:
+        encoded = np.array(ids, dtype=np.int64)
+    except (ValueError, OverflowError):
+        return np.array(ids, dtype=object)
+    # round trip check, ids are compared as strings elsewhere so "012" can't become 12
+    if encoded.astype(str).tolist() != ids:
+        return np.array(ids, dtype=object)
+    return encoded
+
+
+def _optional_timedelta(value: int) -> Optional[Timedelta]:
+    # going through timedelta64 is considerably cheaper than Timedelta's integer constructor
+    return None if value == NANOSECONDS_NAT else Timedelta(timedelta64(value, "ns"))
+
+
+class CompactHistory(Sequence):
+    """
+    Array-backed stand-in for Segment.segment_history (see SaltySplits.read_lss with compact=True).
+    Keeps every split as an entry in three parallel arrays (run ID, RealTime and GameTime in nanoseconds, NANOSECONDS_NAT if missing)
+    and only builds Time models when they're accessed. Compares equal to a list with the same Time models
+
+    Args:
+        ids (np.ndarray): Run ID per split (int64, or object if the IDs aren't all canonical integers, see encode_ids)
+        real_time (np.ndarray): RealTime per split as int64 nanoseconds
+        game_time (np.ndarray): GameTime per split as int64 nanoseconds
+    """
+
+    __slots__ = ("ids", "real_time", "game_time")
+
+    def __init__(self, ids: np.ndarray, real_time: np.ndarray, game_time: np.ndarray) -> None:
+        self.ids = ids
+        self.real_time = real_time
+        self.game_time = game_time
+
+    @classmethod
+    def from_element(cls, element: etree._Element) -> CompactHistory:
+        """
+        Builds a CompactHistory from a SegmentHistory element (times are decoded in a single batch)
+
+        Args:
+            element (etree._Element): SegmentHistory element with Time children
+
+        Returns:
+            CompactHistory: Array-backed segment history
+        """
+
+        times = element.findall("Time")
+        return cls(
+            ids=encode_ids([time.get("id") for time in times]),
+            real_time=decode_times([time.findtext("RealTime") for time in times]).view(np.int64),
+            game_time=decode_times([time.findtext("GameTime") for time in times]).view(np.int64),
+        )
+
+    @classmethod
+    def from_times(cls, times: Iterable[Time]) -> CompactHistory:
+        """
+        Builds a CompactHistory from Time models (e.g. to compact an already loaded segment history)
+
+        Args:
+            times (Iterable[Time]): Time models
+
+        Returns:
+            CompactHistory: Array-backed segment history
+        """
+
+        times = list(times)
+        return cls(
+            ids=encode_ids([time.id for time in times]),
+            real_time=nanosecond_array([time.real_time for time in times]),
+            game_time=nanosecond_array([time.game_time for time in times]),
+        )
+
+    def id_list(self) -> List[str]:
+        """
+        Returns the run IDs as strings (same as [time.id for time in history], without building the Time models)
+
+        Returns:
+            List[str]: Run ID per split
+        """
+
+        return self.ids.astype(str).tolist() if self.ids.dtype == np.int64 else list(self.ids)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Number of bytes held by the arrays (excludes the strings of object IDs)
+        """
+
+        return self.ids.nbytes + self.real_time.nbytes + self.game_time.nbytes
+
+    def _time(self, run_id: str, real_time: int, game_time: int) -> Time:
+        # values are already validated, so we skip validation altogether
+        return Time.model_construct(
+            id=run_id,
+            real_time=_optional_timedelta(real_time),
+            game_time=_optional_timedelta(game_time),
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    @overload
+    def __getitem__(self, index: int) -> Time: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> List[Time]: ...
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Time, List[Time]]:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        run_id = self.ids[index]
+        return self._time(str(run_id), int(self.real_time[index]), int(self.game_time[index]))
+
+    def __iter__(self) -> Iterator[Time]:
+        for run_id, real_time, game_time in zip(
+            self.id_list(), self.real_time.tolist(), self.game_time.tolist()
+        ):
+            yield self._time(run_id, real_time, game_time)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, CompactHistory):
+            return (
+                self.id_list() == other.id_list()
+                and np.array_equal(self.real_time, other.real_time)
+                and np.array_equal(self.game_time, other.game_time)
+            )
+        if isinstance(other, Sequence) and not isinstance(other, (str, bytes)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({len(self)} splits)"
+
+    def __getstate__(self) -> tuple:
+        return self.ids, self.real_time, self.game_time
+
+    def __setstate__(self, state: tuple) -> None:
+        self.ids, self.real_time, self.game_time = state
+
+    def extend(self, times: Iterable[Time]) -> None:
+        """
+        Appends splits in place (e.g. new runs picked up by SaltySplits.refresh)
+
+        Args:
+            times (Iterable[Time]): Time models or another CompactHistory
+        """
+
+        other = times if isinstance(times, CompactHistory) else CompactHistory.from_times(times)
+        ids = np.concatenate([self.ids, other.ids])
+        self.ids = ids if ids.dtype == np.int64 else encode_ids(self.id_list() + other.id_list())
+        self.real_time = np.concatenate([self.real_time, other.real_time])
+        self.game_time = np.concatenate([self.game_time, other.game_time])
+
+    def append(self, time: Time) -> None:
+        """
+        Appends a single split in place
+
+        Args:
+            time (Time): Time model
+        """
+
+        self.extend([time])
@@ -0,0 +1,282 @@
+from __future__ import annotations
+import io
+import os
+import re
+import base64
+from collections import Counter
+from PIL import Image
+from pathlib import Path
+from functools import lru_cache
+from lxml import etree
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+# icons are base64 encoded .NET (BinaryFormatter) Bitmaps in a CDATA section, the actual image is a PNG stream within
+ICON_PATTERN = re.compile(rb"<(GameIcon|Icon)><!\[CDATA\[(.*?)\]\]></\1>", re.DOTALL)
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+# stands in for the payload until validation (private use character, so it can't clash with base64)
+PLACEHOLDER = "\ue000"
+ICON_CACHE_SIZE = 256
+# number of (changed) file versions whose icon locations are kept, see IconRef.locate
+LOCATION_CACHE_SIZE = 8
+
+
+class IconRef:
+    """
+    Reference to an icon payload (GameIcon or Segment.Icon) in a LiveSplit file, i.e. its byte offset and length.
+    Stands in for the base64 string when reading with lazy icons (see SaltySplits.read_lss), the payload is only read
+    from disk when needed (str(icon) returns it, str methods, len, slicing and comparisons with strings use it) and load_icon decodes it as an image.
+    If the file changed since it was read (e.g. LiveSplit saved it after an attempt), the payload is found again by its anchor
+
+    Args:
+        source (str): Path to the LiveSplit file (.LSS)
+        offset (int): Byte offset of the payload (i.e. the CDATA contents)
+        length (int): Length of the payload in bytes
+        stamp (Tuple[int, int]): Size and mtime (ns) of the file when it was read, used to detect changes
+        anchor (Tuple[bytes, bytes, int]): Tag, raw name of the segment (empty for GameIcon) and occurrence of that pair, see icon_locations
+    """
+
+    __slots__ = ("source", "offset", "length", "stamp", "anchor")
+
+    def __init__(
+        self,
+        source: str,
+        offset: int,
+        length: int,
+        stamp: Tuple[int, int],
+        anchor: Tuple[bytes, bytes, int],
+    ) -> None:
+        self.source = source
+        self.offset = offset
+        self.length = length
+        self.stamp = stamp
+        self.anchor = anchor
+
+    @property
+    def key(self) -> Tuple[str, int, int, Tuple[int, int]]:
+        """
+        Identifies the payload (used as key for the image cache)
+        """
+
+        return (self.source, self.offset, self.length, self.stamp)
+
+    def locate(self) -> None:
+        """
+        Moves the reference to the current version of the LiveSplit file if it changed since it was read, i.e. finds the payload
+        again by its anchor (GameIcon or the Icon of the segment with the same name) instead of trusting the old byte offset
+
+        Raises:
+            ValueError: If the file no longer exists or the icon is no longer in it (e.g. its segment was renamed or removed)
+        """
+
+        try:
+            status = os.stat(self.source)
+        except FileNotFoundError:
+            raise ValueError(f"{self!r} can't be read, '{self.source}' no longer exists (use lazy_icons=False to keep icons in memory)") from None  # fmt: skip
+        stamp = (status.st_size, status.st_mtime_ns)
+        if stamp == self.stamp:
+            return
+        location = _icon_locations(self.source, stamp).get(self.anchor)
+        if location is None:
+            raise ValueError(f"{self!r} is no longer in '{self.source}', use refresh or read_lss again to update icons")  # fmt: skip
+        self.offset, self.length = location
+        self.stamp = stamp
+
+    def payload(self) -> str:
+        """
+        Reads the base64 payload from the LiveSplit file (see locate)
+
+        Raises:
+            ValueError: If the file no longer exists or changed since it was read and the icon is no longer in it
+
+        Returns:
+            str: Base64 payload, same as Segment.icon or Splits.game_icon when reading eagerly
+        """
+
+        self.locate()
+        return _read_payload(*self.key)
+
+    def __str__(self) -> str:
+        return self.payload()
+
+    def __getattr__(self, name: str) -> Any:
+        # str methods (e.g. startswith or encode) work on the payload, so an IconRef can be used like the base64 string
+        if name.startswith("_") or name in IconRef.__slots__ or not hasattr(str, name):
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+        return getattr(self.payload(), name)
+
+    def __len__(self) -> int:
+        # payloads are base64 (ASCII), so their length in bytes is their length in characters
+        self.locate()
+        return self.length
+
+    def __getitem__(self, index: Union[int, slice]) -> str:
+        return self.payload()[index]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.payload())
+
+    def __contains__(self, substring: str) -> bool:
+        return substring in self.payload()
+
+    def __add__(self, other: str) -> str:
+        return self.payload() + other
+
+    def __radd__(self, other: str) -> str:
+        return other + self.payload()
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.source!r}, offset={self.offset}, length={self.length})"
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, IconRef):
+            return self.key == other.key or self.payload() == other.payload()
+        if isinstance(other, str):
+            return self.payload() == other
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        # same hash as the payload, since IconRefs compare equal to their payload
+        return hash(self.payload())
+
+
+def _read_payload(source: str, offset: int, length: int, stamp: Tuple[int, int]) -> str:
+    status = os.stat(source)
+    if (status.st_size, status.st_mtime_ns) != stamp:
+        # only when the file changes again between IconRef.locate and reading it
+        raise ValueError(f"'{source}' changed while reading an icon")
+    with open(source, "rb") as file:
+        file.seek(offset)
+        return file.read(length).decode("utf-8")
+
+
+def icon_locations(xml_bytes: bytes) -> Iterator[Tuple[Tuple[bytes, bytes, int], re.Match]]:
+    """
+    Finds every icon payload along with its anchor, i.e. its tag, the raw name of the segment it belongs to (the closest preceding
+    Name element, empty for GameIcon) and how often that pair occurred before (so segments with the same name stay apart)
+
+    Args:
+        xml_bytes (bytes): Contents of the LiveSplit file (.LSS)
+
+    Yields:
+        Tuple[Tuple[bytes, bytes, int], re.Match]: Anchor and ICON_PATTERN match of every icon (in document order)
+    """
+
+    occurrences = Counter()
+    for match in ICON_PATTERN.finditer(xml_bytes):
+        tag, name = match.group(1), b""
+        if tag == b"Icon":
+            start = xml_bytes.rfind(b"<Name>", 0, match.start())
+            if start >= 0:
+                name = xml_bytes[start + len(b"<Name>") : xml_bytes.find(b"</Name>", start)]
+        yield (tag, name, occurrences[tag, name]), match
+        occurrences[tag, name] += 1
+
+
+@lru_cache(maxsize=LOCATION_CACHE_SIZE)
+def _icon_locations(source: str, stamp: Tuple[int, int]) -> Dict[Tuple[bytes, bytes, int], Tuple[int, int]]:  # fmt: skip
+    # offset and length of every payload by anchor, scanned once per file version (stamp is part of the key)
+    with open(source, "rb") as file:
+        xml_bytes = file.read()
+    return {anchor: (match.start(2), match.end(2) - match.start(2)) for anchor, match in icon_locations(xml_bytes)}  # fmt: skip
+
+
+def strip_icons(xml_bytes: bytes, lss_path: Path) -> Tuple[bytes, List[IconRef]]:
+    """
+    Records the offset and length of every icon payload and replaces it with a short placeholder (see take_icon).
+    Offsets are relative to xml_bytes, which has to be the exact contents of lss_path
+
+    Args:
+        xml_bytes (bytes): Contents of the LiveSplit file (.LSS)
+        lss_path (Path): Path to the LiveSplit file (.LSS), kept in every IconRef
+
+    Returns:
+        Tuple[bytes, List[IconRef]]: Contents without icon payloads and the references to them (in document order)
+    """
+
+    source = str(Path(lss_path).resolve())
+    status = os.stat(source)
+    stamp = (status.st_size, status.st_mtime_ns)
+
+    pieces, icons, position = [], [], 0
+    for anchor, match in icon_locations(xml_bytes):
+        tag = match.group(1)
+        icons.append(IconRef(source, match.start(2), match.end(2) - match.start(2), stamp, anchor))
+        pieces.append(xml_bytes[position : match.start()])
+        pieces.append(b"<%s>%s%d</%s>" % (tag, PLACEHOLDER.encode("utf-8"), len(icons) - 1, tag))
+        position = match.end()
+    pieces.append(xml_bytes[position:])
+    return b"".join(pieces), icons
+
+
+def take_icon(element: Optional[etree._Element], icons: List[IconRef]) -> Optional[IconRef]:
+    """
+    Returns the IconRef behind a placeholder left by strip_icons and removes it from the element (so it validates as None)
+
+    Args:
+        element (Optional[etree._Element]): GameIcon or Icon element (or None if missing)
+        icons (List[IconRef]): References returned by strip_icons
+
+    Returns:
+        Optional[IconRef]: Reference to the icon payload or None if the element doesn't hold a placeholder
+    """
+
+    if element is None or not (element.text or "").startswith(PLACEHOLDER):
+        return None
+    icon = icons[int(element.text[len(PLACEHOLDER) :])]
+    element.text = None
+    return icon
+
+
+def decode_icon(payload: str) -> Image.Image:
+    """
+    Decodes an icon payload (base64 encoded .NET Bitmap) as a Pillow image
+
+    Args:
+        payload (str): Base64 payload, as found in Segment.icon or Splits.game_icon
+
+    Raises:
+        ValueError: If the payload doesn't contain a PNG image
+
+    Returns:
+        Image.Image: Decoded image
+    """
+
+    blob = base64.b64decode(payload)
+    start = blob.find(PNG_SIGNATURE)
+    if start < 0:
+        raise ValueError("Icon payload doesn't contain a PNG image")
+    image = Image.open(io.BytesIO(blob[start:]))
+    image.load()
+    return image
+
+
+@lru_cache(maxsize=ICON_CACHE_SIZE)
+def _cached_image(
+    key: Union[str, Tuple[str, int, int, Tuple[int, int]]], size: Optional[Tuple[int, int]]
+) -> Image.Image:
+    image = decode_icon(key if isinstance(key, str) else _read_payload(*key))
+    if size is not None:
+        image.thumbnail(size)
+    return image
+
+
+def load_icon(
+    icon: Union[str, IconRef, None], size: Optional[Tuple[int, int]] = None
+) -> Optional[Image.Image]:
+    """
+    Decodes an icon (eager payload or IconRef) as a Pillow image, through a bounded LRU cache (ICON_CACHE_SIZE entries)
+
+    Args:
+        icon (Union[str, IconRef, None]): Segment.icon or Splits.game_icon
+        size (Optional[Tuple[int, int]], optional): Maximum thumbnail size (keeps aspect ratio). Defaults to None (original size).
+
+    Returns:
+        Optional[Image.Image]: Decoded image (a copy, so it's safe to modify) or None if there's no icon
+    """
+
+    if not icon:
+        return None
+    if isinstance(icon, IconRef):
+        icon.locate()
+    key = icon.key if isinstance(icon, IconRef) else icon
+    return _cached_image(key, None if size is None else tuple(size)).copy()
@@ -0,0 +1,18 @@
+from lxml import etree
+
+# helpers for lxml.etree.iterparse shared by saltysplits.stream and saltysplits.metadata, kept free of
+# pandas/numpy/pydantic imports so read_metadata stays cheap to import
+
+
+def release_element(element: etree._Element) -> None:
+    """
+    Clears an element and drops its already processed siblings, so the tree built by iterparse stays (roughly) constant in size
+
+    Args:
+        element (etree._Element): Element whose end event was just handled
+    """
+
+    element.clear(keep_tail=False)
+    parent = element.getparent()
+    while element.getprevious() is not None:
+        del parent[0]
@@ -0,0 +1,111 @@
+from __future__ import annotations
+import numpy as np
+from typing import Optional, Tuple
+from saltysplits.constants import NANOSECONDS_NAT
+
+# fill value for minimum reductions, larger than any valid split
+NANOSECONDS_MAX = np.iinfo(np.int64).max
+
+
+def valid_mask(matrix: np.ndarray) -> np.ndarray:
+    """
+    Returns which cells of an int64 nanosecond matrix hold a split (i.e. aren't NANOSECONDS_NAT)
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+
+    Returns:
+        np.ndarray: bool matrix of the same shape
+    """
+
+    return matrix != NANOSECONDS_NAT
+
+
+def cumulative_times(matrix: np.ndarray, valid: Optional[np.ndarray] = None) -> np.ndarray:
+    """
+    Accumulates splits along the segments of every run, stopping at the first missing split (every later cell is NANOSECONDS_NAT).
+    Same as pandas' cumsum(skipna=False) per column, but for the whole matrix at once
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        valid (Optional[np.ndarray], optional): Precomputed valid_mask(matrix). Defaults to None.
+
+    Returns:
+        np.ndarray: int64 matrix of cumulative times with NANOSECONDS_NAT after the first missing split
+    """
+
+    valid = valid_mask(matrix) if valid is None else valid
+    totals = np.where(valid, matrix, 0).cumsum(axis=0)
+    return np.where(np.logical_and.accumulate(valid, axis=0), totals, NANOSECONDS_NAT)
+
+
+def first_missing(valid: np.ndarray) -> np.ndarray:
+    """
+    Returns the first segment without a split for every run (i.e. where it was reset)
+
+    Args:
+        valid (np.ndarray): bool matrix of shape (n_segments, n_runs), see valid_mask
+
+    Returns:
+        np.ndarray: Segment index per run, -1 for complete runs
+    """
+
+    if not valid.shape[0]:
+        return np.full(valid.shape[1], -1, dtype=np.intp)
+    return np.where(valid.all(axis=0), -1, np.argmin(valid, axis=0))
+
+
+def run_totals(matrix: np.ndarray, valid: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:  # fmt: skip
+    """
+    Sums the splits of every run
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        valid (Optional[np.ndarray], optional): Precomputed valid_mask(matrix). Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Total time per run (NANOSECONDS_NAT unless complete) and summed splits per run (0 if empty)
+    """
+
+    valid = valid_mask(matrix) if valid is None else valid
+    playtime = np.where(valid, matrix, 0).sum(axis=0)
+    return np.where(valid.all(axis=0), playtime, NANOSECONDS_NAT), playtime
+
+
+def best_per_segment(matrix: np.ndarray, valid: Optional[np.ndarray] = None) -> Tuple[np.ndarray, np.ndarray]:  # fmt: skip
+    """
+    Finds the best (i.e. shortest) split of every segment, over partial runs as well
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        valid (Optional[np.ndarray], optional): Precomputed valid_mask(matrix). Defaults to None.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: Best split per segment (NANOSECONDS_NAT if none) and the position of its run (-1 if none)
+    """
+
+    valid = valid_mask(matrix) if valid is None else valid
+    n_segments, n_runs = matrix.shape
+    if not n_runs:
+        return np.full(n_segments, NANOSECONDS_NAT, dtype=np.int64), np.full(n_segments, -1, dtype=np.intp)  # fmt: skip
+
+    has_splits = valid.any(axis=1)
+    positions = np.argmin(np.where(valid, matrix, NANOSECONDS_MAX), axis=1)
+    best = np.where(has_splits, matrix[np.arange(n_segments), positions], NANOSECONDS_NAT)
+    return best, np.where(has_splits, positions, -1)
+
+
+def sum_of_best(matrix: np.ndarray, valid: Optional[np.ndarray] = None) -> int:
+    """
+    Sums the best split of every segment (segments without any splits are skipped)
+
+    Args:
+        matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        valid (Optional[np.ndarray], optional): Precomputed valid_mask(matrix). Defaults to None.
+
+    Returns:
+        int: Sum of best segments in nanoseconds
+    """
+
+    best, _ = best_per_segment(matrix, valid)
+    return int(best[best != NANOSECONDS_NAT].sum())
@@ -1,11 +1,44 @@
 from __future__ import annotations
 import numpy as np
 import pandas as pd
+from lxml import etree
 from pathlib import Path
-from typing import List, Optional
+from functools import cached_property
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 from saltysplits.enums import TimeType
-from saltysplits.annotations import encode_time
 from saltysplits.models import Splits
+from saltysplits.summary import RunSummary
+from saltysplits.rolling import DEFAULT_QUANTILES, DEFAULT_WINDOW, RollingStats
+from saltysplits.simulate import DEFAULT_RUNS, Simulation
+from saltysplits.runs import Run, RunIndex
+from saltysplits.history import CompactHistory, encode_ids
+from saltysplits.icons import IconRef, strip_icons, take_icon
+from saltysplits.writer import write_lss
+from saltysplits.profiling import phase
+from saltysplits.codec import decode_datetimes, decode_times
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.columnar import (
+    SplitsColumns,
+    flag_array,
+    nanosecond_array,
+    scatter_times,
+    sort_run_ids,
+)
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+
+
+def _same_runs(columns: SplitsColumns, other: SplitsColumns) -> bool:
+    # whether two SplitsColumns hold the same runs and attempts (header fields aside)
+    if columns.run_ids != other.run_ids or columns.attempt_ids != other.attempt_ids:
+        return False
+    arrays = ["real_time", "game_time", "attempt_started", "attempt_ended", "attempt_started_synced", "attempt_ended_synced", "attempt_real_time", "attempt_game_time"]  # fmt: skip
+    return all(np.array_equal(getattr(columns, name).astype(np.int64), getattr(other, name).astype(np.int64)) for name in arrays)  # fmt: skip
+
+
+def _decode_flag(value: Optional[str]) -> Optional[bool]:
+    return None if value is None else value == "True"
 
 
 class SaltySplits(Splits):
@@ -20,20 +53,173 @@ class SaltySplits(Splits):
     """
 
     @classmethod
-    def read_lss(cls, lss_path: Path) -> SaltySplits:
+    def read_lss(
+        cls, lss_path: Path, compact: bool = False, lazy_icons: bool = False
+    ) -> SaltySplits:
         """
         Reads a LiveSplit file (LSS) as a SaltySplits root model instance (and populate it with validated splits, runs, attempts and segments).
 
         Args:
             lss_path (Path): Path to the LiveSplit file (.LSS)
+            compact (bool, optional): Whether to keep segment histories as parallel arrays instead of Time models (see saltysplits.history). Defaults to False.
+            lazy_icons (bool, optional): Whether to keep icons as references to their payload in the file instead of base64 strings (see saltysplits.icons). Defaults to False.
 
         Returns:
             SaltySplits: Instanced pydantic-xml model containing deserialized speedrunning data and formatting functionality
         """
 
-        with open(lss_path, "rb") as file:
-            xml_bytes = file.read()
-        return cls.from_xml(xml_bytes)
+        with phase("read_lss"):
+            root, icons = cls._parse_lss(lss_path, lazy_icons=lazy_icons)
+            splits = cls._from_tree(root, compact=compact, icons=icons)
+        # kept outside the model fields (like the cached columns), so it doesn't affect equality or serialization
+        splits.__dict__["_source_path"] = Path(lss_path)
+        return splits
+
+    @classmethod
+    def from_xml(
+        cls, source: Union[str, bytes], context: Optional[dict] = None, **kwargs: Any
+    ) -> SaltySplits:
+        """
+        Deserializes a LiveSplit file (LSS) from its contents, same as pydantic_xml.BaseXmlModel.from_xml but with profiling phases (see saltysplits.profiling)
+
+        Args:
+            source (Union[str, bytes]): Contents of the LiveSplit file (.LSS)
+            context (Optional[dict], optional): Validation context. Defaults to None.
+            **kwargs: Forwarded to lxml.etree.fromstring
+
+        Returns:
+            SaltySplits: Instanced pydantic-xml model
+        """
+
+        with phase("from_xml"):
+            with phase("parse") as parse_phase:
+                root = etree.fromstring(source, **kwargs)
+                if parse_phase.active:
+                    parse_phase.count = sum(1 for _ in root.iter())
+            with phase("validate"):
+                return cls.from_xml_tree(root, context=context)
+
+    @classmethod
+    def _parse_lss(cls, lss_path: Path, lazy_icons: bool) -> Tuple[etree._Element, List[IconRef]]:
+        """
+        Parses a LiveSplit file (LSS) as an lxml tree, optionally with icon payloads replaced by placeholders (see strip_icons)
+
+        Args:
+            lss_path (Path): Path to the LiveSplit file (.LSS)
+            lazy_icons (bool): Whether to replace icon payloads with placeholders
+
+        Returns:
+            Tuple[etree._Element, List[IconRef]]: Root (Run) element and the references to the icon payloads
+        """
+
+        with phase("read") as read_phase:
+            with open(lss_path, "rb") as file:
+                xml_bytes = file.read()
+            read_phase.count = len(xml_bytes)
+        icons = []
+        if lazy_icons:
+            with phase("strip_icons") as strip_phase:
+                xml_bytes, icons = strip_icons(xml_bytes, lss_path)
+                strip_phase.count = len(icons)
+        with phase("parse") as parse_phase:
+            root = etree.fromstring(xml_bytes)
+            if parse_phase.active:
+                # counting elements walks the whole tree, so only when profiling
+                parse_phase.count = sum(1 for _ in root.iter())
+        return root, icons
+
+    @classmethod
+    def _from_tree(
+        cls, root: etree._Element, compact: bool = False, icons: Optional[List[IconRef]] = None
+    ) -> SaltySplits:
+        """
+        Validates an LSS tree, with every SegmentHistory moved into a CompactHistory first if compact is set (so no Time models are built)
+        and icon placeholders swapped for their IconRef (see _parse_lss)
+
+        Args:
+            root (etree._Element): Root (Run) element of the LiveSplit file, its SegmentHistory/icon elements may be emptied
+            compact (bool, optional): Whether to keep segment histories as CompactHistory arrays. Defaults to False.
+            icons (Optional[List[IconRef]], optional): References returned by _parse_lss. Defaults to None (no lazy icons).
+
+        Returns:
+            SaltySplits: Instanced pydantic-xml model
+        """
+
+        icons = icons or []
+        with phase("extract") as extract_phase:
+            game_icon = take_icon(root.find("GameIcon"), icons)
+            segment_icons, histories = [], []
+            for element in root.findall("Segments/Segment"):
+                segment_icons.append(take_icon(element.find("Icon"), icons))
+                history_element = element.find("SegmentHistory")
+                if not compact or history_element is None:
+                    histories.append(None)
+                    continue
+                histories.append(CompactHistory.from_element(history_element))
+                history_element[:] = []
+            extract_phase.count = sum(len(history) for history in histories if history is not None)
+
+        with phase("validate"):
+            splits = cls.from_xml_tree(root)
+        if game_icon is not None:
+            splits.game_icon = game_icon
+        for segment, icon, history in zip(splits.segments, segment_icons, histories):
+            if icon is not None:
+                segment.icon = icon
+            if history is not None:
+                segment.segment_history = history
+        return splits
+
+    @property
+    def source_path(self) -> Optional[Path]:
+        """
+        LiveSplit file (LSS) this instance was read from (see read_lss and refresh), None if it wasn't read from a file
+        """
+
+        return self.__dict__.get("_source_path")
+
+    @property
+    def is_compact(self) -> bool:
+        """
+        Whether segment histories are kept as CompactHistory arrays (see read_lss)
+        """
+
+        return any(isinstance(segment.segment_history, CompactHistory) for segment in self.segments)
+
+    @property
+    def has_lazy_icons(self) -> bool:
+        """
+        Whether icons are kept as IconRef instead of base64 strings (see read_lss)
+        """
+
+        return bool(self._lazy_icons())
+
+    def _lazy_icons(self) -> List[IconRef]:
+        icons = [self.game_icon] + [segment.icon for segment in self.segments]
+        return [icon for icon in icons if isinstance(icon, IconRef)]
+
+    def _locate_icons(self) -> None:
+        # checks lazy icons before serializing, so a missing or changed file raises a ValueError (and not a
+        # PydanticSerializationError from within the icon serializers or a half written file)
+        for icon in self._lazy_icons():
+            icon.locate()
+
+    def to_xml_tree(self, **kwargs: Any) -> etree._Element:
+        """
+        Serializes this instance as an lxml tree, same as pydantic_xml.BaseXmlModel.to_xml_tree (and to_xml, which calls it)
+
+        Args:
+            **kwargs: Forwarded to pydantic_xml.BaseXmlModel.to_xml_tree
+
+        Raises:
+            ValueError: If a lazy icon can't be read (see IconRef.locate)
+
+        Returns:
+            etree._Element: Root (Run) element
+        """
+
+        self._locate_icons()
+        return super().to_xml_tree(**kwargs)
 
     def _collect_ids(self) -> List[Optional[str]]:
         """
@@ -44,14 +230,431 @@ class SaltySplits(Splits):
         """
 
         run_ids = set()
-        run_ids.update([attempt.id for attempt in self.attempt_history])
-        run_ids.update([split.id for segment in self.segments for split in segment.segment_history])  # fmt: skip
-        run_ids = list(run_ids)
+        run_ids.update([attempt.id for attempt in self.attempt_history or []])
+        for segment in self.segments:
+            history = segment.segment_history or []
+            run_ids.update(history.id_list() if isinstance(history, CompactHistory) else [split.id for split in history])  # fmt: skip
 
         # sort them as int if possible
-        if all(map(lambda x: str(int(x)) == x, run_ids)):
-            run_ids = sorted(run_ids, key=lambda x: int(x))
-        return run_ids
+        return sort_run_ids(run_ids)
+
+    def _time_matrix(
+        self,
+        time_type: TimeType,
+        run_ids: List[Optional[str]],
+        run_positions: Optional[Dict[str, int]] = None,
+    ) -> np.ndarray:
+        """
+        Collects all splits of the given time type as (segment, run, nanoseconds) triplets and scatters them into a single matrix
+
+        Args:
+            time_type (TimeType): Whether to use GameTime or RealTime values
+            run_ids (List[Optional[str]]): Run IDs that make up the columns of the matrix (see _collect_ids)
+            run_positions (Optional[Dict[str, int]], optional): Column position per run ID (see RunIndex). Defaults to None (derived from run_ids).
+
+        Returns:
+            np.ndarray: int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+        """
+
+        if run_positions is None:
+            run_positions = {run_id: i for i, run_id in enumerate(run_ids)}
+        run_keys = encode_ids(run_ids)
+        time_attribute = "game_time" if time_type == TimeType.GAME_TIME else "real_time"
+
+        segment_indices, run_indices, time_values = [], [], []
+        for segment_index, segment in enumerate(self.segments):
+            history = segment.segment_history or []
+            if isinstance(history, CompactHistory):
+                # reads the arrays directly, run IDs are matched with a binary search if they're all integers
+                times = getattr(history, time_attribute)
+                present = times != NANOSECONDS_NAT
+                if history.ids.dtype == np.int64 and run_keys.dtype == np.int64:
+                    positions = np.searchsorted(run_keys, history.ids[present])
+                else:
+                    positions = np.array([run_positions[run_id] for run_id in np.asarray(history.id_list(), dtype=object)[present]], dtype=np.intp)  # fmt: skip
+                segment_indices.append(np.full(len(positions), segment_index, dtype=np.intp))
+                run_indices.append(positions)
+                time_values.append(times[present])
+                continue
+
+            splits = [split for split in history if getattr(split, time_attribute) is not None]
+            segment_indices.append(np.full(len(splits), segment_index, dtype=np.intp))
+            run_indices.append(np.array([run_positions[split.id] for split in splits], dtype=np.intp))  # fmt: skip
+            time_values.append(np.array([getattr(split, time_attribute).value for split in splits], dtype=np.int64))  # fmt: skip
+
+        shape = (len(self.segments), len(run_ids))
+        if not segment_indices:
+            return scatter_times(shape, [], [], [])
+        return scatter_times(
+            shape,
+            np.concatenate(segment_indices),
+            np.concatenate(run_indices),
+            np.concatenate(time_values),
+        )
+
+    def to_columns(self) -> SplitsColumns:
+        """
+        Represents the speedrunning data as a SplitsColumns instance (i.e. flat int64/datetime64 arrays instead of pydantic-xml models).
+        Built from the models as they are now on every call (see columns for a cached snapshot)
+
+        Returns:
+            SplitsColumns: Columnar representation of splits and attempts (see saltysplits.columnar)
+        """
+
+        with phase("to_columns"):
+            with phase("run_index") as index_phase:
+                index = RunIndex.from_splits(self)
+                index_phase.count = len(index.run_ids)
+            return self._to_columns(index)
+
+    def _to_columns(self, index: RunIndex) -> SplitsColumns:
+        """
+        Builds the SplitsColumns of to_columns from a run index of the current models
+
+        Args:
+            index (RunIndex): Run index of this instance (see run_index)
+
+        Returns:
+            SplitsColumns: Columnar representation of splits and attempts (see saltysplits.columnar)
+        """
+
+        run_ids = index.run_ids
+        with phase("time_matrix") as matrix_phase:
+            real_time = self._time_matrix(TimeType.REAL_TIME, run_ids, index.run_positions)
+            game_time = self._time_matrix(TimeType.GAME_TIME, run_ids, index.run_positions)
+            matrix_phase.count = real_time.size + game_time.size
+        with phase("attempts") as attempts_phase:
+            attempts = self.attempt_history or []
+            attempts_phase.count = len(attempts)
+            return SplitsColumns(
+                game_name=self.game_name,
+                category_name=self.category_name,
+                attempt_count=self.attempt_count,
+                segment_names=[segment.name for segment in self.segments],
+                run_ids=run_ids,
+                real_time=real_time,
+                game_time=game_time,
+                attempt_ids=[attempt.id for attempt in attempts],
+                attempt_started=np.array(
+                    [attempt.started for attempt in attempts], dtype="datetime64[ns]"
+                ),
+                attempt_ended=np.array(
+                    [attempt.ended for attempt in attempts], dtype="datetime64[ns]"
+                ),
+                attempt_started_synced=flag_array(
+                    [attempt.is_started_synced for attempt in attempts]
+                ),
+                attempt_ended_synced=flag_array([attempt.is_ended_synced for attempt in attempts]),
+                attempt_real_time=nanosecond_array([attempt.real_time for attempt in attempts]),
+                attempt_game_time=nanosecond_array([attempt.game_time for attempt in attempts]),
+            )
+
+    @cached_property
+    def columns(self) -> SplitsColumns:
+        """
+        Cached snapshot of to_columns, built on first access. Kept up to date by refresh (appended runs only, along with the summaries and rolling
+        statistics cached on it), but not by manual edits of the underlying models (use reset_columns after those). summary uses it, to_df, rolling, etc.
+        don't, they're built from the models on every call
+
+        Returns:
+            SplitsColumns: Columnar representation of splits and attempts (see saltysplits.columnar)
+        """
+
+        return self._to_columns(self.run_index)
+
+    @cached_property
+    def run_index(self) -> RunIndex:
+        """
+        Lookup tables from run ID to its column, Attempt and split per segment (see saltysplits.runs), built on first access and
+        reused by columns, get_run and runs. Kept up to date by refresh, get_run and runs rebuild it if the models were edited in a way that moved
+        or removed runs (other manual edits need reset_columns)
+
+        Returns:
+            RunIndex: Positions of every run ID in the columns, AttemptHistory and SegmentHistory
+        """
+
+        return RunIndex.from_splits(self)
+
+    def get_run(self, run_id: str) -> Run:
+        """
+        Looks up a single run (its Attempt and split per segment) through the run index, without going over any other runs.
+        If the run isn't where the index expects it (i.e. the models were edited), the run index and cached columns are rebuilt first
+
+        Args:
+            run_id (str): Run ID (e.g. Attempt.id)
+
+        Raises:
+            KeyError: If there is no attempt or split with this run ID
+
+        Returns:
+            Run: The attempt, its Time per segment and the RealTime/GameTime splits as int64 nanoseconds (see saltysplits.runs)
+        """
+
+        return self.runs([run_id])[0]
+
+    def runs(self, run_ids: Iterable[str]) -> List[Run]:
+        """
+        Looks up multiple runs through the run index (see get_run)
+
+        Args:
+            run_ids (Iterable[str]): Run IDs (e.g. Attempt.id)
+
+        Raises:
+            KeyError: If there is no attempt or split for one of the run IDs
+
+        Returns:
+            List[Run]: One Run per run ID, in the given order
+        """
+
+        run_ids = list(run_ids)
+        try:
+            return [self.run_index.run(self, run_id) for run_id in run_ids]
+        except ValueError:
+            # runs moved or were removed since the index was built, so it's rebuilt from the models (along with the stale columns)
+            self.reset_columns()
+            return [self.run_index.run(self, run_id) for run_id in run_ids]
+
+    def summary(self, time_type: TimeType = TimeType.REAL_TIME) -> RunSummary:
+        """
+        Returns precomputed aggregates for all runs (totals, completion, resets, best run, ranking, PB progression,
+        per-segment best/mean/median/std and sum of best). Cached per time type along with columns (i.e. kept up to date by refresh and dropped
+        together with the run index, use reset_columns after manual edits of the models)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+
+        Returns:
+            RunSummary: Precomputed run/segment aggregates (see saltysplits.summary)
+        """
+
+        with phase("summary"):
+            return self.columns.summary(time_type)
+
+    def rolling(
+        self,
+        time_type: TimeType = TimeType.REAL_TIME,
+        window: int = DEFAULT_WINDOW,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> RollingStats:
+        """
+        Returns rolling mean, median, minimum and quantiles over the last window splits of every segment (and the last window complete runs),
+        plus the best so far (PB/gold progression). Built from the models in a single vectorized pass on every call (columns.rolling caches them,
+        and refresh continues cached statistics for appended runs only, see saltysplits.rolling)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            window (int, optional): Number of values per window. Defaults to DEFAULT_WINDOW.
+            quantiles (Sequence[float], optional): Quantiles to track (the median is always included). Defaults to DEFAULT_QUANTILES.
+
+        Raises:
+            ValueError: If window is smaller than 1 or a quantile isn't between 0 and 1
+
+        Returns:
+            RollingStats: Rolling statistics for every run (see RollingStats.to_df and RollingStats.totals)
+        """
+
+        with phase("rolling") as rolling_phase:
+            stats = self.to_columns().rolling(time_type, window, quantiles)
+            rolling_phase.count = stats.mean.size
+            return stats
+
+    def simulate(
+        self,
+        time_type: TimeType = TimeType.REAL_TIME,
+        completed: int = 0,
+        elapsed: int = 0,
+        n_runs: int = DEFAULT_RUNS,
+        half_life: Optional[float] = None,
+        seed: Optional[int] = 0,
+        workers: Optional[int] = None,
+    ) -> Simulation:
+        """
+        Predicts the finish time distribution and PB probability from the current split by simulating n_runs runs, drawing every remaining segment
+        from its past splits (optionally weighted toward recent attempts). Batched and seeded, so results are reproducible with or without workers (see saltysplits.simulate).
+        Splits are taken from the models as they are now (use columns.simulator to reuse the columns kept up to date by refresh)
+
+        Args:
+            time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+            completed (int, optional): Number of segments that were already completed. Defaults to 0 (simulates whole runs).
+            elapsed (int, optional): Time spent on the completed segments in nanoseconds. Defaults to 0.
+            n_runs (int, optional): Number of runs to simulate. Defaults to DEFAULT_RUNS.
+            half_life (Optional[float], optional): Number of runs after which a split counts half as much. Defaults to None (all splits count the same).
+            seed (Optional[int], optional): Seed for reproducible results. Defaults to 0 (None for a different outcome every time).
+            workers (Optional[int], optional): Number of processes to spread batches over. Defaults to None (simulates in this process).
+
+        Raises:
+            ValueError: If n_runs isn't positive, completed is out of range or a remaining segment has no splits
+
+        Returns:
+            Simulation: Simulated finish times (see Simulation.pb_probability, Simulation.quantiles and Simulation.histogram)
+        """
+
+        with phase("simulate") as simulate_phase:
+            simulator = self.to_columns().simulator(time_type, half_life)
+            simulation = simulator.run(completed, elapsed, n_runs, seed, workers)
+            simulate_phase.count = n_runs
+            return simulation
+
+    def reset_columns(self) -> None:
+        """
+        Drops the cached columnar representation (and summaries) and run index so they're rebuilt from the models on next access
+        """
+
+        self.__dict__.pop("columns", None)
+        self.__dict__.pop("run_index", None)
+
+    def refresh(self, lss_path: Path) -> List[Optional[str]]:
+        """
+        Updates this instance in place with the attempts that were added to the LiveSplit file (LSS) since it was read.
+        Known run IDs are dropped from the XML tree before validation, so only new Attempt/Time elements are turned into models
+        (and appended to the cached columns, compact segment histories stay compact). Falls back to a full reload if segments were renamed, reordered, added or removed,
+        or if any known run was removed from or changed in the file (compared with the models as they are now, see _known_runs_changed)
+
+        Args:
+            lss_path (Path): Path to the (updated) LiveSplit file (.LSS)
+
+        Returns:
+            List[Optional[str]]: Run IDs that are new compared to what was loaded before
+        """
+
+        root, icons = type(self)._parse_lss(lss_path, lazy_icons=self.has_lazy_icons)
+        self.__dict__["_source_path"] = Path(lss_path)
+        segment_elements = root.findall("Segments/Segment")
+        attempt_element = root.find("AttemptHistory")
+        history_elements = [element.find("SegmentHistory") for element in segment_elements]
+
+        # known runs come from the models (not the cached columns, which miss manual edits)
+        index = RunIndex.from_splits(self)
+        current = self._to_columns(index)
+        known_ids = set(index.run_ids)
+        file_ids = set(attempt_element.xpath("Attempt/@id")) if attempt_element is not None else set()  # fmt: skip
+        for history_element in history_elements:
+            if history_element is not None:
+                file_ids.update(history_element.xpath("Time/@id"))
+        new_ids = sort_run_ids(file_ids - known_ids)
+
+        segment_names = [element.findtext("Name") for element in segment_elements]
+        if segment_names != current.segment_names or self._known_runs_changed(current, attempt_element, history_elements, known_ids):  # fmt: skip
+            # appending isn't enough if segments changed or known runs were deleted or edited
+            reloaded = type(self)._from_tree(root, compact=self.is_compact, icons=icons)
+            for name in type(self).model_fields:
+                setattr(self, name, getattr(reloaded, name))
+            self.reset_columns()
+            return new_ids
+
+        # drops all known runs from the tree so we only validate the new ones
+        for parent, tag in [(attempt_element, "Attempt")] + [(element, "Time") for element in history_elements]:  # fmt: skip
+            if parent is not None:
+                parent[:] = [child for child in parent if child.tag != tag or child.get("id") not in known_ids]  # fmt: skip
+        appended = type(self)._from_tree(root, compact=self.is_compact, icons=icons)
+        attempt_offset = len(self.attempt_history or [])
+        history_offsets = [len(segment.segment_history or []) for segment in self.segments]
+
+        for name in type(self).model_fields.keys() - {"attempt_history", "segments"}:
+            setattr(self, name, getattr(appended, name))
+        if self.attempt_history is None:
+            self.attempt_history = appended.attempt_history
+        else:
+            self.attempt_history.extend(appended.attempt_history or [])
+
+        for segment, appended_segment in zip(self.segments, appended.segments):
+            segment.icon = appended_segment.icon
+            segment.split_times = appended_segment.split_times
+            segment.best_segment_time = appended_segment.best_segment_time
+            if segment.segment_history is None:
+                segment.segment_history = appended_segment.segment_history
+            else:
+                segment.segment_history.extend(appended_segment.segment_history or [])
+
+        # the cached columns (and the rolling statistics on them) are only kept if they match the models,
+        # run IDs that don't sort after the known ones require a rebuild (on next access)
+        cached = self.__dict__.get("columns")
+        columns = (cached if cached is not None and _same_runs(cached, current) else current).append(appended.columns)  # fmt: skip
+        index = index.append(appended.run_index, attempt_offset, history_offsets)
+        if columns is None or index is None:
+            self.reset_columns()
+        else:
+            self.__dict__["columns"] = columns
+            self.__dict__["run_index"] = index
+        return new_ids
+
+    def _known_runs_changed(
+        self,
+        columns: SplitsColumns,
+        attempt_element: Optional[etree._Element],
+        history_elements: List[Optional[etree._Element]],
+        known_ids: set,
+    ) -> bool:
+        """
+        Checks whether the known runs in an LSS tree differ from the models (see refresh), i.e. whether an Attempt or Time of a known run
+        was removed, added, moved or edited. Values are decoded in batches and compared as int64 arrays, so no models are validated
+
+        Args:
+            columns (SplitsColumns): Columns built from the models as they are now (see to_columns)
+            attempt_element (Optional[etree._Element]): AttemptHistory element of the LSS tree
+            history_elements (List[Optional[etree._Element]]): SegmentHistory element per segment of the LSS tree
+            known_ids (set): Run IDs of the models
+
+        Returns:
+            bool: True if any known run differs between the LSS tree and the models
+        """
+
+        attempts = [] if attempt_element is None else [attempt for attempt in attempt_element.iterfind("Attempt") if attempt.get("id") in known_ids]  # fmt: skip
+        if [attempt.get("id") for attempt in attempts] != columns.attempt_ids:
+            return True
+        values = {
+            "attempt_started": decode_datetimes([attempt.get("started") for attempt in attempts]),
+            "attempt_ended": decode_datetimes([attempt.get("ended") for attempt in attempts]),
+            "attempt_started_synced": flag_array(
+                [_decode_flag(attempt.get("isStartedSynced")) for attempt in attempts]
+            ),
+            "attempt_ended_synced": flag_array(
+                [_decode_flag(attempt.get("isEndedSynced")) for attempt in attempts]
+            ),
+            "attempt_real_time": decode_times(
+                [attempt.findtext("RealTime") for attempt in attempts]
+            ),
+            "attempt_game_time": decode_times(
+                [attempt.findtext("GameTime") for attempt in attempts]
+            ),
+        }
+        if not all(np.array_equal(array.astype(np.int64), getattr(columns, name).astype(np.int64)) for name, array in values.items()):  # fmt: skip
+            return True
+
+        for segment, history_element in zip(self.segments, history_elements):
+            history = segment.segment_history or []
+            times = [] if history_element is None else [time for time in history_element.iterfind("Time") if time.get("id") in known_ids]  # fmt: skip
+            ids = history.id_list() if isinstance(history, CompactHistory) else [time.id for time in history]  # fmt: skip
+            if [time.get("id") for time in times] != ids:
+                return True
+            if isinstance(history, CompactHistory):
+                real_time, game_time = history.real_time, history.game_time
+            else:
+                real_time = nanosecond_array([time.real_time for time in history])
+                game_time = nanosecond_array([time.game_time for time in history])
+            if not np.array_equal(decode_times([time.findtext("RealTime") for time in times]).view(np.int64), real_time):  # fmt: skip
+                return True
+            if not np.array_equal(decode_times([time.findtext("GameTime") for time in times]).view(np.int64), game_time):  # fmt: skip
+                return True
+        return False
+
+    def write_lss(self, lss_path: Path, source: Optional[Path] = None) -> None:
+        """
+        Writes this instance as a LiveSplit file (LSS), streaming it to disk element by element (see saltysplits.writer).
+        Metadata and AutoSplitterSettings aren't part of the models, they're copied from source (the file this instance was read from by default)
+
+        Args:
+            lss_path (Path): Destination of the LiveSplit file (.LSS), can be the same as source
+            source (Optional[Path], optional): LiveSplit file to copy unmodelled sections from. Defaults to None (source_path, if it still exists).
+
+        Raises:
+            ValueError: If a lazy icon can't be read (see IconRef.locate)
+        """
+
+        self._locate_icons()
+        if source is None and self.source_path is not None and self.source_path.exists():
+            source = self.source_path
+        write_lss(self, lss_path, source=source)
 
     def is_comparable(self, other: SaltySplits, strict: bool = True) -> bool:
         """
@@ -84,7 +687,8 @@ class SaltySplits(Splits):
     ) -> pd.DataFrame:
         """
         Iterates over all splits to reconstruct individual runs (partial or otherwise) and represent them as a single pandas.DataFrame.
-        Can then be used for further analysis within Python or dumped to common formats for use outside (e.g. see pandas.DataFrame.to_csv)
+        Can then be used for further analysis within Python or dumped to common formats for use outside (e.g. see pandas.DataFrame.to_csv).
+        Built from the models as they are now, so edits made since the last call are included (columns.to_df reuses a cached snapshot instead)
 
         Args:
             time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
@@ -98,35 +702,70 @@ class SaltySplits(Splits):
             pd.DataFrame: pandas.DataFrame of shape (n_segments, n_runs) containing run data
         """
 
-        run_ids = self._collect_ids()
-        segment_names = [segment.name for segment in self.segments]
-        placeholder_data = np.full((len(segment_names), len(run_ids)), np.timedelta64("NaT", "ns"))
-        placeholder_df = pd.DataFrame(placeholder_data, columns=run_ids, index=segment_names)
+        with phase("to_df"):
+            columns = self.to_columns()
+            with phase("frame") as frame_phase:
+                df = columns.to_df(
+                    time_type=time_type,
+                    allow_partial=allow_partial,
+                    allow_empty=allow_empty,
+                    cumulative=cumulative,
+                    lss_repr=lss_repr,
+                    lss_ns=lss_ns,
+                )
+                frame_phase.count = df.size
+            return df
 
-        for segment in self.segments:
-            for split in segment.segment_history:
-                if time_type == time_type.GAME_TIME:
-                    time = split.game_time
-                elif time_type == time_type.REAL_TIME:
-                    time = split.real_time
-                placeholder_df.loc[segment.name, split.id] = time
-
-        if not allow_partial:
-            # drops runs that have one or more NaT values (i.e. incomplete runs)
-            placeholder_df = placeholder_df.loc[:, ~placeholder_df.isna().any()]
-
-        if not allow_empty:
-            # drops runs that only have NaT values (i.e. empty runs)
-            placeholder_df = placeholder_df.loc[:, ~placeholder_df.isna().all()]
-
-        if cumulative:
-            # skipna ensures that we stop accumulating if we miss a split in beween
-            placeholder_df = placeholder_df.apply(lambda column: column.cumsum(skipna=False))
-
-        if lss_repr:
-            # formats timedelta values to same string representation as used in LSS files
-            placeholder_df = placeholder_df.map(
-                lambda x: encode_time(x, include_ns=lss_ns) if pd.notna(x) else None
-            )
+    def attempts_to_df(self) -> pd.DataFrame:
+        """
+        Represents the AttemptHistory as a single pandas.DataFrame (see SplitsColumns.attempts_to_df), indexed by run ID so it
+        can be joined with the runs of to_df on the index (e.g. splits.to_df().T.join(splits.attempts_to_df())). Built from the models on every call
+
+        Returns:
+            pd.DataFrame: started, ended, duration, started_synced, ended_synced, real_time and game_time per attempt
+        """
+
+        with phase("attempts_to_df"):
+            columns = self.to_columns()
+            with phase("frame") as frame_phase:
+                df = columns.attempts_to_df()
+                frame_phase.count = len(df)
+            return df
+
+    def to_arrow(self) -> pa.Table:
+        """
+        Represents all splits as a long-format Arrow table, with one row per run and segment that has a split (see saltysplits.arrow).
+        Built directly from the int64 columns (see to_columns), so it's lossless (nanoseconds and nulls are kept) and ready for
+        e.g. Polars or DuckDB. Requires pyarrow (pip install saltysplits[arrow])
+
+        Raises:
+            ImportError: If pyarrow isn't installed
+
+        Returns:
+            pa.Table: Table with run_id, segment_index, segment_name, real_time and game_time (duration[ns]), attempt_started and attempt_ended (timestamp[ns])
+        """
+
+        with phase("to_arrow"):
+            columns = self.to_columns()
+            with phase("table") as table_phase:
+                table = columns.to_arrow()
+                table_phase.count = table.num_rows
+            return table
+
+    def to_parquet(self, path: Path, **kwargs: Any) -> None:
+        """
+        Writes all splits as a Parquet file, using the long-format Arrow table of to_arrow. Requires pyarrow (pip install saltysplits[arrow])
+
+        Args:
+            path (Path): Destination of the Parquet file
+            **kwargs: Forwarded to pyarrow.parquet.write_table (e.g. compression)
+
+        Raises:
+            ImportError: If pyarrow isn't installed
+        """
+
+        from saltysplits.arrow import write_parquet
 
-        return placeholder_df
+        table = self.to_arrow()
+        with phase("parquet"):
+            write_parquet(table, path, **kwargs)
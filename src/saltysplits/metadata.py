@@ -0,0 +1,84 @@
+from __future__ import annotations
+from lxml import etree
+from pathlib import Path
+from typing import BinaryIO, List, NamedTuple, Optional, Union
+from saltysplits.iterparse import release_element
+
+# children of Run that are kept as is (text), everything else is skipped
+HEADER_TAGS = ("GameName", "CategoryName", "LayoutPath", "Offset", "AttemptCount")
+
+
+class LssMetadata(NamedTuple):
+    """
+    Header of a LiveSplit file (LSS), see read_metadata
+
+    Args:
+        version (Optional[str]): LiveSplit version that wrote the file (version attribute of Run)
+        game_name (Optional[str]): Name of the game
+        category_name (Optional[str]): Name of the category
+        layout_path (Optional[str]): Path to the layout file, as written in the file
+        offset (Optional[str]): Timer offset, as written in the file (e.g. "-00:00:01.5000000")
+        attempt_count (int): Number of attempts (0 if missing)
+        segment_names (Optional[List[str]]): Names of all segments or None if segments weren't read
+    """
+
+    version: Optional[str]
+    game_name: Optional[str]
+    category_name: Optional[str]
+    layout_path: Optional[str]
+    offset: Optional[str]
+    attempt_count: int
+    segment_names: Optional[List[str]]
+
+
+def _read_metadata(file: BinaryIO, segments: bool) -> LssMetadata:
+    version, header, segment_names, depth = None, {}, [], 0
+    for event, element in etree.iterparse(file, events=("start", "end")):
+        if event == "start":
+            depth += 1
+            if depth == 1:
+                version = element.get("version")
+            elif depth == 2 and element.tag == "AttemptHistory" and not segments:
+                # the header precedes the histories, so there's nothing left to read
+                break
+            continue
+
+        depth -= 1
+        if depth == 1:
+            if element.tag in HEADER_TAGS:
+                header[element.tag] = element.text
+            release_element(element)
+        elif depth == 2:
+            if element.tag == "Segment" and element.getparent().tag == "Segments":
+                segment_names.append(element.findtext("Name"))
+            release_element(element)
+
+    attempt_count = header.get("AttemptCount")
+    return LssMetadata(
+        version=version,
+        game_name=header.get("GameName"),
+        category_name=header.get("CategoryName"),
+        layout_path=header.get("LayoutPath"),
+        offset=header.get("Offset"),
+        attempt_count=int(attempt_count) if attempt_count else 0,
+        segment_names=segment_names if segments else None,
+    )
+
+
+def read_metadata(lss_path: Union[Path, BinaryIO], segments: bool = True) -> LssMetadata:
+    """
+    Reads the header of a LiveSplit file (LSS), i.e. game, category, attempt count, etc, without validating the file or importing
+    pandas/pydantic (so it's cheap to import and run, e.g. in a CLI). Stops before the histories if segments is False
+
+    Args:
+        lss_path (Union[Path, BinaryIO]): Path to the LiveSplit file (.LSS) or a binary file-like object
+        segments (bool, optional): Whether to read segment names as well (requires a pass over the whole file). Defaults to True.
+
+    Returns:
+        LssMetadata: Header of the LiveSplit file
+    """
+
+    if hasattr(lss_path, "read"):
+        return _read_metadata(lss_path, segments=segments)
+    with open(lss_path, "rb") as file:
+        return _read_metadata(file, segments=segments)
@@ -1,14 +1,15 @@
 from __future__ import annotations
 from pandas import Timedelta
-from pydantic import conint
+from pydantic import SerializerFunctionWrapHandler, conint, field_serializer
 from pydantic_xml import BaseXmlModel, attr, element, wrapped
-from typing import List, Optional
+from typing import Any, List, Optional, Sequence, Union
 from saltysplits.annotations import TimeOptional, DateTime, SBool, OffsetOptional
+from saltysplits.icons import IconRef
 
 
 class Splits(BaseXmlModel, tag="Run", arbitrary_types_allowed=True, search_mode="ordered"):
     version: Optional[str] = attr(name="version", default=None)
-    game_icon: Optional[str] = element(tag="GameIcon", default=None)
+    game_icon: Optional[Union[str, IconRef]] = element(tag="GameIcon", default=None)
     game_name: str = element(tag="GameName")
     category_name: str = element(tag="CategoryName")
     layout_path: Optional[str] = element(tag="LayoutPath", default=None)
@@ -17,6 +18,11 @@ class Splits(BaseXmlModel, tag="Run", arbitrary_types_allowed=True, search_mode=
     attempt_history: Optional[List[Attempt]] = wrapped("AttemptHistory", default=None)
     segments: List[Segment] = wrapped("Segments")
 
+    @field_serializer("game_icon", mode="wrap")
+    def serialize_game_icon(self, value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+        # game_icon can be an IconRef (see saltysplits.icons), str reads its payload
+        return handler(value if value is None or isinstance(value, str) else str(value))
+
 
 class BaseTime(BaseXmlModel, arbitrary_types_allowed=True, search_mode="ordered"):
     real_time: TimeOptional = element(tag="RealTime", default=None)
@@ -33,11 +39,21 @@ class Attempt(BaseTime, tag="Attempt"):
 
 class Segment(BaseXmlModel, tag="Segment", arbitrary_types_allowed=True, search_mode="ordered"):
     name: str = element(tag="Name")
-    icon: Optional[str] = element(tag="Icon", default=None)
+    icon: Optional[Union[str, IconRef]] = element(tag="Icon", default=None)
     split_times: List[SplitTime] = wrapped("SplitTimes")
     best_segment_time: BaseTime = element(tag="BestSegmentTime")
     segment_history: Optional[List[Time]] = wrapped("SegmentHistory", default=None)
 
+    @field_serializer("icon", mode="wrap")
+    def serialize_icon(self, value: Any, handler: SerializerFunctionWrapHandler) -> Any:
+        # icon can be an IconRef (see saltysplits.icons), str reads its payload
+        return handler(value if value is None or isinstance(value, str) else str(value))
+
+    @field_serializer("segment_history", mode="wrap")
+    def serialize_history(self, value: Optional[Sequence[Time]], handler: SerializerFunctionWrapHandler) -> Any:  # fmt: skip
+        # segment_history can be a CompactHistory (see saltysplits.history), which pydantic only serializes as a list
+        return handler(value if value is None or isinstance(value, list) else list(value))
+
 
 class SplitTime(BaseTime, tag="SplitTime"):
     name: str = attr(name="name")
@@ -0,0 +1,249 @@
+from __future__ import annotations
+import os
+import re
+import json
+import mmap
+import tempfile
+from lxml import etree
+from pathlib import Path
+from typing import List, NamedTuple, Optional, Tuple, Union
+from saltysplits.models import Attempt, Segment
+from saltysplits.history import CompactHistory
+
+# bump whenever the layout of the sidecar changes (older sidecars are rebuilt)
+INDEX_FORMAT = 1
+INDEX_SUFFIX = ".index.json"
+# LiveSplit doesn't nest these elements (and names/icons can't contain tags), so a byte scan finds them without parsing
+SEGMENTS_PATTERN = re.compile(rb"<Segments(?:\s[^>]*)?>(.*?)</Segments>", re.DOTALL)
+SEGMENT_PATTERN = re.compile(rb"<Segment(?:\s[^>]*)?>.*?</Segment>", re.DOTALL)
+NAME_PATTERN = re.compile(rb"<Name(?:\s[^>]*)?>.*?</Name>|<Name\s*/>", re.DOTALL)
+HISTORY_PATTERN = re.compile(rb"<SegmentHistory(?:\s[^>]*)?>.*?</SegmentHistory>|<SegmentHistory\s*/>", re.DOTALL)  # fmt: skip
+ATTEMPTS_PATTERN = re.compile(rb"<AttemptHistory(?:\s[^>]*)?>.*?</AttemptHistory>|<AttemptHistory\s*/>", re.DOTALL)  # fmt: skip
+
+
+class SegmentOffsets(NamedTuple):
+    """
+    Byte ranges (start, end) of a single Segment element and its SegmentHistory, see index_lss
+
+    Args:
+        name (str): Segment name
+        segment (Tuple[int, int]): Byte range of the Segment element
+        history (Optional[Tuple[int, int]]): Byte range of its SegmentHistory element (None if missing)
+    """
+
+    name: str
+    segment: Tuple[int, int]
+    history: Optional[Tuple[int, int]]
+
+
+class LssOffsets(NamedTuple):
+    """
+    Byte ranges of the AttemptHistory and every Segment in a LiveSplit file (LSS), stored in a sidecar next to it (see index_lss)
+
+    Args:
+        stamp (Tuple[int, int]): Size and mtime (ns) of the file when it was indexed, used to detect changes
+        attempt_history (Optional[Tuple[int, int]]): Byte range of the AttemptHistory element (None if missing)
+        segments (List[SegmentOffsets]): Byte ranges per segment, in order
+    """
+
+    stamp: Tuple[int, int]
+    attempt_history: Optional[Tuple[int, int]]
+    segments: List[SegmentOffsets]
+
+    def find(self, segment: Union[str, int]) -> SegmentOffsets:
+        """
+        Looks up a segment by name (first match) or position
+
+        Args:
+            segment (Union[str, int]): Segment name or index (negative indices count from the end)
+
+        Raises:
+            KeyError: If there is no segment with this name
+            IndexError: If the index is out of range
+
+        Returns:
+            SegmentOffsets: Byte ranges of the segment
+        """
+
+        if isinstance(segment, int):
+            return self.segments[segment]
+        for offsets in self.segments:
+            if offsets.name == segment:
+                return offsets
+        raise KeyError(f"Unknown segment '{segment}'")
+
+
+def _stamp(lss_path: Path) -> Tuple[int, int]:
+    status = os.stat(lss_path)
+    return (status.st_size, status.st_mtime_ns)
+
+
+def _span(match: Optional[re.Match]) -> Optional[Tuple[int, int]]:
+    return match.span() if match is not None else None
+
+
+def _read_range(lss_path: Path, span: Tuple[int, int]) -> bytes:
+    # copies only the requested byte range out of the file (through the page cache, without reading the rest)
+    with open(lss_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            return buffer[span[0] : span[1]]
+
+
+def scan_offsets(lss_path: Path) -> LssOffsets:
+    """
+    Scans a LiveSplit file (LSS) once for the byte ranges of the AttemptHistory and every Segment (and its SegmentHistory),
+    with regular expressions over a memory map of the file (i.e. without parsing or validating anything but the segment names)
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+
+    Raises:
+        ValueError: If the file is empty
+
+    Returns:
+        LssOffsets: Byte ranges of the AttemptHistory and all segments
+    """
+
+    stamp = _stamp(lss_path)
+    if not stamp[0]:
+        raise ValueError(f"'{lss_path}' is empty")
+
+    segments = []
+    with open(lss_path, "rb") as file:
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            attempt_history = _span(ATTEMPTS_PATTERN.search(buffer))
+            segments_match = SEGMENTS_PATTERN.search(buffer)
+            if segments_match is not None:
+                start, end = segments_match.span(1)
+                for match in SEGMENT_PATTERN.finditer(buffer, start, end):
+                    name_match = NAME_PATTERN.search(buffer, match.start(), match.end())
+                    name = (etree.fromstring(name_match.group(0)).text or "") if name_match else ""  # fmt: skip
+                    history = _span(HISTORY_PATTERN.search(buffer, match.start(), match.end()))
+                    segments.append(SegmentOffsets(name, match.span(), history))
+    return LssOffsets(stamp=stamp, attempt_history=attempt_history, segments=segments)
+
+
+def _index_path(lss_path: Path, index_path: Optional[Path]) -> Path:
+    return Path(index_path) if index_path is not None else lss_path.with_name(lss_path.name + INDEX_SUFFIX)  # fmt: skip
+
+
+def _load_index(index_path: Path) -> Optional[LssOffsets]:
+    try:
+        with open(index_path, "r", encoding="utf-8") as file:
+            index = json.load(file)
+        if index["format"] != INDEX_FORMAT:
+            return None
+        return LssOffsets(
+            stamp=tuple(index["stamp"]),
+            attempt_history=tuple(index["attempt_history"]) if index["attempt_history"] else None,
+            segments=[
+                SegmentOffsets(name, tuple(segment), tuple(history) if history else None)
+                for name, segment, history in index["segments"]
+            ],
+        )
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_index(index_path: Path, offsets: LssOffsets) -> None:
+    # written to a temporary file first, so readers never see a partial sidecar
+    try:
+        file_descriptor, temporary_path = tempfile.mkstemp(prefix=f".{index_path.name}.", dir=index_path.parent)  # fmt: skip
+    except OSError:
+        # a read-only directory only means we scan again next time
+        return
+    try:
+        with os.fdopen(file_descriptor, "w", encoding="utf-8") as file:
+            json.dump({"format": INDEX_FORMAT, **offsets._asdict()}, file)
+        os.replace(temporary_path, index_path)
+    except OSError:
+        Path(temporary_path).unlink(missing_ok=True)
+
+
+def index_lss(lss_path: Path, index_path: Optional[Path] = None) -> LssOffsets:
+    """
+    Returns the byte ranges of a LiveSplit file (LSS) from its sidecar index, scanning the file (see scan_offsets) and (re)writing the
+    sidecar if it's missing or the file changed since (detected by size and mtime)
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+        index_path (Optional[Path], optional): Path to the sidecar index. Defaults to None (lss_path with INDEX_SUFFIX appended).
+
+    Returns:
+        LssOffsets: Byte ranges of the AttemptHistory and all segments
+    """
+
+    lss_path = Path(lss_path)
+    index_path = _index_path(lss_path, index_path)
+    offsets = _load_index(index_path)
+    if offsets is None or offsets.stamp != _stamp(lss_path):
+        offsets = scan_offsets(lss_path)
+        _store_index(index_path, offsets)
+    return offsets
+
+
+def load_segment(lss_path: Path, segment: Union[str, int], index_path: Optional[Path] = None) -> Segment:  # fmt: skip
+    """
+    Reads a single segment (including its SegmentHistory) from a LiveSplit file (LSS), only parsing and validating the bytes of that segment.
+    Its byte range comes from the sidecar index (see index_lss), so this takes time proportional to the size of the segment, not the file
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+        segment (Union[str, int]): Segment name or index (negative indices count from the end)
+        index_path (Optional[Path], optional): Path to the sidecar index. Defaults to None (lss_path with INDEX_SUFFIX appended).
+
+    Raises:
+        KeyError: If there is no segment with this name
+        IndexError: If the index is out of range
+
+    Returns:
+        Segment: Validated segment model
+    """
+
+    offsets = index_lss(lss_path, index_path=index_path).find(segment)
+    return Segment.from_xml(_read_range(Path(lss_path), offsets.segment))
+
+
+def load_history(lss_path: Path, segment: Union[str, int], index_path: Optional[Path] = None) -> CompactHistory:  # fmt: skip
+    """
+    Reads the SegmentHistory of a single segment as a CompactHistory (i.e. arrays of run IDs and times), only parsing the bytes of that element
+    (see load_segment). Cheaper than load_segment if only the splits are needed, e.g. for per-segment statistics
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+        segment (Union[str, int]): Segment name or index (negative indices count from the end)
+        index_path (Optional[Path], optional): Path to the sidecar index. Defaults to None (lss_path with INDEX_SUFFIX appended).
+
+    Raises:
+        KeyError: If there is no segment with this name
+        IndexError: If the index is out of range
+
+    Returns:
+        CompactHistory: Splits of the segment (empty if it has no SegmentHistory)
+    """
+
+    offsets = index_lss(lss_path, index_path=index_path).find(segment)
+    if offsets.history is None:
+        return CompactHistory.from_times([])
+    return CompactHistory.from_element(
+        etree.fromstring(_read_range(Path(lss_path), offsets.history))
+    )
+
+
+def load_attempts(lss_path: Path, index_path: Optional[Path] = None) -> List[Attempt]:
+    """
+    Reads the AttemptHistory of a LiveSplit file (LSS), only parsing and validating the bytes of that element (see load_segment)
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+        index_path (Optional[Path], optional): Path to the sidecar index. Defaults to None (lss_path with INDEX_SUFFIX appended).
+
+    Returns:
+        List[Attempt]: Validated attempts, in AttemptHistory order (empty if there is no AttemptHistory)
+    """
+
+    offsets = index_lss(lss_path, index_path=index_path)
+    if offsets.attempt_history is None:
+        return []
+    history_element = etree.fromstring(_read_range(Path(lss_path), offsets.attempt_history))
+    return [Attempt.from_xml_tree(element) for element in history_element.iterchildren("Attempt")]
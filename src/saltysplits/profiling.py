@@ -0,0 +1,237 @@
+from __future__ import annotations
+import time
+import logging
+import tracemalloc
+from contextlib import contextmanager
+from contextvars import ContextVar, Token
+from typing import Any, Callable, Dict, Iterator, List, NamedTuple, Optional
+
+LOGGER = logging.getLogger(__name__)
+
+
+class PhaseRecord(NamedTuple):
+    """
+    Measurements of a single phase (e.g. "read_lss.parse"), see profile
+
+    Args:
+        name (str): Dotted phase name, prefixed by the phases it ran in
+        depth (int): Nesting depth (0 for top-level phases)
+        start (float): Start in seconds, relative to the start of the profile
+        duration (float): Wall time in seconds
+        count (Optional[int]): Number of processed items (e.g. bytes read, XML elements or DataFrame cells), None if not applicable
+        peak_bytes (Optional[int]): Peak of traced allocations during the phase (above what was allocated at its start), None if memory isn't traced
+    """
+
+    name: str
+    depth: int
+    start: float
+    duration: float
+    count: Optional[int]
+    peak_bytes: Optional[int]
+
+
+class Profile:
+    """
+    Collects PhaseRecord instances while active (see profile)
+
+    Args:
+        memory (bool, optional): Whether to trace peak allocations per phase (through tracemalloc). Defaults to False.
+    """
+
+    def __init__(self, memory: bool = False) -> None:
+        self.memory = memory
+        self.records: List[PhaseRecord] = []
+        self.origin = time.perf_counter()
+        self._stack: List[_Phase] = []
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """
+        Returns all phases as plain dictionaries (e.g. for JSON or structured logging), in the order they finished
+
+        Returns:
+            List[Dict[str, Any]]: One dictionary per phase (see PhaseRecord)
+        """
+
+        return [record._asdict() for record in self.records]
+
+    def log(self, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:
+        """
+        Emits every phase as a log record (the PhaseRecord is attached as record.saltysplits_phase)
+
+        Args:
+            logger (Optional[logging.Logger], optional): Logger to emit to. Defaults to None (saltysplits.profiling).
+            level (int, optional): Log level. Defaults to logging.INFO.
+        """
+
+        for record in self.records:
+            log_phase(record, logger=logger, level=level)
+
+
+class _Phase:
+    # measures a single phase, only created while a profile or hook is active
+    __slots__ = ("profile", "name", "depth", "start", "count", "baseline", "peak", "token")
+    active = True
+
+    def __init__(self, profile: Profile, name: str, token: Optional[Token] = None) -> None:
+        self.profile = profile
+        self.name = name
+        self.count: Optional[int] = None
+        # set if this phase activated a throwaway profile (see phase), which is deactivated on exit
+        self.token = token
+
+    def __enter__(self) -> _Phase:
+        stack = self.profile._stack
+        if stack:
+            self.name = f"{stack[-1].name}.{self.name}"
+        self.depth = len(stack)
+        if self.profile.memory:
+            current, peak = tracemalloc.get_traced_memory()
+            if stack:
+                # keeps the peak reached by the parent so far, resetting below would lose it
+                stack[-1].peak = max(stack[-1].peak, peak)
+            tracemalloc.reset_peak()
+            self.baseline, self.peak = current, current
+        stack.append(self)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        end = time.perf_counter()
+        stack = self.profile._stack
+        stack.pop()
+
+        peak_bytes = None
+        if self.profile.memory:
+            self.peak = max(self.peak, tracemalloc.get_traced_memory()[1])
+            peak_bytes = self.peak - self.baseline
+            if stack:
+                stack[-1].peak = max(stack[-1].peak, self.peak)
+
+        record = PhaseRecord(
+            name=self.name,
+            depth=self.depth,
+            start=self.start - self.profile.origin,
+            duration=end - self.start,
+            count=self.count,
+            peak_bytes=peak_bytes,
+        )
+        self.profile.records.append(record)
+        if self.token is not None:
+            _PROFILE.reset(self.token)
+        for hook in _HOOKS:
+            hook(record)
+
+
+class _NullPhase:
+    # stands in for _Phase while profiling is disabled (shared, so entering a phase allocates nothing)
+    __slots__ = ()
+    active = False
+
+    def __enter__(self) -> _NullPhase:
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    @property
+    def count(self) -> None:
+        return None
+
+    @count.setter
+    def count(self, value: Optional[int]) -> None:
+        pass
+
+
+_NULL_PHASE = _NullPhase()
+_PROFILE: ContextVar[Optional[Profile]] = ContextVar("saltysplits_profile", default=None)
+_HOOKS: List[Callable[[PhaseRecord], None]] = []
+
+
+def phase(name: str) -> Any:
+    """
+    Returns a context manager that measures a phase if profiling is enabled (see profile and add_hook) and does nothing otherwise.
+    Use phase.active to skip computing counts that are only needed for profiling
+
+    Args:
+        name (str): Phase name (prefixed by the name of the enclosing phase)
+
+    Returns:
+        Any: Context manager that yields the phase (set its count attribute to report processed items)
+    """
+
+    profile = _PROFILE.get()
+    if profile is None:
+        if not _HOOKS:
+            return _NULL_PHASE
+        # hooks without an explicit profile get a throwaway one per top-level phase
+        profile = Profile()
+        return _Phase(profile, name, token=_PROFILE.set(profile))
+    return _Phase(profile, name)
+
+
+@contextmanager
+def profile(memory: bool = False) -> Iterator[Profile]:
+    """
+    Records all phases (read_lss, from_xml, to_df, etc) that run within the context, in the current thread or task
+
+    Args:
+        memory (bool, optional): Whether to trace peak allocations per phase (starts tracemalloc if needed, which slows down allocations). Defaults to False.
+
+    Yields:
+        Profile: Collects a PhaseRecord per phase (see Profile.to_records and Profile.log)
+    """
+
+    started_tracing = memory and not tracemalloc.is_tracing()
+    if started_tracing:
+        tracemalloc.start()
+    instance = Profile(memory=memory)
+    token = _PROFILE.set(instance)
+    try:
+        yield instance
+    finally:
+        _PROFILE.reset(token)
+        if started_tracing:
+            tracemalloc.stop()
+
+
+def add_hook(hook: Callable[[PhaseRecord], None]) -> None:
+    """
+    Registers a callback that receives every finished phase (also outside of profile, e.g. to emit metrics for every parsed file)
+
+    Args:
+        hook (Callable[[PhaseRecord], None]): Callback, called with the PhaseRecord of every finished phase
+    """
+
+    _HOOKS.append(hook)
+
+
+def remove_hook(hook: Callable[[PhaseRecord], None]) -> None:
+    """
+    Unregisters a callback that was registered with add_hook
+
+    Args:
+        hook (Callable[[PhaseRecord], None]): Previously registered callback
+    """
+
+    _HOOKS.remove(hook)
+
+
+def log_phase(record: PhaseRecord, logger: Optional[logging.Logger] = None, level: int = logging.INFO) -> None:  # fmt: skip
+    """
+    Emits a phase as a log record (can be registered as is through add_hook), the PhaseRecord is attached as record.saltysplits_phase
+
+    Args:
+        record (PhaseRecord): Finished phase
+        logger (Optional[logging.Logger], optional): Logger to emit to. Defaults to None (saltysplits.profiling).
+        level (int, optional): Log level. Defaults to logging.INFO.
+    """
+
+    logger = logger or LOGGER
+    if not logger.isEnabledFor(level):
+        return
+    details = f"{record.duration * 1e3:.3f} ms"
+    if record.count is not None:
+        details += f", count={record.count}"
+    if record.peak_bytes is not None:
+        details += f", peak={record.peak_bytes / 2**20:.2f} MiB"
+    logger.log(level, "%s: %s", record.name, details, extra={"saltysplits_phase": record._asdict()})  # fmt: skip
@@ -0,0 +1,307 @@
+from __future__ import annotations
+import bisect
+import numpy as np
+import pandas as pd
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, List, Optional, Sequence, Tuple, Union
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.kernels import NANOSECONDS_MAX, run_totals, valid_mask
+from saltysplits.summary import _to_timedelta
+
+DEFAULT_WINDOW = 20
+DEFAULT_QUANTILES = (0.5,)
+# upper bound for the number of cells of the (series, windows, window) views in from_matrix
+CHUNK_CELLS = 2**22
+
+
+class RollingWindow:
+    """
+    The last size values of a single series (e.g. the splits of one segment), with its values kept sorted as well
+    so mean, minimum and quantiles are available after every push (O(size) worst case, O(log size) lookups)
+
+    Args:
+        size (int): Number of values in the window
+        values (Sequence[int], optional): Initial values, oldest first. Defaults to ().
+        best (int, optional): Best value seen before the initial values. Defaults to NANOSECONDS_MAX (none).
+    """
+
+    __slots__ = ("size", "values", "ordered", "total", "best")
+
+    def __init__(self, size: int, values: Sequence[int] = (), best: int = NANOSECONDS_MAX) -> None:
+        self.size = size
+        self.values: Deque[int] = deque()
+        self.ordered: List[int] = []
+        self.total = 0
+        self.best = best
+        for value in values:
+            self.push(value)
+
+    def push(self, value: int) -> None:
+        """
+        Adds a value, dropping the oldest one if the window is full
+
+        Args:
+            value (int): New value in nanoseconds
+        """
+
+        self.values.append(value)
+        bisect.insort(self.ordered, value)
+        self.total += value
+        self.best = min(self.best, value)
+        if len(self.values) > self.size:
+            oldest = self.values.popleft()
+            del self.ordered[bisect.bisect_left(self.ordered, oldest)]
+            self.total -= oldest
+
+    def mean(self) -> float:
+        return self.total / len(self.values)
+
+    def quantile(self, q: float) -> float:
+        # linear interpolation between the closest ranks (same as _quantiles)
+        position = q * (len(self.ordered) - 1)
+        lower = int(position)
+        upper = min(lower + 1, len(self.ordered) - 1)
+        return self.ordered[lower] + (position - lower) * (
+            self.ordered[upper] - self.ordered[lower]
+        )
+
+    def copy(self) -> RollingWindow:
+        return RollingWindow(self.size, self.values, self.best)
+
+
+def _series(matrix: np.ndarray) -> np.ndarray:
+    # every segment plus the total time per run (NANOSECONDS_NAT unless complete) as the last row
+    totals, _ = run_totals(matrix)
+    return np.vstack([matrix, totals[np.newaxis, :]])
+
+
+def _quantiles(ordered: np.ndarray, counts: np.ndarray, quantiles: Sequence[float]) -> np.ndarray:
+    # linear interpolation between the closest ranks of the first counts values of every sorted window
+    result = np.empty((len(quantiles),) + ordered.shape[:-1], dtype=np.float64)
+    for i, q in enumerate(quantiles):
+        position = q * (counts - 1)
+        lower = position.astype(np.int64)
+        upper = np.minimum(lower + 1, counts - 1)
+        lower_values = np.take_along_axis(ordered, lower[..., np.newaxis], axis=-1)[..., 0]
+        upper_values = np.take_along_axis(ordered, upper[..., np.newaxis], axis=-1)[..., 0]
+        result[i] = lower_values + (position - lower) * (upper_values - lower_values)
+    return result
+
+
+@dataclass(eq=False)
+class RollingStats:
+    """
+    Rolling statistics over the last window splits of every segment and the last window complete runs (run totals), in run order.
+    Built for all runs at once (see from_matrix) and updated in O(new runs) when runs are appended (see append).
+    All arrays have shape (n_segments + 1, n_runs), the last row holds the run totals, runs without a value are NaN/NANOSECONDS_NAT
+
+    Args:
+        window (int): Number of values per window (shorter at the start of a series)
+        quantiles (Tuple[float, ...]): Quantiles that are tracked (always includes 0.5 for the median)
+        segment_names (List[str]): Segment names, in order
+        run_ids (List[Optional[str]]): Run IDs, ordered as the columns of SaltySplits.to_df
+        mean (np.ndarray): float64 mean of the window in nanoseconds
+        minimum (np.ndarray): int64 minimum of the window (i.e. rolling best)
+        best (np.ndarray): int64 minimum of everything up to and including the run (i.e. PB/gold progression)
+        quantile_values (np.ndarray): float64 array of shape (n_quantiles, n_segments + 1, n_runs)
+    """
+
+    window: int
+    quantiles: Tuple[float, ...]
+    segment_names: List[str]
+    run_ids: List[Optional[str]]
+    mean: np.ndarray
+    minimum: np.ndarray
+    best: np.ndarray
+    quantile_values: np.ndarray
+    _windows: List[RollingWindow] = field(default_factory=list, repr=False)
+
+    @staticmethod
+    def _check(window: int, quantiles: Sequence[float]) -> Tuple[float, ...]:
+        if window < 1:
+            raise ValueError(f"window has to be at least 1, got {window}")
+        if not all(0 <= q <= 1 for q in quantiles):
+            raise ValueError(f"quantiles have to be between 0 and 1, got {quantiles}")
+        return tuple(sorted(set(quantiles) | {0.5}))
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: np.ndarray,
+        segment_names: Sequence[str],
+        run_ids: Sequence[Optional[str]],
+        window: int = DEFAULT_WINDOW,
+        quantiles: Sequence[float] = DEFAULT_QUANTILES,
+    ) -> RollingStats:
+        """
+        Computes all windows of all segments (and run totals) at once. The splits of every series are packed to the front of their row,
+        windows are strided views of those rows (in chunks of at most CHUNK_CELLS cells) that are sorted once for every quantile
+
+        Args:
+            matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+            segment_names (Sequence[str]): Segment names, in order
+            run_ids (Sequence[Optional[str]]): Run IDs, in column order
+            window (int, optional): Number of values per window. Defaults to DEFAULT_WINDOW.
+            quantiles (Sequence[float], optional): Quantiles to track (the median is always included). Defaults to DEFAULT_QUANTILES.
+
+        Raises:
+            ValueError: If window is smaller than 1 or a quantile isn't between 0 and 1
+
+        Returns:
+            RollingStats: Rolling statistics for every run
+        """
+
+        quantiles = cls._check(window, quantiles)
+        series = _series(matrix)
+        valid = valid_mask(series)
+        n_series, n_runs = series.shape
+
+        # valid values first (in run order), then padded to the front so every window has window cells
+        order = np.argsort(~valid, axis=1, kind="stable")
+        packed = np.where(np.take_along_axis(valid, order, axis=1), np.take_along_axis(series, order, axis=1), NANOSECONDS_MAX)  # fmt: skip
+        counts = valid.sum(axis=1)
+        n_values = int(counts.max(initial=0))
+        padded = np.full((n_series, n_values + window - 1), NANOSECONDS_MAX, dtype=np.int64)
+        padded[:, window - 1 :] = packed[:, :n_values]
+
+        # number of values in every window (fewer at the start of a series)
+        window_counts = np.broadcast_to(np.minimum(np.arange(1, n_values + 1), window), (n_series, n_values))  # fmt: skip
+        totals = np.concatenate([np.zeros((n_series, 1), dtype=np.int64), np.where(padded == NANOSECONDS_MAX, 0, padded).cumsum(axis=1)], axis=1)  # fmt: skip
+        window_totals = totals[:, window:] - totals[:, :n_values]
+        packed_mean = window_totals / window_counts
+        packed_best = np.minimum.accumulate(packed[:, :n_values], axis=1)
+
+        packed_minimum = np.empty((n_series, n_values), dtype=np.int64)
+        packed_quantiles = np.empty((len(quantiles), n_series, n_values), dtype=np.float64)
+        step = max(CHUNK_CELLS // max(n_series * window, 1), 1)
+        for start in range(0, n_values, step):
+            views = np.lib.stride_tricks.sliding_window_view(padded[:, start : start + step + window - 1], window, axis=1)  # fmt: skip
+            chunk = np.sort(views, axis=-1)
+            # padding sorts to the end, so the first window_counts cells are the values of the window
+            packed_minimum[:, start : start + step] = chunk[..., 0]
+            packed_quantiles[:, :, start : start + step] = _quantiles(chunk, window_counts[:, start : start + step], quantiles)  # fmt: skip
+
+        # packed position of every valid cell is its rank among the valid cells of its row
+        rows, columns = np.nonzero(valid)
+        ranks = (np.cumsum(valid, axis=1) - 1)[rows, columns]
+
+        def scatter(values: np.ndarray, fill: Union[float, int]) -> np.ndarray:
+            result = np.full(values.shape[:-2] + (n_series, n_runs), fill, dtype=values.dtype)
+            result[..., rows, columns] = values[..., rows, ranks]
+            return result
+
+        # state of every series after its last value, for append
+        windows = [RollingWindow(window, series[i][valid[i]][-window:].tolist()) for i in range(n_series)]  # fmt: skip
+        for series_window, series_best, count in zip(windows, packed_best[:, -1:], counts):
+            series_window.best = int(series_best[0]) if count else NANOSECONDS_MAX
+        return cls(
+            window=window,
+            quantiles=quantiles,
+            segment_names=list(segment_names),
+            run_ids=list(run_ids),
+            mean=scatter(packed_mean, np.nan),
+            minimum=scatter(packed_minimum, NANOSECONDS_NAT),
+            best=scatter(packed_best, NANOSECONDS_NAT),
+            quantile_values=scatter(packed_quantiles, np.nan),
+            _windows=windows,
+        )
+
+    def append(self, matrix: np.ndarray, run_ids: Sequence[Optional[str]]) -> RollingStats:
+        """
+        Continues all windows with runs that were appended (e.g. by SaltySplits.refresh), only going over the new runs
+
+        Args:
+            matrix (np.ndarray): int64 matrix of shape (n_segments, n_new_runs) with the splits of the new runs only
+            run_ids (Sequence[Optional[str]]): Run IDs of the new runs
+
+        Returns:
+            RollingStats: Rolling statistics for the old and new runs (this instance is left as is)
+        """
+
+        series = _series(matrix)
+        n_series, n_runs = series.shape
+        windows = [window.copy() for window in self._windows]
+        mean = np.full((n_series, n_runs), np.nan)
+        minimum = np.full((n_series, n_runs), NANOSECONDS_NAT, dtype=np.int64)
+        best = np.full((n_series, n_runs), NANOSECONDS_NAT, dtype=np.int64)
+        quantile_values = np.full((len(self.quantiles), n_series, n_runs), np.nan)
+
+        for i, j in zip(*np.nonzero(valid_mask(series))):
+            window = windows[i]
+            window.push(int(series[i, j]))
+            mean[i, j] = window.mean()
+            minimum[i, j] = window.ordered[0]
+            best[i, j] = window.best
+            for k, q in enumerate(self.quantiles):
+                quantile_values[k, i, j] = window.quantile(q)
+
+        return RollingStats(
+            window=self.window,
+            quantiles=self.quantiles,
+            segment_names=self.segment_names,
+            run_ids=self.run_ids + list(run_ids),
+            mean=np.hstack([self.mean, mean]),
+            minimum=np.hstack([self.minimum, minimum]),
+            best=np.hstack([self.best, best]),
+            quantile_values=np.concatenate([self.quantile_values, quantile_values], axis=2),
+            _windows=windows,
+        )
+
+    def values(self, statistic: Union[str, float] = "median") -> np.ndarray:
+        """
+        Returns a single statistic for all series
+
+        Args:
+            statistic (Union[str, float], optional): "mean", "median", "minimum", "best" or one of the tracked quantiles. Defaults to "median".
+
+        Raises:
+            KeyError: If the statistic (or quantile) isn't tracked
+
+        Returns:
+            np.ndarray: float64 (mean, quantiles) or int64 (minimum, best) nanoseconds of shape (n_segments + 1, n_runs)
+        """
+
+        if statistic == "median":
+            statistic = 0.5
+        if isinstance(statistic, str):
+            if statistic not in ("mean", "minimum", "best"):
+                raise KeyError(f"Unknown statistic '{statistic}'")
+            return getattr(self, statistic)
+        if statistic not in self.quantiles:
+            raise KeyError(f"Quantile {statistic} isn't tracked (tracked: {self.quantiles})")
+        return self.quantile_values[self.quantiles.index(statistic)]
+
+    def to_df(self, statistic: Union[str, float] = "median") -> pd.DataFrame:
+        """
+        Represents a statistic of all segments as a pandas.DataFrame, laid out like SaltySplits.to_df (see values)
+
+        Args:
+            statistic (Union[str, float], optional): "mean", "median", "minimum", "best" or one of the tracked quantiles. Defaults to "median".
+
+        Returns:
+            pd.DataFrame: timedelta64[ns] frame of shape (n_segments, n_runs), NaT for runs without a split
+        """
+
+        values = self.values(statistic)[:-1]
+        values = (
+            values.view("timedelta64[ns]") if values.dtype == np.int64 else _to_timedelta(values)
+        )
+        return pd.DataFrame(values, index=self.segment_names, columns=self.run_ids)
+
+    def totals(self, statistic: Union[str, float] = "median") -> pd.Series:
+        """
+        Returns a statistic of the run totals (complete runs only, see values)
+
+        Args:
+            statistic (Union[str, float], optional): "mean", "median", "minimum", "best" or one of the tracked quantiles. Defaults to "median".
+
+        Returns:
+            pd.Series: timedelta64[ns] per run, NaT for runs that aren't complete
+        """
+
+        values = self.values(statistic)[-1]
+        values = (
+            values.view("timedelta64[ns]") if values.dtype == np.int64 else _to_timedelta(values)
+        )
+        return pd.Series(values, index=self.run_ids)
@@ -0,0 +1,171 @@
+from __future__ import annotations
+import sys
+import numpy as np
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Sequence
+from saltysplits.history import CompactHistory
+from saltysplits.columnar import nanosecond_array, sort_run_ids
+
+if TYPE_CHECKING:
+    from saltysplits.models import Attempt, Splits, Time
+
+
+class Run(NamedTuple):
+    """
+    A single run (i.e. attempt) and its splits, see SaltySplits.get_run
+
+    Args:
+        id (str): Run ID
+        attempt (Optional[Attempt]): Matching Attempt from AttemptHistory or None if it isn't there (e.g. deleted attempts)
+        splits (List[Optional[Time]]): Time per segment, None for segments without a split
+        real_time (np.ndarray): int64 array with the RealTime split per segment (NANOSECONDS_NAT if missing)
+        game_time (np.ndarray): int64 array with the GameTime split per segment (NANOSECONDS_NAT if missing)
+    """
+
+    id: str
+    attempt: Optional[Attempt]
+    splits: List[Optional[Time]]
+    real_time: np.ndarray
+    game_time: np.ndarray
+
+
+def _intern(run_id: Optional[str]) -> Optional[str]:
+    # the same ID occurs once per segment, interning keeps a single copy of every key
+    return sys.intern(run_id) if isinstance(run_id, str) else run_id
+
+
+def _history_positions(history: Optional[Sequence[Time]]) -> Dict[str, int]:
+    if not history:
+        return {}
+    ids = history.id_list() if isinstance(history, CompactHistory) else [split.id for split in history]  # fmt: skip
+    return {_intern(run_id): position for position, run_id in enumerate(ids)}
+
+
+def _at(items: Optional[Sequence], position: Optional[int], run_id: str) -> Optional[object]:
+    # Attempt or Time at a cached position, which has to still hold the same run ID (positions shift if the models are edited)
+    if position is None:
+        return None
+    if items is None or position >= len(items) or items[position].id != run_id:
+        raise ValueError(f"Run index is out of date, run ID '{run_id}' moved or was removed")
+    return items[position]
+
+
+def _merge(positions: Dict[str, int], other: Dict[str, int], offset: int) -> Dict[str, int]:
+    # positions of other are relative to where it was appended
+    merged = dict(positions)
+    merged.update({run_id: offset + position for run_id, position in other.items()})
+    return merged
+
+
+@dataclass(eq=False)
+class RunIndex:
+    """
+    Lookup tables from run ID to its position in the columns (see SaltySplits.to_columns), the AttemptHistory and every SegmentHistory.
+    Cached per SaltySplits instance (see SaltySplits.run_index), so single runs can be looked up without scanning all others.
+    Lookups check the run ID at every cached position, so edits of the models that moved or removed a run are noticed (see run)
+
+    Args:
+        run_ids (List[Optional[str]]): Unique run IDs, ordered as the columns of SaltySplits.to_df
+        run_positions (Dict[str, int]): Column position per run ID
+        attempt_positions (Dict[str, int]): Position in AttemptHistory per run ID (only for runs with an Attempt)
+        segment_positions (List[Dict[str, int]]): Position in SegmentHistory per run ID, one mapping per segment
+    """
+
+    run_ids: List[Optional[str]]
+    run_positions: Dict[str, int]
+    attempt_positions: Dict[str, int]
+    segment_positions: List[Dict[str, int]]
+
+    @classmethod
+    def from_splits(cls, splits: Splits) -> RunIndex:
+        """
+        Indexes all attempts and splits of a root model
+
+        Args:
+            splits (Splits): Root model (e.g. a SaltySplits instance)
+
+        Returns:
+            RunIndex: Lookup tables for all run IDs
+        """
+
+        attempt_ids = [attempt.id for attempt in splits.attempt_history or []]
+        attempt_positions = {_intern(run_id): position for position, run_id in enumerate(attempt_ids)}  # fmt: skip
+        segment_positions = [_history_positions(segment.segment_history) for segment in splits.segments]  # fmt: skip
+
+        run_ids = set(attempt_positions)
+        for positions in segment_positions:
+            run_ids.update(positions)
+        run_ids = sort_run_ids(run_ids)
+        return cls(
+            run_ids=run_ids,
+            run_positions={run_id: position for position, run_id in enumerate(run_ids)},
+            attempt_positions=attempt_positions,
+            segment_positions=segment_positions,
+        )
+
+    def append(self, other: RunIndex, attempt_offset: int, history_offsets: List[int]) -> Optional[RunIndex]:  # fmt: skip
+        """
+        Appends the index of runs that were appended to the models (e.g. by SaltySplits.refresh), see SplitsColumns.append
+
+        Args:
+            other (RunIndex): Index of the appended runs only
+            attempt_offset (int): Length of AttemptHistory before the runs were appended
+            history_offsets (List[int]): Length of every SegmentHistory before the runs were appended
+
+        Returns:
+            Optional[RunIndex]: Combined index or None if runs can't simply be appended (same conditions as SplitsColumns.append)
+        """
+
+        run_ids = self.run_ids + other.run_ids
+        if len(self.segment_positions) != len(other.segment_positions) or sort_run_ids(run_ids) != run_ids:  # fmt: skip
+            return None
+
+        return RunIndex(
+            run_ids=run_ids,
+            run_positions=_merge(self.run_positions, other.run_positions, len(self.run_ids)),
+            attempt_positions=_merge(
+                self.attempt_positions, other.attempt_positions, attempt_offset
+            ),
+            segment_positions=[
+                _merge(positions, other_positions, offset)
+                for positions, other_positions, offset in zip(
+                    self.segment_positions, other.segment_positions, history_offsets
+                )
+            ],
+        )
+
+    def run(self, splits: Splits, run_id: str) -> Run:
+        """
+        Looks up a single run in the models this index was built from (only touches one split per segment)
+
+        Args:
+            splits (Splits): Root model this index was built from
+            run_id (str): Run ID (e.g. Attempt.id)
+
+        Raises:
+            KeyError: If there is no attempt or split with this run ID
+            ValueError: If the models changed since this index was built (e.g. an Attempt or Time was removed), rebuild it with from_splits
+
+        Returns:
+            Run: The attempt and its splits
+        """
+
+        if run_id not in self.run_positions:
+            raise KeyError(f"Unknown run ID '{run_id}'")
+        if len(splits.segments) != len(self.segment_positions):
+            raise ValueError("Run index is out of date, segments were added or removed")
+
+        attempt = _at(splits.attempt_history, self.attempt_positions.get(run_id), run_id)
+        run_splits = []
+        for segment, positions in zip(splits.segments, self.segment_positions):
+            run_splits.append(_at(segment.segment_history, positions.get(run_id), run_id))
+
+        real_time = [None if split is None else split.real_time for split in run_splits]
+        game_time = [None if split is None else split.game_time for split in run_splits]
+        return Run(
+            id=run_id,
+            attempt=attempt,
+            splits=run_splits,
+            real_time=nanosecond_array(real_time),
+            game_time=nanosecond_array(game_time),
+        )
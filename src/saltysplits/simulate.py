@@ -0,0 +1,202 @@
+from __future__ import annotations
+import numpy as np
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional, Sequence, Tuple
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.kernels import valid_mask
+
+DEFAULT_RUNS = 100_000
+# runs per batch, fixed so results only depend on the seed (not on the number of workers)
+BATCH_RUNS = 2**16
+
+# simulator of a worker process, sent once by _init_worker instead of with every batch
+_WORKER_SIMULATOR: Optional[PBSimulator] = None
+
+
+def _init_worker(simulator: PBSimulator) -> None:
+    global _WORKER_SIMULATOR
+    _WORKER_SIMULATOR = simulator
+
+
+def _remaining_batch(completed: int, n_runs: int, seed: np.random.SeedSequence) -> np.ndarray:
+    return _WORKER_SIMULATOR._remaining(completed, n_runs, seed)
+
+
+@dataclass(eq=False)
+class Simulation:
+    """
+    Finish times of simulated runs (see PBSimulator.run), conditional on the segments that were already completed
+
+    Args:
+        finish_times (np.ndarray): int64 finish time of every simulated run in nanoseconds (elapsed time included)
+        pb_time (int): Personal best in nanoseconds (NANOSECONDS_NAT if there is none)
+        completed (int): Number of segments that were already completed
+        elapsed (int): Time spent on the completed segments in nanoseconds
+    """
+
+    finish_times: np.ndarray
+    pb_time: int
+    completed: int
+    elapsed: int
+
+    @property
+    def pb_probability(self) -> float:
+        """
+        Share of simulated runs that finish faster than the personal best (1.0 if there is no personal best yet)
+        """
+
+        if self.pb_time == NANOSECONDS_NAT:
+            return 1.0
+        return float(np.count_nonzero(self.finish_times < self.pb_time) / len(self.finish_times))
+
+    def quantiles(self, q: Sequence[float] = (0.1, 0.5, 0.9)) -> np.ndarray:
+        """
+        Returns quantiles of the finish time distribution
+
+        Args:
+            q (Sequence[float], optional): Quantiles between 0 and 1. Defaults to (0.1, 0.5, 0.9).
+
+        Returns:
+            np.ndarray: timedelta64[ns] finish time per quantile
+        """
+
+        return np.round(np.quantile(self.finish_times, q)).astype(np.int64).view("timedelta64[ns]")
+
+    def histogram(self, bins: int = 50) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Bins the finish time distribution (e.g. for charting)
+
+        Args:
+            bins (int, optional): Number of bins. Defaults to 50.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: Number of runs per bin and the bin edges (timedelta64[ns], bins + 1 values)
+        """
+
+        counts, edges = np.histogram(self.finish_times, bins=bins)
+        return counts, np.round(edges).astype(np.int64).view("timedelta64[ns]")
+
+
+@dataclass(eq=False)
+class PBSimulator:
+    """
+    Monte Carlo simulation of finish times, drawing every remaining segment from the empirical distribution of its splits
+    (segments are assumed to be independent). Splits can be weighted toward recent attempts (see from_matrix)
+
+    Args:
+        segment_names (List[str]): Segment names, in order
+        values (List[np.ndarray]): int64 splits per segment, in run order
+        cdfs (List[Optional[np.ndarray]]): Cumulative sampling weights per segment (None if uniform)
+        pb_time (int): Personal best in nanoseconds (NANOSECONDS_NAT if there is none)
+    """
+
+    segment_names: List[str]
+    values: List[np.ndarray]
+    cdfs: List[Optional[np.ndarray]]
+    pb_time: int
+
+    @classmethod
+    def from_matrix(
+        cls,
+        matrix: np.ndarray,
+        segment_names: Sequence[str],
+        pb_time: int = NANOSECONDS_NAT,
+        half_life: Optional[float] = None,
+    ) -> PBSimulator:
+        """
+        Collects the splits of every segment from a split matrix (e.g. SplitsColumns.matrix)
+
+        Args:
+            matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+            segment_names (Sequence[str]): Segment names, in order
+            pb_time (int, optional): Personal best in nanoseconds. Defaults to NANOSECONDS_NAT (none).
+            half_life (Optional[float], optional): Number of runs after which a split counts half as much. Defaults to None (all splits count the same).
+
+        Raises:
+            ValueError: If half_life isn't positive
+
+        Returns:
+            PBSimulator: Simulator for these splits
+        """
+
+        if half_life is not None and half_life <= 0:
+            raise ValueError(f"half_life has to be positive, got {half_life}")
+
+        valid = valid_mask(matrix)
+        n_runs = matrix.shape[1]
+        values, cdfs = [], []
+        for row, row_valid in zip(matrix, valid):
+            values.append(row[row_valid])
+            if half_life is None or not row_valid.any():
+                cdfs.append(None)
+                continue
+            # age in runs (0 for the last run), so weights don't depend on how often a segment was reached
+            ages = n_runs - 1 - np.flatnonzero(row_valid)
+            weights = np.exp2(-ages / half_life)
+            cdfs.append(np.cumsum(weights) / weights.sum())
+        return cls(segment_names=list(segment_names), values=values, cdfs=cdfs, pb_time=pb_time)
+
+    def _remaining(self, completed: int, n_runs: int, seed: np.random.SeedSequence) -> np.ndarray:
+        # sums one draw per remaining segment for every run of a single batch
+        rng = np.random.default_rng(seed)
+        remaining = np.zeros(n_runs, dtype=np.int64)
+        for values, cdf in zip(self.values[completed:], self.cdfs[completed:]):
+            if cdf is None:
+                indices = rng.integers(len(values), size=n_runs)
+            else:
+                indices = np.minimum(np.searchsorted(cdf, rng.random(n_runs), side="right"), len(values) - 1)  # fmt: skip
+            remaining += values[indices]
+        return remaining
+
+    def run(
+        self,
+        completed: int = 0,
+        elapsed: int = 0,
+        n_runs: int = DEFAULT_RUNS,
+        seed: Optional[int] = 0,
+        workers: Optional[int] = None,
+    ) -> Simulation:
+        """
+        Simulates n_runs runs from the current split on, in batches of BATCH_RUNS (one seed per batch, so the results are the
+        same with or without workers)
+
+        Args:
+            completed (int, optional): Number of segments that were already completed. Defaults to 0 (simulates whole runs).
+            elapsed (int, optional): Time spent on the completed segments in nanoseconds. Defaults to 0.
+            n_runs (int, optional): Number of runs to simulate. Defaults to DEFAULT_RUNS.
+            seed (Optional[int], optional): Seed for reproducible results. Defaults to 0 (None for a different outcome every time).
+            workers (Optional[int], optional): Number of processes to spread batches over. Defaults to None (simulates in this process).
+
+        Raises:
+            ValueError: If n_runs isn't positive, completed is out of range or a remaining segment has no splits
+
+        Returns:
+            Simulation: Finish time of every simulated run
+        """
+
+        if n_runs < 1:
+            raise ValueError(f"n_runs has to be positive, got {n_runs}")
+        if not 0 <= completed <= len(self.values):
+            raise ValueError(f"completed has to be between 0 and {len(self.values)}, got {completed}")  # fmt: skip
+        missing = [name for name, values in zip(self.segment_names[completed:], self.values[completed:]) if not len(values)]  # fmt: skip
+        if missing:
+            raise ValueError(f"Can't simulate segments without splits: {missing}")
+
+        sizes = [min(BATCH_RUNS, n_runs - start) for start in range(0, n_runs, BATCH_RUNS)]
+        seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+        if workers is not None and workers > 1 and len(sizes) > 1:
+            # spawned workers (forking a process that runs threads isn't safe), the splits are pickled once per worker
+            context = multiprocessing.get_context("spawn")
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context, initializer=_init_worker, initargs=(self,)) as pool:  # fmt: skip
+                batches = list(pool.map(_remaining_batch, [completed] * len(sizes), sizes, seeds))
+        else:
+            batches = [self._remaining(completed, size, batch_seed) for size, batch_seed in zip(sizes, seeds)]  # fmt: skip
+
+        return Simulation(
+            finish_times=elapsed + np.concatenate(batches),
+            pb_time=self.pb_time,
+            completed=completed,
+            elapsed=elapsed,
+        )
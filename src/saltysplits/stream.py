@@ -0,0 +1,211 @@
+from __future__ import annotations
+import io
+import numpy as np
+import pandas as pd
+from lxml import etree
+from pathlib import Path
+from typing import BinaryIO, Iterator, List, NamedTuple, Optional, Tuple, Union
+from saltysplits.enums import TimeType
+from saltysplits.codec import decode_datetimes, decode_nanoseconds, decode_times
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.columnar import SplitsColumns, scatter_times, sort_run_ids
+from saltysplits.cache import DEFAULT_CACHE_SIZE, ColumnsCache
+from saltysplits.iterparse import release_element
+
+# end events we act on, all other elements are only cleared as part of their parent
+HEADER_TAGS = ("GameName", "CategoryName", "AttemptCount")
+STREAM_TAGS = HEADER_TAGS + ("Attempt", "Time", "Segment")
+
+
+class AttemptRecord(NamedTuple):
+    id: str
+    started: Optional[str]
+    is_started_synced: Optional[str]
+    ended: Optional[str]
+    is_ended_synced: Optional[str]
+    real_time: int
+    game_time: int
+
+
+class SegmentRecord(NamedTuple):
+    index: int
+    name: str
+    ids: List[str]
+    real_time: np.ndarray
+    game_time: np.ndarray
+
+
+def _decode_nanoseconds(value: Optional[str]) -> int:
+    return NANOSECONDS_NAT if value is None else decode_nanoseconds(value)
+
+
+def iter_lss(
+    lss_path: Union[Path, BinaryIO],
+) -> Iterator[Tuple[str, Union[str, AttemptRecord, SegmentRecord]]]:
+    """
+    Walks a LiveSplit file (LSS) with lxml.etree.iterparse and yields its speedrunning data as lightweight records,
+    clearing elements as it goes (i.e. without building the pydantic-xml object graph or keeping the full tree in memory)
+
+    Args:
+        lss_path (Union[Path, BinaryIO]): Path to the LiveSplit file (.LSS) or a binary file-like object
+
+    Yields:
+        Tuple[str, Union[str, AttemptRecord, SegmentRecord]]: Tag and payload, i.e. ("GameName", str), ("CategoryName", str),
+        ("AttemptCount", str), ("Attempt", AttemptRecord) or ("Segment", SegmentRecord), in document order
+    """
+
+    segment_index = 0
+    ids, real_times, game_times = [], [], []
+
+    source = lss_path if hasattr(lss_path, "read") else str(lss_path)
+    for _, element in etree.iterparse(source, events=("end",), tag=STREAM_TAGS):
+        parent = element.getparent()
+        parent_tag = parent.tag if parent is not None else None
+
+        if element.tag == "Time" and parent_tag == "SegmentHistory":
+            ids.append(element.get("id"))
+            real_times.append(element.findtext("RealTime"))
+            game_times.append(element.findtext("GameTime"))
+            release_element(element)
+        elif element.tag == "Attempt" and parent_tag == "AttemptHistory":
+            yield (
+                "Attempt",
+                AttemptRecord(
+                    id=element.get("id"),
+                    started=element.get("started"),
+                    is_started_synced=element.get("isStartedSynced"),
+                    ended=element.get("ended"),
+                    is_ended_synced=element.get("isEndedSynced"),
+                    real_time=_decode_nanoseconds(element.findtext("RealTime")),
+                    game_time=_decode_nanoseconds(element.findtext("GameTime")),
+                ),
+            )
+            release_element(element)
+        elif element.tag == "Segment" and parent_tag == "Segments":
+            yield (
+                "Segment",
+                SegmentRecord(
+                    index=segment_index,
+                    name=element.findtext("Name"),
+                    ids=ids,
+                    real_time=decode_times(real_times).view(np.int64),
+                    game_time=decode_times(game_times).view(np.int64),
+                ),
+            )
+            segment_index += 1
+            ids, real_times, game_times = [], [], []
+            release_element(element)
+        elif element.tag in HEADER_TAGS and parent is not None and parent.getparent() is None:
+            # GameName, CategoryName and AttemptCount are only of interest as direct children of Run
+            yield element.tag, element.text
+
+
+def _flags(values: List[Optional[str]]) -> np.ndarray:
+    return np.array([-1 if value is None else int(value == "True") for value in values], dtype=np.int8)  # fmt: skip
+
+
+def read_lss_columns(
+    lss_path: Union[Path, BinaryIO],
+    cache_dir: Optional[Path] = None,
+    cache_size: int = DEFAULT_CACHE_SIZE,
+) -> SplitsColumns:
+    """
+    Reads a LiveSplit file (LSS) as a SplitsColumns instance by streaming it through iter_lss (skips pydantic validation)
+
+    Args:
+        lss_path (Union[Path, BinaryIO]): Path to the LiveSplit file (.LSS) or a binary file-like object
+        cache_dir (Optional[Path], optional): Directory for a persistent ColumnsCache, keyed by the file contents. Defaults to None (no caching).
+        cache_size (int, optional): Upper bound for the total size of the cache in bytes. Defaults to DEFAULT_CACHE_SIZE (512 MiB).
+
+    Returns:
+        SplitsColumns: Columnar representation of splits and attempts (see saltysplits.columnar)
+    """
+
+    if cache_dir is not None:
+        if hasattr(lss_path, "read"):
+            lss_bytes = lss_path.read()
+        else:
+            with open(lss_path, "rb") as file:
+                lss_bytes = file.read()
+
+        cache = ColumnsCache(cache_dir, max_bytes=cache_size)
+        key = cache.key(lss_bytes)
+        columns = cache.load(key)
+        if columns is None:
+            columns = read_lss_columns(io.BytesIO(lss_bytes))
+            cache.store(key, columns)
+        return columns
+
+    header = {}
+    attempts: List[AttemptRecord] = []
+    segments: List[SegmentRecord] = []
+    for tag, payload in iter_lss(lss_path):
+        if tag == "Attempt":
+            attempts.append(payload)
+        elif tag == "Segment":
+            segments.append(payload)
+        else:
+            header[tag] = payload
+
+    run_ids = sort_run_ids([attempt.id for attempt in attempts] + [run_id for segment in segments for run_id in segment.ids])  # fmt: skip
+    run_positions = {run_id: i for i, run_id in enumerate(run_ids)}
+    shape = (len(segments), len(run_ids))
+
+    segment_indices = np.repeat(np.arange(len(segments)), [len(segment.ids) for segment in segments])  # fmt: skip
+    run_indices = [run_positions[run_id] for segment in segments for run_id in segment.ids]
+    real_times = np.concatenate([segment.real_time for segment in segments] or [np.empty(0, dtype=np.int64)])  # fmt: skip
+    game_times = np.concatenate([segment.game_time for segment in segments] or [np.empty(0, dtype=np.int64)])  # fmt: skip
+
+    return SplitsColumns(
+        game_name=header.get("GameName") or "",
+        category_name=header.get("CategoryName") or "",
+        attempt_count=int(header.get("AttemptCount") or 0),
+        segment_names=[segment.name for segment in segments],
+        run_ids=run_ids,
+        real_time=scatter_times(shape, segment_indices, run_indices, real_times),
+        game_time=scatter_times(shape, segment_indices, run_indices, game_times),
+        attempt_ids=[attempt.id for attempt in attempts],
+        attempt_started=decode_datetimes([attempt.started for attempt in attempts]),
+        attempt_ended=decode_datetimes([attempt.ended for attempt in attempts]),
+        attempt_started_synced=_flags([attempt.is_started_synced for attempt in attempts]),
+        attempt_ended_synced=_flags([attempt.is_ended_synced for attempt in attempts]),
+        attempt_real_time=np.array([attempt.real_time for attempt in attempts], dtype=np.int64),
+        attempt_game_time=np.array([attempt.game_time for attempt in attempts], dtype=np.int64),
+    )
+
+
+def read_lss_frame(
+    lss_path: Union[Path, BinaryIO],
+    time_type: TimeType = TimeType.REAL_TIME,
+    allow_partial: bool = False,
+    allow_empty: bool = False,
+    cumulative: bool = False,
+    lss_repr: bool = False,
+    lss_ns: bool = True,
+    cache_dir: Optional[Path] = None,
+) -> pd.DataFrame:
+    """
+    Reads a LiveSplit file (LSS) directly as the pandas.DataFrame returned by SaltySplits.to_df (skips pydantic validation)
+
+    Args:
+        lss_path (Union[Path, BinaryIO]): Path to the LiveSplit file (.LSS) or a binary file-like object
+        time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+        allow_partial (bool, optional): Whether to allow runs that don't have values for all segments. Defaults to False.
+        allow_empty (bool, optional): Whether to allow runs that don't have values for any segments. Defaults to False.
+        cumulative (bool, optional): Whether succesive splits in a run have to add up to the total runtime. Defaults to False.
+        lss_repr (bool, optional): Whether to use LSS' string representation of time. Defaults to False.
+        lss_ns (bool, optional): Whether you want to include nanoseconds in LSS' string representation of time. Defaults to True.
+        cache_dir (Optional[Path], optional): Directory for a persistent ColumnsCache (see read_lss_columns). Defaults to None.
+
+    Returns:
+        pd.DataFrame: pandas.DataFrame of shape (n_segments, n_runs) containing run data
+    """
+
+    return read_lss_columns(lss_path, cache_dir=cache_dir).to_df(
+        time_type=time_type,
+        allow_partial=allow_partial,
+        allow_empty=allow_empty,
+        cumulative=cumulative,
+        lss_repr=lss_repr,
+        lss_ns=lss_ns,
+    )
@@ -1,4 +1,3 @@
-import numpy as np
 import re
 import pandas as pd
 from pathlib import Path
@@ -7,9 +6,14 @@ import saltysplits as ss
 import altair as alt
 from typing import List
 from saltysplits.annotations import encode_time
+from saltysplits.codec import encode_times
 from saltysplits import SaltySplits
 from saltysplits import DEMO_SPLITS
 from saltysplits import TimeType
+from saltysplits.dashboard import DashboardBundle, lss_digest
+from saltysplits.downsample import DEFAULT_MAX_POINTS, downsample_series
+from saltysplits.enums import DownsampleMethod
+from pandas import Timedelta
 
 
 st.set_page_config(
@@ -23,18 +27,10 @@ st.set_page_config(
     }
 )
 
-@st.cache_data
-def represent_resets(splits_df: pd.DataFrame) -> pd.DataFrame:
-    reset_indices = np.argmax(splits_df.isna(), axis=0)
-    reset_segments = np.array(splits_df.index)[reset_indices]
-    reset_segment_names, reset_segment_counts = np.unique(reset_segments, return_counts=True)
-    reset_df = pd.DataFrame({"Segment": reset_segment_names, "Count": reset_segment_counts})
-    return reset_df
-
 @st.cache_data
 def represent_time(td_series: pd.Series, include_ns: bool = False) -> pd.DataFrame:
     dt_series = pd.to_datetime(td_series, unit="ns")  
-    ht_series = td_series.apply(lambda x: encode_time(x, include_ns=include_ns) if pd.notna(x) else None) 
+    ht_series = pd.Series(encode_times(td_series.to_numpy(dtype="timedelta64[ns]"), include_ns=include_ns), index=td_series.index)
     time_dataframe = pd.concat([ht_series, dt_series], axis=1) 
     time_dataframe.columns = ["Time", "DateTime"]
     time_dataframe = time_dataframe.rename_axis("id").reset_index()
@@ -45,55 +41,39 @@ def demo_splits(lss_path: Path = DEMO_SPLITS) -> SaltySplits:
     splits = ss.read_lss(lss_path=lss_path)
     return splits
 
-@st.cache_data
-def splits_from_bytes(lss_bytes: bytes) -> SaltySplits:
-    return SaltySplits.from_xml(lss_bytes)
+@st.cache_resource(max_entries=8)
+def splits_bundle(digest: str, _lss_bytes: bytes) -> DashboardBundle:
+    # keyed by the digest only (streamlit skips arguments starting with an underscore), so the bytes are never hashed again
+    return DashboardBundle.from_bytes(_lss_bytes, digest=digest)
 
-@st.cache_data
-def splits_dataframe(splits_bytes: bytes, time_type: TimeType, allow_partial: bool, allow_empty: bool = False, cumulative: bool = False, lss_repr: bool = False, lss_ns: bool = True) -> pd.DataFrame:
-    # mainly exists because we can't cache SaltySplits instances (add kwargs though)
-    splits = splits_from_bytes(splits_bytes)
-    dataframe = splits.to_df(
-        time_type=time_type,
-        allow_partial=allow_partial,
-        allow_empty=allow_empty,
-        cumulative=cumulative,
-        lss_repr=lss_repr, 
-        lss_ns=lss_ns
-    )
-    return dataframe
-    
-@st.cache_data
-def read_bytes(path: Path) -> bytes:
-    with open(path, "rb") as file:
-        return file.read()
 
+@st.cache_resource
+def demo_bundle(lss_path: Path = DEMO_SPLITS) -> DashboardBundle:
+    with open(lss_path, "rb") as file:
+        return DashboardBundle.from_bytes(file.read())
+
+
+def upload_bundle(lss_file) -> DashboardBundle:
+    # hashes an upload once (reruns reuse the digest, file_id changes with every upload)
+    digest_key = f"digest_{lss_file.file_id}"
+    if digest_key not in st.session_state:
+        st.session_state[digest_key] = lss_digest(lss_file.getvalue())
+    return splits_bundle(st.session_state[digest_key], lss_file.getvalue())
 
-@st.cache_data
-def splits_metrics(splits_bytes: bytes, time_type: TimeType) -> None:
-    splits = splits_from_bytes(splits_bytes)
-    splits_df = splits_dataframe(splits_bytes, time_type=time_type, allow_partial=True)
-
-    complete_runs = splits_df.loc[:, ~splits_df.isna().any()]  
-    run_times = complete_runs.sum(axis=0)
-    best_run_index = run_times.argmin()
-    best_run = run_times.iloc[best_run_index]
-    best_run = encode_time(best_run, include_ns=False)
-
-    best_segments = splits_df.min(axis=1)
-    best_segments_sum = best_segments.sum()
-    best_segments_sum = encode_time(best_segments_sum, include_ns=False)
-    life_playtime = splits_df.sum(axis=0).sum()
-    life_playtime = encode_time(life_playtime, include_ns=False)
-    best_diffs = complete_runs.iloc[:, best_run_index] - best_segments
-    possible_timesave = best_diffs.sum()
-    possible_timesave = encode_time(possible_timesave, include_ns=False)
+
+def splits_metrics(bundle: DashboardBundle, time_type: TimeType) -> None:
+    summary = bundle.summaries[time_type]
+
+    best_run = encode_time(Timedelta(summary.best_run_time), include_ns=False)
+    best_segments_sum = encode_time(Timedelta(summary.sum_of_best), include_ns=False)
+    life_playtime = encode_time(Timedelta(summary.life_playtime), include_ns=False)
+    possible_timesave = encode_time(Timedelta(summary.possible_timesave), include_ns=False)
 
     time_column, segment_column, timesave_column, attempts_column, playtime_column = st.columns(5)
     time_column.metric("BEST TIME", best_run)
     segment_column.metric("SUM OF BEST SEGMENTS", best_segments_sum)
     timesave_column.metric("POSSIBLE TIMESAVE", possible_timesave)
-    attempts_column.metric("ATTEMPTS", f"{splits.attempt_count}")
+    attempts_column.metric("ATTEMPTS", f"{bundle.attempt_count}")
     playtime_column.metric("LIFE PLAYTIME", life_playtime)
 
 @st.cache_data
@@ -203,18 +183,21 @@ if __name__ == "__main__":
             label_visibility="hidden"
         )
         if lss_file is not None:
-            lss_bytes = lss_file.getvalue()
+            bundle = upload_bundle(lss_file)
             st.toast("Did you know that you can export your Run Stats? Hover the table and click 'Download as CSV'")
         else:
-            lss_bytes = read_bytes(DEMO_SPLITS)
+            bundle = demo_bundle()
 
-        splits = splits_from_bytes(lss_bytes)
         if "time_type" not in st.session_state:
             st.session_state["time_type"] = TimeType.REAL_TIME
 
+        # long histories are downsampled before charting (first/last, extremes and PBs/golds are always shown)
+        max_points = st.number_input("Max points per chart", min_value=50, max_value=20000, value=DEFAULT_MAX_POINTS, step=50)
+        downsample_method = st.selectbox("Downsampling", list(DownsampleMethod), 0, format_func=lambda method: method.name)
+
     # LIFETIME STATS
-    st.title(f"{splits.game_name} / :primary[{splits.category_name}]")
-    splits_metrics(splits_bytes=lss_bytes, time_type=TimeType.REAL_TIME)
+    st.title(f"{bundle.game_name} / :primary[{bundle.category_name}]")
+    splits_metrics(bundle, time_type=TimeType.REAL_TIME)
 
     for i, tab in enumerate(st.tabs(["Real Time", "Game Time"])):
         time_type = TimeType(i)
@@ -226,24 +209,22 @@ if __name__ == "__main__":
                 
                 with lifetime_line:
                     # CONSIDER BUNDLING DATA LOADING IN TIME_LINEGRAPH
-                    complete_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=False)
-                    run_times = complete_runs.sum(axis=0)
+                    run_times = bundle.run_times(st.session_state["time_type"])
+                    run_times = downsample_series(run_times, max_points=max_points, method=downsample_method)
                     run_times_df = represent_time(run_times, include_ns=False)
                     time_linegraph(run_times_df, title="Completed Run Duration over Time", x_title="Attempt Number", y_title = "Run Duration")
 
                 with resets_pie:
-                    partial_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True)
-                    resets_df = represent_resets(partial_runs)
+                    resets_df = bundle.resets[st.session_state["time_type"]]
                     resets_piechart(resets_df)
                     
             st.subheader("Run Stats", divider="blue")
             with st.container(border=True):
                 n = 2
-                complete_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=False)
-                partial_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True)
+                partial_runs = bundle.frame(st.session_state["time_type"], allow_partial=True)
 
-                segment_order = complete_runs.index.to_list()
-                default_ids = complete_runs.sum(axis=0).sort_values().head(n).index.to_list()
+                segment_order = list(bundle.columns.segment_names)
+                default_ids = bundle.summaries[st.session_state["time_type"]].top_k(n).index.to_list()
                 run_ids = st.multiselect(f"Select run (includes top {n} runs by default)", options= partial_runs.columns.to_list(), key=f"multirun_selector_{st.session_state["time_type"]}", default=default_ids)
             
                 run_table, run_graph = st.columns(2, gap="large")
@@ -255,16 +236,16 @@ if __name__ == "__main__":
                     cumulative = "Cumulative" in format_options
                     lss_ns = "Nanoseconds" in format_options
 
-                    table_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True, cumulative=cumulative, lss_ns=lss_ns, lss_repr=True)
+                    table_runs = bundle.frame(st.session_state["time_type"], allow_partial=True, cumulative=cumulative, lss_ns=lss_ns, lss_repr=True)
                     selected_table_runs = table_runs.loc[:, run_ids]
                     st.dataframe(selected_table_runs, height=len(segment_order) * 30, key=f"table_{st.session_state["time_type"]}")
                     format_options = st.pills("Format options", options = ["Cumulative", "Nanoseconds"], key=f"pills_{st.session_state["time_type"]}", selection_mode = "multi", default=[])
                     
                 with run_graph:
-                    line_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True, cumulative=True)
+                    line_runs = bundle.frame(st.session_state["time_type"], allow_partial=True, cumulative=True)
                     selected_line_runs = line_runs.loc[:, run_ids]
                     selected_line_runs = pd.melt(selected_line_runs.T.rename_axis("id").reset_index(), id_vars='id', value_name="TimeDelta", var_name="Segment")
-                    selected_line_runs["Time"] = selected_line_runs["TimeDelta"].apply(lambda x: encode_time(x, include_ns=lss_ns) if pd.notna(x) else None) 
+                    selected_line_runs["Time"] = encode_times(selected_line_runs["TimeDelta"].to_numpy(dtype="timedelta64[ns]"), include_ns=lss_ns)
                     selected_line_runs["DateTime"] = pd.to_datetime(selected_line_runs["TimeDelta"], unit="ns")
 
                     line_graph = alt.Chart(selected_line_runs, title=alt.Title("Run Breakdown (Cumulative)", anchor="middle")).mark_line(
@@ -283,10 +264,10 @@ if __name__ == "__main__":
 
                 st.divider()
 
-                bar_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True, cumulative=False)
+                bar_runs = bundle.frame(st.session_state["time_type"], allow_partial=True, cumulative=False)
                 selected_bar_runs = bar_runs.loc[:, run_ids]
                 selected_bar_runs = pd.melt(selected_bar_runs.T.rename_axis("id").reset_index(), id_vars='id', value_name="TimeDelta", var_name="Segment")
-                selected_bar_runs["Time"] = selected_bar_runs["TimeDelta"].apply(lambda x: encode_time(x, include_ns=lss_ns) if pd.notna(x) else None) 
+                selected_bar_runs["Time"] = encode_times(selected_bar_runs["TimeDelta"].to_numpy(dtype="timedelta64[ns]"), include_ns=lss_ns)
                 selected_bar_runs["DateTime"] = pd.to_datetime(selected_bar_runs["TimeDelta"], unit="ns")
                 selected_bar_runs["Zero"] = pd.to_datetime(0, unit="ns")
 
@@ -301,23 +282,24 @@ if __name__ == "__main__":
 
             st.subheader("Segment Stats", divider="blue")
             
-            segment_runs = splits_dataframe(lss_bytes, time_type=st.session_state["time_type"], allow_partial=True)
-            segment_name = st.selectbox("Select segment (defaults to first)", list(segment_runs.index), 0, key=f"segment_selector_{st.session_state["time_type"]}")
-            segment_times = segment_runs.loc[segment_name, :]
-            segment_times = segment_times.loc[~segment_times.isna()]
+            segment_names = bundle.columns.segment_names
+            segment_index = st.selectbox("Select segment (defaults to first)", range(len(segment_names)), 0, format_func=lambda i: segment_names[i], key=f"segment_selector_{st.session_state["time_type"]}")
+            segment_name = segment_names[segment_index]
+            segment_times = bundle.segment_times(st.session_state["time_type"], segment_index)
+            stats = bundle.segment_stats[st.session_state["time_type"]].iloc[segment_index]
             
             with st.container(border=False):
                 with st.container(border=True):
-                    segment_stats = represent_time(segment_times, include_ns=False)
+                    segment_stats = represent_time(downsample_series(segment_times, max_points=max_points, method=downsample_method), include_ns=False)
                     time_linegraph(dataframe=segment_stats, title=f"Segment Duration over Time ({segment_name})", x_title = "Attempt Number", y_title="Segment Duration")
 
                 with st.container(border=True):
                     min_segment, max_segment, mean_segment, median_segment, std_segment = st.columns(5)
-                    min_segment.metric(f"MIN ({segment_times.index[segment_times.argmin()]})", encode_time(segment_times.min(), include_ns=False))
-                    max_segment.metric(f"MAX ({segment_times.index[segment_times.argmax()]})", encode_time(segment_times.max(), include_ns=False))
-                    mean_segment.metric("MEAN", encode_time(segment_times.mean(), include_ns=False))
-                    median_segment.metric("MEDIAN", encode_time(segment_times.median(), include_ns=False))
-                    std_segment.metric("STANDARD DEVIATION", f"{int(segment_times.std().total_seconds())} seconds")
+                    min_segment.metric(f"MIN ({stats['best_run_id']})", encode_time(stats["best"], include_ns=False))
+                    max_segment.metric(f"MAX ({stats['worst_run_id']})", encode_time(stats["worst"], include_ns=False))
+                    mean_segment.metric("MEAN", encode_time(stats["mean"], include_ns=False))
+                    median_segment.metric("MEDIAN", encode_time(stats["median"], include_ns=False))
+                    std_segment.metric("STANDARD DEVIATION", f"{int(stats['std'].total_seconds())} seconds")
                                         
          
             
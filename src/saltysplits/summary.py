@@ -0,0 +1,212 @@
+from __future__ import annotations
+import warnings
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import List, Optional
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.kernels import (
+    NANOSECONDS_MAX,
+    best_per_segment,
+    first_missing,
+    run_totals,
+    valid_mask,
+)
+
+
+def _to_timedelta(values: np.ndarray) -> np.ndarray:
+    # rounds float64 nanoseconds to timedelta64[ns] (NaN becomes NaT)
+    nanoseconds = np.round(np.nan_to_num(values)).astype(np.int64)
+    return np.where(np.isnan(values), NANOSECONDS_NAT, nanoseconds).view("timedelta64[ns]")
+
+
+@dataclass(eq=False)
+class RunSummary:
+    """
+    Precomputed aggregates for the runs of a single time type, built once from the int64 split matrix (see RunSummary.from_matrix).
+    Times are int64 nanoseconds (NANOSECONDS_NAT if missing), per-segment mean/median/std are float64 nanoseconds (NaN if missing)
+
+    Args:
+        segment_names (List[str]): Segment names, in order
+        run_ids (List[Optional[str]]): Run IDs, in the same order as the matrix columns
+        run_totals (np.ndarray): Total time per run (only for complete runs)
+        run_playtime (np.ndarray): Summed split times per run (including partial runs, 0 if empty)
+        complete (np.ndarray): Whether a run has a split for every segment
+        empty (np.ndarray): Whether a run has no splits at all
+        reset_indices (np.ndarray): Index of the first segment without a split (-1 for complete runs)
+        ranking (np.ndarray): Positions of complete runs, sorted by total time (ties keep run order)
+        pb_positions (np.ndarray): Positions of the runs that improved on all runs before them (i.e. PB progression)
+        segment_best (np.ndarray): Best split per segment (over partial runs as well)
+        segment_best_positions (np.ndarray): Position of the run with the best split per segment (-1 if none)
+        segment_mean (np.ndarray): Mean split per segment
+        segment_median (np.ndarray): Median split per segment
+        segment_std (np.ndarray): Standard deviation (ddof=1) per segment
+        segment_counts (np.ndarray): Number of splits per segment
+        sum_of_best (int): Sum of best segments
+    """
+
+    segment_names: List[str]
+    run_ids: List[Optional[str]]
+    run_totals: np.ndarray
+    run_playtime: np.ndarray
+    complete: np.ndarray
+    empty: np.ndarray
+    reset_indices: np.ndarray
+    ranking: np.ndarray
+    pb_positions: np.ndarray
+    segment_best: np.ndarray
+    segment_best_positions: np.ndarray
+    segment_mean: np.ndarray
+    segment_median: np.ndarray
+    segment_std: np.ndarray
+    segment_counts: np.ndarray
+    sum_of_best: int
+
+    @classmethod
+    def from_matrix(
+        cls, matrix: np.ndarray, segment_names: List[str], run_ids: List[Optional[str]]
+    ) -> RunSummary:
+        """
+        Computes all aggregates in a handful of whole-matrix NumPy passes
+
+        Args:
+            matrix (np.ndarray): int64 matrix of shape (n_segments, n_runs) with NANOSECONDS_NAT for missing splits
+            segment_names (List[str]): Segment names, in order
+            run_ids (List[Optional[str]]): Run IDs, in the same order as the matrix columns
+
+        Returns:
+            RunSummary: Precomputed aggregates
+        """
+
+        valid = valid_mask(matrix)
+        n_segments, n_runs = matrix.shape
+
+        # runs can't be complete without segments (unlike in to_df, where they're kept as complete)
+        complete = valid.all(axis=0) if n_segments else np.zeros(n_runs, dtype=bool)
+        empty = ~valid.any(axis=0)
+        _, run_playtime = run_totals(matrix, valid)
+        totals = np.where(complete, run_playtime, NANOSECONDS_NAT)
+        reset_indices = first_missing(valid)
+
+        complete_positions = np.flatnonzero(complete)
+        ranking = complete_positions[np.argsort(totals[complete_positions], kind="stable")]
+
+        # runs that are strictly faster than every complete run before them
+        comparable_totals = np.where(complete, totals, NANOSECONDS_MAX)
+        previous_best = np.concatenate([[NANOSECONDS_MAX], np.minimum.accumulate(comparable_totals)[:-1]])  # fmt: skip
+        pb_positions = np.flatnonzero(complete & (comparable_totals < previous_best))
+
+        segment_counts = valid.sum(axis=1)
+        has_splits = segment_counts > 0
+        segment_best, segment_best_positions = best_per_segment(matrix, valid)
+
+        floats = np.where(valid, matrix.astype(np.float64), np.nan)
+        with warnings.catch_warnings():
+            # segments without (enough) splits are expected to be NaN
+            warnings.simplefilter("ignore", category=RuntimeWarning)
+            segment_mean = np.nanmean(floats, axis=1)
+            segment_median = np.nanmedian(floats, axis=1)
+            segment_std = np.nanstd(floats, axis=1, ddof=1)
+
+        return cls(
+            segment_names=list(segment_names),
+            run_ids=list(run_ids),
+            run_totals=totals,
+            run_playtime=run_playtime,
+            complete=complete,
+            empty=empty,
+            reset_indices=reset_indices,
+            ranking=ranking,
+            pb_positions=pb_positions,
+            segment_best=segment_best,
+            segment_best_positions=segment_best_positions,
+            segment_mean=segment_mean,
+            segment_median=segment_median,
+            segment_std=segment_std,
+            segment_counts=segment_counts,
+            sum_of_best=int(segment_best[has_splits].sum()),
+        )
+
+    @property
+    def best_run_id(self) -> Optional[str]:
+        """
+        Run ID of the fastest complete run (None if there are no complete runs)
+        """
+
+        return self.run_ids[self.ranking[0]] if len(self.ranking) else None
+
+    @property
+    def best_run_time(self) -> int:
+        """
+        Total time of the fastest complete run in nanoseconds (NANOSECONDS_NAT if there are no complete runs)
+        """
+
+        return int(self.run_totals[self.ranking[0]]) if len(self.ranking) else NANOSECONDS_NAT
+
+    @property
+    def life_playtime(self) -> int:
+        """
+        Summed time of all splits (complete and partial runs) in nanoseconds
+        """
+
+        return int(self.run_playtime.sum())
+
+    def top_k(self, k: int) -> pd.Series:
+        """
+        Returns the k fastest complete runs (a slice of the precomputed ranking)
+
+        Args:
+            k (int): Number of runs
+
+        Returns:
+            pd.Series: Total time per run (timedelta64[ns]), indexed by run ID
+        """
+
+        positions = self.ranking[:k]
+        return pd.Series(
+            self.run_totals[positions].view("timedelta64[ns]"),
+            index=[self.run_ids[i] for i in positions],
+        )
+
+    def pb_progression(self) -> pd.Series:
+        """
+        Returns the runs that set a new personal best, in run order
+
+        Returns:
+            pd.Series: Total time per PB run (timedelta64[ns]), indexed by run ID
+        """
+
+        return pd.Series(
+            self.run_totals[self.pb_positions].view("timedelta64[ns]"),
+            index=[self.run_ids[i] for i in self.pb_positions],
+        )
+
+    @property
+    def possible_timesave(self) -> int:
+        """
+        Difference between the best complete run and the sum of best segments in nanoseconds (NANOSECONDS_NAT if no complete runs)
+        """
+
+        return self.best_run_time - self.sum_of_best if len(self.ranking) else NANOSECONDS_NAT
+
+    def segment_stats(self) -> pd.DataFrame:
+        """
+        Returns the per-segment statistics as a single table
+
+        Returns:
+            pd.DataFrame: best, best_run_id, mean, median, std (timedelta64[ns]) and count per segment, indexed by segment name
+        """
+
+        return pd.DataFrame(
+            {
+                "best": self.segment_best.view("timedelta64[ns]"),
+                "best_run_id": [
+                    self.run_ids[i] if i >= 0 else None for i in self.segment_best_positions
+                ],
+                "mean": _to_timedelta(self.segment_mean),
+                "median": _to_timedelta(self.segment_median),
+                "std": _to_timedelta(self.segment_std),
+                "count": self.segment_counts,
+            },
+            index=self.segment_names,
+        )
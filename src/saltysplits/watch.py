@@ -0,0 +1,283 @@
+from __future__ import annotations
+import os
+import asyncio
+from concurrent.futures import Executor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+from saltysplits.enums import TimeType
+from saltysplits.summary import RunSummary
+from saltysplits.stream import read_lss_columns
+
+# size and mtime (ns) of a file, None if it doesn't exist (yet)
+Stamp = Optional[Tuple[int, int]]
+
+
+class WatchUpdate(NamedTuple):
+    """
+    Recomputed stats of a watched LiveSplit file, published after every (debounced) change (see SplitsWatcher)
+
+    Args:
+        path (Path): Path to the LiveSplit file (.LSS)
+        stamp (Tuple[int, int]): Size and mtime (ns) of the file that was read
+        attempt_count (Optional[int]): AttemptCount of the run
+        best_run_time (Optional[int]): Total time of the fastest complete run in nanoseconds (NANOSECONDS_NAT if none)
+        sum_of_best (Optional[int]): Sum of best segments in nanoseconds
+        summary (Optional[RunSummary]): All precomputed aggregates (see saltysplits.summary)
+        error (Optional[BaseException]): Error raised while reading the file, all other fields (except path and stamp) are None if set
+    """
+
+    path: Path
+    stamp: Tuple[int, int]
+    attempt_count: Optional[int]
+    best_run_time: Optional[int]
+    sum_of_best: Optional[int]
+    summary: Optional[RunSummary]
+    error: Optional[BaseException]
+
+
+def summarize_lss(lss_path: Path, stamp: Tuple[int, int], time_type: TimeType) -> WatchUpdate:
+    """
+    Reads a LiveSplit file (LSS) through read_lss_columns and summarizes it (runs in the executor of SplitsWatcher, errors are returned)
+
+    Args:
+        lss_path (Path): Path to the LiveSplit file (.LSS)
+        stamp (Tuple[int, int]): Size and mtime (ns) of the file, as observed by the watcher
+        time_type (TimeType): Whether to use GameTime or RealTime values
+
+    Returns:
+        WatchUpdate: Recomputed stats (or the error that was raised)
+    """
+
+    try:
+        columns = read_lss_columns(lss_path)
+        summary = columns.summary(time_type)
+    except Exception as error:
+        return WatchUpdate(lss_path, stamp, None, None, None, None, error)
+    return WatchUpdate(
+        path=lss_path,
+        stamp=stamp,
+        attempt_count=columns.attempt_count,
+        best_run_time=summary.best_run_time,
+        sum_of_best=summary.sum_of_best,
+        summary=summary,
+        error=None,
+    )
+
+
+def _stamps(lss_paths: List[Path]) -> List[Stamp]:
+    stamps = []
+    for lss_path in lss_paths:
+        try:
+            status = os.stat(lss_path)
+        except FileNotFoundError:
+            stamps.append(None)
+            continue
+        stamps.append((status.st_size, status.st_mtime_ns))
+    return stamps
+
+
+class _FileState:
+    # what the watcher knows about a single path
+    __slots__ = ("seen", "changed_at", "published", "pending")
+
+    def __init__(self) -> None:
+        self.seen: Stamp = None
+        self.changed_at = 0.0
+        self.published: Stamp = None
+        self.pending = False
+
+
+class Subscription:
+    """
+    Async iterator over the updates of a SplitsWatcher (see SplitsWatcher.subscribe), ends when the watcher stops or it's closed
+
+    Args:
+        watcher (SplitsWatcher): Watcher that publishes the updates
+    """
+
+    def __init__(self, watcher: SplitsWatcher) -> None:
+        self._watcher = watcher
+        self._queue: asyncio.Queue[Optional[WatchUpdate]] = asyncio.Queue()
+
+    def __aiter__(self) -> Subscription:
+        return self
+
+    async def __anext__(self) -> WatchUpdate:
+        update = await self._queue.get()
+        if update is None:
+            raise StopAsyncIteration
+        return update
+
+    def close(self) -> None:
+        """
+        Stops receiving updates (iteration ends after the updates that were already queued)
+        """
+
+        if self in self._watcher._subscriptions:
+            self._watcher._subscriptions.discard(self)
+            self._queue.put_nowait(None)
+
+
+class SplitsWatcher:
+    """
+    Follows many LiveSplit files (LSS) from a single event loop and publishes their recomputed stats (see WatchUpdate) to async subscribers.
+    Files are polled by size and mtime (one batch of os.stat calls per interval, in a thread), a change is only read once the file
+    stopped changing for debounce seconds (LiveSplit rewrites the whole file on save). Reading happens in an executor, so the event loop never blocks
+
+    Args:
+        lss_paths (Iterable[Path], optional): LiveSplit files to watch (more can be added later). Defaults to ().
+        interval (float, optional): Seconds between polls. Defaults to 1.0.
+        debounce (float, optional): Seconds a file has to stay unchanged before it's read. Defaults to 0.5.
+        time_type (TimeType, optional): Whether to use GameTime or RealTime values. Defaults to REAL_TIME.
+        executor (Optional[Executor], optional): Executor for reading files (e.g. a ProcessPoolExecutor for many busy files). Defaults to None (the loop's default executor).
+        max_pending (int, optional): Maximum number of files read at the same time. Defaults to 4.
+    """
+
+    def __init__(
+        self,
+        lss_paths: Iterable[Path] = (),
+        interval: float = 1.0,
+        debounce: float = 0.5,
+        time_type: TimeType = TimeType.REAL_TIME,
+        executor: Optional[Executor] = None,
+        max_pending: int = 4,
+    ) -> None:
+        self.interval = interval
+        self.debounce = debounce
+        self.time_type = time_type
+        self.executor = executor
+        self.max_pending = max_pending
+        self._files: Dict[Path, _FileState] = {}
+        self._subscriptions: Set[Subscription] = set()
+        self._reads: Set[asyncio.Task] = set()
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._task: Optional[asyncio.Task] = None
+        for lss_path in lss_paths:
+            self.add(lss_path)
+
+    @property
+    def paths(self) -> List[Path]:
+        """
+        Paths that are currently watched
+        """
+
+        return list(self._files)
+
+    def add(self, lss_path: Path) -> None:
+        """
+        Starts watching a LiveSplit file (it doesn't have to exist yet), its stats are published once it's stable
+
+        Args:
+            lss_path (Path): Path to the LiveSplit file (.LSS)
+        """
+
+        self._files.setdefault(Path(lss_path), _FileState())
+
+    def remove(self, lss_path: Path) -> None:
+        """
+        Stops watching a LiveSplit file (the result of a read that's already running is dropped)
+
+        Args:
+            lss_path (Path): Path to the LiveSplit file (.LSS)
+        """
+
+        self._files.pop(Path(lss_path), None)
+
+    def subscribe(self) -> Subscription:
+        """
+        Registers a subscriber that receives every update from now on
+
+        Returns:
+            Subscription: Async iterator over WatchUpdate instances (use close to unsubscribe)
+        """
+
+        subscription = Subscription(self)
+        self._subscriptions.add(subscription)
+        return subscription
+
+    def _publish(self, update: WatchUpdate) -> None:
+        for subscription in self._subscriptions:
+            subscription._queue.put_nowait(update)
+
+    async def _read(self, lss_path: Path, stamp: Tuple[int, int]) -> None:
+        loop = asyncio.get_running_loop()
+        state = self._files[lss_path]
+        try:
+            async with self._semaphore:
+                update = await loop.run_in_executor(self.executor, summarize_lss, lss_path, stamp, self.time_type)  # fmt: skip
+        except Exception as error:
+            # e.g. a broken process pool, reported like any other read error
+            update = WatchUpdate(lss_path, stamp, None, None, None, None, error)
+        finally:
+            state.pending = False
+
+        if self._files.get(lss_path) is not state:
+            # removed while it was read
+            return
+        # failed reads are published as well, they're only retried once the file changes again
+        state.published = stamp
+        self._publish(update)
+
+    async def poll(self) -> None:
+        """
+        Checks all watched files once and starts reading those that changed and have been stable for debounce seconds
+        """
+
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_pending)
+        loop = asyncio.get_running_loop()
+        lss_paths = list(self._files)
+        stamps = await loop.run_in_executor(None, _stamps, lss_paths)
+        now = loop.time()
+
+        for lss_path, stamp in zip(lss_paths, stamps):
+            state = self._files.get(lss_path)
+            if state is None or stamp is None:
+                continue
+            if stamp != state.seen:
+                state.seen, state.changed_at = stamp, now
+                continue
+            if stamp == state.published or state.pending or now - state.changed_at < self.debounce:
+                continue
+
+            state.pending = True
+            task = asyncio.create_task(self._read(lss_path, stamp))
+            self._reads.add(task)
+            task.add_done_callback(self._reads.discard)
+
+    async def run(self) -> None:
+        """
+        Polls all watched files every interval seconds until cancelled (see start and stop)
+        """
+
+        while True:
+            await self.poll()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        """
+        Runs the watcher as a task on the running event loop
+        """
+
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self.run())
+
+    async def stop(self) -> None:
+        """
+        Cancels polling and pending reads, and ends all subscriptions
+        """
+
+        tasks = list(self._reads) + ([self._task] if self._task is not None else [])
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._task = None
+        for subscription in list(self._subscriptions):
+            subscription.close()
+
+    async def __aenter__(self) -> SplitsWatcher:
+        self.start()
+        return self
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        await self.stop()
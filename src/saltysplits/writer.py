@@ -0,0 +1,234 @@
+from __future__ import annotations
+import os
+import stat
+import tempfile
+import warnings
+import numpy as np
+import pandas as pd
+from lxml import etree
+from pathlib import Path
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Sequence
+from saltysplits.codec import encode_times
+from saltysplits.columnar import nanosecond_array
+from saltysplits.constants import DATETIME_FORMAT
+from saltysplits.history import CompactHistory
+from saltysplits.iterparse import release_element
+from saltysplits.annotations import encode_offset
+from saltysplits.models import BaseTime
+
+if TYPE_CHECKING:
+    from saltysplits.models import Splits
+
+# same layout as LiveSplit's own files (BOM, declaration and two space indentation)
+DECLARATION = '\ufeff<?xml version="1.0" encoding="UTF-8"?>\n'.encode("utf-8")
+INDENT = "  "
+# sections that aren't modelled (but LiveSplit needs), copied from the source file as is
+PASSTHROUGH_TAGS = ("Metadata", "AutoSplitterSettings")
+# number of attempts/splits whose times are encoded in a single batch (bounds memory use for large histories)
+WRITE_CHUNK = 4096
+
+
+def _newline(xf: etree.xmlfile, depth: int) -> None:
+    xf.write("\n" + INDENT * depth)
+
+
+def _write(xf: etree.xmlfile, element: etree._Element, depth: int) -> None:
+    # writes a complete (small) element, indented as if it were part of the pretty printed document
+    _newline(xf, depth)
+    etree.indent(element, space=INDENT, level=depth)
+    element.tail = None
+    xf.write(element)
+
+
+def _text_element(tag: str, text: Optional[str]) -> etree._Element:
+    element = etree.Element(tag)
+    element.text = text
+    return element
+
+
+def _icon_element(tag: str, icon: Optional[object]) -> etree._Element:
+    # icons (base64 strings or IconRef, see saltysplits.icons) are written as CDATA, just like LiveSplit does
+    element = etree.Element(tag)
+    if icon:
+        element.text = etree.CDATA(str(icon))
+    return element
+
+
+def _add_times(element: etree._Element, real_time: Optional[str], game_time: Optional[str]) -> etree._Element:  # fmt: skip
+    # missing times are left out (not written as empty elements)
+    if real_time is not None:
+        etree.SubElement(element, "RealTime").text = real_time
+    if game_time is not None:
+        etree.SubElement(element, "GameTime").text = game_time
+    return element
+
+
+def _encode_datetimes(values: Sequence[Optional[object]]) -> List[Optional[str]]:
+    datetimes = pd.DatetimeIndex(np.array(values, dtype="datetime64[ns]"))
+    encoded = datetimes.strftime(DATETIME_FORMAT)
+    return [None if missing else value for value, missing in zip(encoded, datetimes.isna())]
+
+
+def _encode_flag(value: Optional[bool]) -> Optional[str]:
+    return None if value is None else str(value)
+
+
+def _passthrough_sections(source: Path) -> Dict[str, etree._Element]:
+    """
+    Collects the unmodelled sections (see PASSTHROUGH_TAGS) from a LiveSplit file with iterparse,
+    clearing everything else as it goes (so memory use doesn't scale with the size of the histories)
+
+    Args:
+        source (Path): Path to the LiveSplit file (.LSS)
+
+    Returns:
+        Dict[str, etree._Element]: Passthrough elements by tag
+    """
+
+    sections, depth = {}, 0
+    for event, element in etree.iterparse(str(source), events=("start", "end")):
+        if event == "start":
+            depth += 1
+            continue
+
+        depth -= 1
+        if depth == 1:
+            if element.tag in PASSTHROUGH_TAGS:
+                sections[element.tag] = element
+            else:
+                element.clear(keep_tail=False)
+        elif depth == 2 and element.getparent().tag not in PASSTHROUGH_TAGS:
+            # releases processed attempts, segments, etc (along with their previous siblings)
+            release_element(element)
+    return sections
+
+
+def _write_times(
+    xf: etree.xmlfile,
+    tag: str,
+    ids: List[str],
+    real_time: np.ndarray,
+    game_time: np.ndarray,
+    depth: int,
+) -> None:
+    # writes Time elements (id, RealTime, GameTime), encoding their times in batches of WRITE_CHUNK
+    for start in range(0, len(ids), WRITE_CHUNK):
+        stop = start + WRITE_CHUNK
+        real_strings = encode_times(real_time[start:stop])
+        game_strings = encode_times(game_time[start:stop])
+        for run_id, real, game in zip(ids[start:stop], real_strings, game_strings):
+            _write(xf, _add_times(etree.Element(tag, id=run_id), real, game), depth)
+
+
+def _write_attempts(xf: etree.xmlfile, attempts: Sequence, depth: int) -> None:
+    for start in range(0, len(attempts), WRITE_CHUNK):
+        chunk = attempts[start : start + WRITE_CHUNK]
+        real_strings = encode_times(nanosecond_array([attempt.real_time for attempt in chunk]))
+        game_strings = encode_times(nanosecond_array([attempt.game_time for attempt in chunk]))
+        started_strings = _encode_datetimes([attempt.started for attempt in chunk])
+        ended_strings = _encode_datetimes([attempt.ended for attempt in chunk])
+
+        for attempt, real, game, started, ended in zip(chunk, real_strings, game_strings, started_strings, ended_strings):  # fmt: skip
+            element = etree.Element("Attempt", id=attempt.id)
+            attributes = [
+                ("started", started),
+                ("isStartedSynced", _encode_flag(attempt.is_started_synced)),
+                ("ended", ended),
+                ("isEndedSynced", _encode_flag(attempt.is_ended_synced)),
+            ]
+            for name, value in attributes:
+                if value is not None:
+                    element.set(name, value)
+            _write(xf, _add_times(element, real, game), depth)
+
+
+def _base_time(tag: str, time: BaseTime, **attributes: str) -> etree._Element:
+    real_time, game_time = encode_times(nanosecond_array([time.real_time, time.game_time]))
+    return _add_times(etree.Element(tag, **attributes), real_time, game_time)
+
+
+def _write_segments(xf: etree.xmlfile, segments: Iterable, depth: int) -> None:
+    for segment in segments:
+        _newline(xf, depth)
+        with xf.element("Segment"):
+            _write(xf, _text_element("Name", segment.name), depth + 1)
+            _write(xf, _icon_element("Icon", segment.icon), depth + 1)
+
+            split_times = etree.Element("SplitTimes")
+            for split_time in segment.split_times:
+                split_times.append(_base_time("SplitTime", split_time, name=split_time.name))
+            _write(xf, split_times, depth + 1)
+            _write(xf, _base_time("BestSegmentTime", segment.best_segment_time), depth + 1)
+
+            history = segment.segment_history or []
+            _newline(xf, depth + 1)
+            with xf.element("SegmentHistory"):
+                if isinstance(history, CompactHistory):
+                    ids, real_time, game_time = history.id_list(), history.real_time, history.game_time  # fmt: skip
+                else:
+                    ids = [split.id for split in history]
+                    real_time = nanosecond_array([split.real_time for split in history])
+                    game_time = nanosecond_array([split.game_time for split in history])
+                _write_times(xf, "Time", ids, real_time, game_time, depth + 2)
+                if len(ids):
+                    _newline(xf, depth + 1)
+            _newline(xf, depth)
+
+
+def write_lss(splits: Splits, lss_path: Path, source: Optional[Path] = None) -> None:
+    """
+    Writes speedrunning data as a LiveSplit file (LSS), streaming elements to disk with lxml.etree.xmlfile (i.e. without
+    building the full tree). Times are encoded in batches (see encode_times) and icons are written as is, unmodelled sections
+    (Metadata, AutoSplitterSettings) are copied from source. Written to a temporary file first, so lss_path may be the source
+
+    Args:
+        splits (Splits): Root model (e.g. a SaltySplits instance)
+        lss_path (Path): Destination of the LiveSplit file (.LSS)
+        source (Optional[Path], optional): LiveSplit file to copy unmodelled sections from (e.g. the file that was read). Defaults to None (sections are dropped, with a warning).
+    """
+
+    if source is None:
+        warnings.warn(f"No source file to copy {', '.join(PASSTHROUGH_TAGS)} from, they're left out of {lss_path}", UserWarning, stacklevel=2)  # fmt: skip
+    sections = _passthrough_sections(source) if source is not None else {}
+    lss_path = Path(lss_path)
+    file_descriptor, temporary_path = tempfile.mkstemp(prefix=f".{lss_path.name}.", dir=lss_path.parent)  # fmt: skip
+
+    try:
+        with os.fdopen(file_descriptor, "wb") as file:
+            file.write(DECLARATION)
+            with etree.xmlfile(file, encoding="utf-8") as xf:
+                attributes = {"version": splits.version} if splits.version is not None else {}
+                with xf.element("Run", **attributes):
+                    _write(xf, _icon_element("GameIcon", splits.game_icon), 1)
+                    _write(xf, _text_element("GameName", splits.game_name), 1)
+                    _write(xf, _text_element("CategoryName", splits.category_name), 1)
+                    if splits.layout_path is not None:
+                        _write(xf, _text_element("LayoutPath", splits.layout_path), 1)
+                    if "Metadata" in sections:
+                        _write(xf, sections["Metadata"], 1)
+                    offset = encode_offset(splits.offset) if splits.offset is not None else None
+                    _write(xf, _text_element("Offset", offset), 1)
+                    _write(xf, _text_element("AttemptCount", str(splits.attempt_count)), 1)
+
+                    _newline(xf, 1)
+                    with xf.element("AttemptHistory"):
+                        attempts = splits.attempt_history or []
+                        _write_attempts(xf, attempts, 2)
+                        if attempts:
+                            _newline(xf, 1)
+
+                    _newline(xf, 1)
+                    with xf.element("Segments"):
+                        _write_segments(xf, splits.segments, 2)
+                        if splits.segments:
+                            _newline(xf, 1)
+
+                    if "AutoSplitterSettings" in sections:
+                        _write(xf, sections["AutoSplitterSettings"], 1)
+                    _newline(xf, 0)
+        # mkstemp creates owner-only files, keeps the permissions of the file we replace instead
+        os.chmod(temporary_path, stat.S_IMODE(os.stat(lss_path).st_mode) if lss_path.exists() else 0o644)  # fmt: skip
+        os.replace(temporary_path, lss_path)
+    except BaseException:
+        Path(temporary_path).unlink(missing_ok=True)
+        raise
@@ -1,6 +1,8 @@
+import copy
 import pytest
 import requests
 import pathlib
+import lxml.etree as ET
 from urllib.error import HTTPError
 from lxml.etree import Element
 
@@ -107,3 +109,31 @@ def invalid_splits(ensure_presence_splits):
 @pytest.fixture
 def livesplit_vicecity():
     return LSS_DIR / LIVESPLIT_VICE_CITY
+
+
+def append_attempt(lss_path: pathlib.Path, lss_dst: pathlib.Path) -> str:
+    """Writes a copy of an LSS file with one extra attempt (a copy of its last attempt and splits under a new ID)
+
+    Args:
+        lss_path (pathlib.Path): LSS file to copy
+        lss_dst (pathlib.Path): Destination of the LSS file with the extra attempt
+
+    Returns:
+        str: ID of the new attempt
+    """
+    tree = ET.parse(lss_path)
+    root = tree.getroot()
+    attempts = root.find("AttemptHistory")
+    new_id = str(max(int(attempt.get("id")) for attempt in attempts) + 1)
+
+    new_attempt = copy.deepcopy(attempts[-1])
+    new_attempt.set("id", new_id)
+    attempts.append(new_attempt)
+    for history in root.iter("SegmentHistory"):
+        if len(history):
+            new_time = copy.deepcopy(history[-1])
+            new_time.set("id", new_id)
+            history.append(new_time)
+    root.find("AttemptCount").text = str(int(root.findtext("AttemptCount")) + 1)
+    tree.write(lss_dst, encoding="utf-8", xml_declaration=True)
+    return new_id
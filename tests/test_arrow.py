@@ -0,0 +1,57 @@
+import pytest
+import numpy as np
+import pandas as pd
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+
+class TestArrow:
+    def test_to_arrow(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        table = splits.to_arrow()
+
+        assert table.schema.field("real_time").type == pa.duration("ns")
+        assert table.schema.field("game_time").type == pa.duration("ns")
+        assert table.schema.field("attempt_started").type == pa.timestamp("ns")
+        assert table.schema.metadata[b"saltysplits.game_name"].decode() == splits.game_name
+
+        # one row per split, matching the wide frames of to_df
+        for time_type, column in [(TimeType.REAL_TIME, "real_time"), (TimeType.GAME_TIME, "game_time")]:  # fmt: skip
+            df = splits.to_df(time_type, allow_partial=True)
+            long_df = table.to_pandas().dropna(subset=[column])
+            wide_df = long_df.pivot(index="segment_name", columns="run_id", values=column)
+            wide_df = wide_df.reindex(index=df.index, columns=df.columns)
+            pd.testing.assert_frame_equal(wide_df, df, check_names=False, check_freq=False)
+
+    def test_attempts(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        df = splits.to_arrow().to_pandas()
+        attempts = {attempt.id: attempt for attempt in splits.attempt_history}
+
+        for run_id, run_df in df.groupby("run_id"):
+            attempt = attempts.get(run_id)
+            started = run_df["attempt_started"].unique()
+            assert len(started) == 1
+            if attempt is None or attempt.started is None:
+                assert pd.isna(started[0])
+            else:
+                assert pd.Timestamp(started[0]) == pd.Timestamp(attempt.started)
+            assert np.all(np.diff(run_df["segment_index"].to_numpy()) > 0)
+
+    def test_to_parquet(self, livesplit_vicecity, tmp_path):
+        splits = ss.read_lss(livesplit_vicecity)
+        parquet_path = tmp_path / "splits.parquet"
+        splits.to_parquet(parquet_path, compression="zstd")
+        assert pq.read_table(parquet_path).equals(splits.to_arrow())
+
+    def test_empty(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        for segment in splits.segments:
+            segment.segment_history = None
+        splits.reset_columns()
+        table = splits.to_arrow()
+        assert table.num_rows == 0
+        assert table.schema.names[0] == "run_id"
@@ -0,0 +1,31 @@
+import pytest
+import numpy as np
+from saltysplits import DEMO_SPLITS
+from saltysplits.batch import iter_many, read_many
+from saltysplits.stream import read_lss_columns
+
+
+class TestBatch:
+    @pytest.mark.parametrize("executor", ["process", "thread"])
+    def test_read_many(self, livesplit_vicecity, tmp_path, executor):
+        broken_path = tmp_path / "broken.lss"
+        broken_path.write_text("<Run><GameName>")
+        lss_paths = [livesplit_vicecity, broken_path, DEMO_SPLITS, tmp_path / "missing.lss"]
+
+        results = read_many(lss_paths, workers=2, executor=executor)
+        assert [result.path for result in results] == lss_paths
+        assert [result.error is None for result in results] == [True, False, True, False]
+        for result in [results[0], results[2]]:
+            expected = read_lss_columns(result.path)
+            assert result.columns.run_ids == expected.run_ids
+            assert np.array_equal(result.columns.real_time, expected.real_time)
+
+    def test_iter_many_unordered(self, livesplit_vicecity):
+        lss_paths = [livesplit_vicecity, DEMO_SPLITS] * 3
+        results = list(iter_many(lss_paths, workers=2, executor="thread", ordered=False))
+        assert sorted(map(str, [result.path for result in results])) == sorted(map(str, lss_paths))
+        assert all(result.error is None for result in results)
+
+    def test_unknown_executor(self, livesplit_vicecity):
+        with pytest.raises(ValueError):
+            read_many([livesplit_vicecity], executor="cluster")
@@ -0,0 +1,29 @@
+import pytest  # noqa: F401
+from benchmarks.synthetic import generate_lss
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+
+
+class TestSyntheticLss:
+    def test_deterministic(self):
+        assert generate_lss(5, 50, seed=1) == generate_lss(5, 50, seed=1)
+        assert generate_lss(5, 50, seed=1) != generate_lss(5, 50, seed=2)
+
+    @pytest.mark.parametrize("reset_distribution", ["geometric", "uniform"])
+    def test_generated_splits(self, tmp_path, reset_distribution):
+        lss_path = tmp_path / "synthetic.lss"
+        lss_path.write_bytes(generate_lss(8, 200, reset_rate=0.1, reset_distribution=reset_distribution, icon_size=8))  # fmt: skip
+        splits = ss.read_lss(lss_path)
+
+        assert splits.attempt_count == len(splits.attempt_history) == 200
+        assert len(splits.segments) == 8
+        partial_runs = splits.to_df(allow_partial=True, allow_empty=True)
+        complete_runs = splits.to_df()
+        assert 0 < complete_runs.shape[1] < partial_runs.shape[1] == 200
+        assert splits.summary().best_run_time == complete_runs.sum(axis=0).min().value
+
+    def test_without_game_time(self, tmp_path):
+        lss_path = tmp_path / "synthetic.lss"
+        lss_path.write_bytes(generate_lss(4, 20, game_time=False))
+        splits = ss.read_lss(lss_path)
+        assert splits.to_df(TimeType.GAME_TIME, allow_partial=True).empty
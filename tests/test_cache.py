@@ -0,0 +1,49 @@
+import os
+import pytest  # noqa: F401
+import numpy as np
+import pandas as pd
+from saltysplits.cache import ColumnsCache
+from saltysplits.stream import read_lss_columns, read_lss_frame
+
+
+class TestColumnsCache:
+    def test_round_trip(self, livesplit_vicecity, tmp_path):
+        columns = read_lss_columns(livesplit_vicecity)
+        cold_columns = read_lss_columns(livesplit_vicecity, cache_dir=tmp_path)
+        warm_columns = read_lss_columns(livesplit_vicecity, cache_dir=tmp_path)
+
+        assert len([path for path in tmp_path.iterdir()]) == 1
+        assert isinstance(warm_columns.real_time, np.memmap)
+        for cached_columns in [cold_columns, warm_columns]:
+            for name, value in vars(columns).items():
+                if isinstance(value, np.ndarray):
+                    assert np.array_equal(value, getattr(cached_columns, name), equal_nan=value.dtype.kind == "M")  # fmt: skip
+                else:
+                    assert value == getattr(cached_columns, name)
+
+        pd.testing.assert_frame_equal(
+            read_lss_frame(livesplit_vicecity, allow_partial=True, cache_dir=tmp_path),
+            columns.to_df(allow_partial=True),
+        )
+
+    def test_key(self, livesplit_vicecity):
+        lss_bytes = livesplit_vicecity.read_bytes()
+        assert ColumnsCache.key(lss_bytes) == ColumnsCache.key(lss_bytes)
+        assert ColumnsCache.key(lss_bytes) != ColumnsCache.key(lss_bytes + b" ")
+
+    def test_evict(self, livesplit_vicecity, tmp_path):
+        columns = read_lss_columns(livesplit_vicecity)
+        cache = ColumnsCache(tmp_path)
+        for key in ["a", "b", "c"]:
+            cache.store(key, columns)
+        entry_size = sum(path.stat().st_size for path in (tmp_path / "a").iterdir())
+        # explicit mtimes, back-to-back writes can share a timestamp on filesystems with coarse resolution
+        for mtime, key in enumerate(["a", "b", "c"], start=1):
+            os.utime(tmp_path / key, (mtime, mtime))
+
+        # touching "a" makes "b" the least recently used entry
+        cache.load("a")
+        cache.max_bytes = 2 * entry_size
+        cache.evict()
+        assert sorted(path.name for path in tmp_path.iterdir()) == ["a", "c"]
+        assert cache.load("b") is None
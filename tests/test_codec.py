@@ -0,0 +1,94 @@
+import pytest
+import numpy as np
+import lxml.etree as ET
+from datetime import datetime
+from pandas import Timedelta
+from saltysplits.annotations import decode_datetime, decode_time, encode_offset, encode_time
+from saltysplits.codec import decode_datetimes, decode_nanoseconds, decode_times, encode_times
+
+TIME_STRINGS = [
+    "01:55:11.1422649",
+    "00:00:00",
+    "00:00:54.2793950",
+    "1.01:55:11.1422649",
+    "12.00:00:01",
+    "00:01:02.5",
+    "100:00:00.0000001",
+]
+
+
+class TestDecode:
+    @pytest.mark.parametrize(
+        "value, expected",
+        [
+            ("01:55:11.1422649", Timedelta(hours=1, minutes=55, seconds=11, nanoseconds=142264900)),
+            ("00:00:00", Timedelta(0)),
+            ("1.01:55:11.1422649", Timedelta(days=1, hours=1, minutes=55, seconds=11, nanoseconds=142264900)),  # fmt: skip
+            ("12.00:00:01", Timedelta(days=12, seconds=1)),
+            ("00:01:02.5", Timedelta(minutes=1, seconds=2, nanoseconds=500)),
+            ("100:00:00.0000001", Timedelta(hours=100, nanoseconds=100)),
+        ],
+    )
+    def test_decode_nanoseconds(self, value, expected):
+        assert decode_nanoseconds(value) == expected.value
+        assert decode_time(value) == expected
+
+    @pytest.mark.parametrize("value", ["", "01:55", "aa:bb:cc.ddddddd", "01:55:11.142264a", "01-55-11.1422649"])  # fmt: skip
+    def test_decode_invalid(self, value):
+        with pytest.raises(AssertionError):
+            decode_nanoseconds(value)
+
+    def test_decode_times(self, livesplit_vicecity):
+        root = ET.parse(livesplit_vicecity).getroot()
+        values = [element.text for element in root.iter("RealTime", "GameTime")]
+        values = values + TIME_STRINGS + [None]
+
+        decoded = decode_times(values)
+        assert decoded.dtype == np.dtype("timedelta64[ns]")
+        assert np.isnat(decoded[-1])
+        for value, nanoseconds in zip(values[:-1], decoded[:-1].view(np.int64)):
+            assert nanoseconds == decode_nanoseconds(value)
+
+    def test_decode_datetimes(self, livesplit_vicecity):
+        root = ET.parse(livesplit_vicecity).getroot()
+        values = [element.get(key) for element in root.iter("Attempt") for key in ("started", "ended")]
+        # leap day, no zero padding (strptime fallback) and missing values
+        values = values + ["02/29/2024 23:59:59", "1/2/2016 3:04:05", None]
+
+        decoded = decode_datetimes(values)
+        assert decoded.dtype == np.dtype("datetime64[ns]")
+        for value, timestamp in zip(values, decoded):
+            if value is None:
+                assert np.isnat(timestamp)
+            else:
+                assert timestamp == np.datetime64(decode_datetime(value), "ns")
+        assert decoded[-2] == np.datetime64(datetime(2016, 1, 2, 3, 4, 5), "ns")
+
+    @pytest.mark.parametrize("value", ["02/30/2016 00:00:00", "13/01/2016 00:00:00", "02/03/2016 24:00:00", "02-03-2016 00:00:00"])  # fmt: skip
+    def test_decode_datetimes_invalid(self, value):
+        with pytest.raises(ValueError):
+            decode_datetimes([value])
+
+
+class TestEncode:
+    @pytest.mark.parametrize("include_ns", [True, False])
+    def test_encode_times(self, include_ns):
+        rng = np.random.default_rng(0)
+        nanoseconds = rng.integers(0, 3 * 86400 * 10**9, size=1000) // 100 * 100
+        nanoseconds[:3] = [0, 86400 * 10**9, 10**9]
+        values = nanoseconds.view("timedelta64[ns]").copy()
+        values[-1] = np.timedelta64("NaT")
+
+        encoded = encode_times(values, include_ns=include_ns)
+        assert encoded[-1] is None
+        for value, string in zip(values[:-1], encoded[:-1]):
+            assert string == encode_time(Timedelta(value), include_ns=include_ns)
+
+    def test_encode_offsets(self):
+        values = np.array([0, 10**9, 1234567800, 86400 * 10**9 + 100], dtype="timedelta64[ns]")
+        encoded = encode_times(values, offset=True)
+        assert list(encoded) == [encode_offset(Timedelta(value)) for value in values]
+
+    def test_round_trip(self):
+        decoded = decode_times(TIME_STRINGS[:4])
+        assert list(encode_times(decoded)) == [encode_time(decode_time(value)) for value in TIME_STRINGS[:4]]  # fmt: skip
@@ -0,0 +1,50 @@
+import pytest  # noqa: F401
+from saltysplits import DEMO_SPLITS
+from saltysplits import SaltySplits as ss
+from saltysplits.corpus import SplitsCorpus
+from saltysplits.enums import TimeType
+
+
+class TestSplitsCorpus:
+    def test_from_splits(self, livesplit_vicecity):
+        vicecity = ss.read_lss(livesplit_vicecity)
+        demo = ss.read_lss(DEMO_SPLITS)
+        corpus = SplitsCorpus.from_splits([vicecity, demo], names=["vicecity", "demo"])
+
+        real_df = vicecity.to_df(TimeType.REAL_TIME, allow_partial=True, allow_empty=True)
+        game_df = vicecity.to_df(TimeType.GAME_TIME, allow_partial=True, allow_empty=True)
+        n_splits = (real_df.notna() | game_df.notna()).sum().sum()
+        assert len(corpus.splits.loc[(vicecity.game_name, vicecity.category_name)]) == n_splits
+        assert list(corpus.files.index) == ["vicecity", "demo"]
+
+        # built from the models as they are now, not from the cached columns
+        vicecity.segments[0].segment_history = None
+        edited = SplitsCorpus.from_splits([vicecity], names=["vicecity"])
+        assert len(edited.splits) < n_splits
+
+    @pytest.mark.parametrize("time_type", list(TimeType))
+    def test_queries(self, livesplit_vicecity, time_type):
+        vicecity = ss.read_lss(livesplit_vicecity)
+        demo = ss.read_lss(DEMO_SPLITS)
+        corpus = SplitsCorpus.from_splits([vicecity, demo, vicecity], names=["a", "b", "c"])
+
+        for name, splits in [("a", vicecity), ("b", demo)]:
+            partial_runs = splits.to_df(time_type=time_type, allow_partial=True)
+            complete_runs = splits.to_df(time_type=time_type)
+            key = (splits.game_name, splits.category_name, name)
+            assert corpus.sum_of_best(time_type).loc[key] == partial_runs.min(axis=1).sum()
+
+            if complete_runs.shape[1]:
+                board = corpus.leaderboard(time_type).loc[(splits.game_name, splits.category_name)]
+                entry = board.loc[board["file"] == name].iloc[0]
+                assert entry["time"] == complete_runs.sum(axis=0).min()
+                assert entry["run_id"] == complete_runs.sum(axis=0).idxmin()
+
+        percentiles = corpus.segment_percentiles([0.5], time_type=time_type)
+        assert len(percentiles) == len(vicecity.segments) + len(demo.segments)
+
+    def test_read(self, livesplit_vicecity, tmp_path):
+        missing = tmp_path / "missing.lss"
+        corpus = SplitsCorpus.read([livesplit_vicecity, DEMO_SPLITS, missing], executor="thread")
+        assert list(corpus.files.index) == [str(livesplit_vicecity), str(DEMO_SPLITS)]
+        assert [error.path for error in corpus.errors] == [missing]
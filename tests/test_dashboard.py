@@ -0,0 +1,50 @@
+import pytest  # noqa: F401
+import pandas as pd
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+from saltysplits.dashboard import DashboardBundle, lss_digest
+
+
+class TestDashboardBundle:
+    def test_from_bytes(self, livesplit_vicecity):
+        lss_bytes = livesplit_vicecity.read_bytes()
+        bundle = DashboardBundle.from_bytes(lss_bytes)
+        splits = ss.read_lss(livesplit_vicecity)
+
+        assert bundle.digest == lss_digest(lss_bytes)
+        assert (bundle.game_name, bundle.category_name) == (splits.game_name, splits.category_name)
+        assert bundle.attempt_count == splits.attempt_count
+        for time_type in TimeType:
+            assert bundle.summaries[time_type].sum_of_best == splits.summary(time_type).sum_of_best
+            pd.testing.assert_frame_equal(bundle.frame(time_type, allow_partial=True, cumulative=True), splits.to_df(time_type, allow_partial=True, cumulative=True))  # fmt: skip
+
+    def test_frames_are_reused(self, livesplit_vicecity):
+        bundle = DashboardBundle.from_bytes(livesplit_vicecity.read_bytes())
+        frame = bundle.frame(TimeType.REAL_TIME, allow_partial=True)
+        assert bundle.frame(TimeType.REAL_TIME, allow_partial=True) is frame
+        # lss_ns doesn't matter without lss_repr
+        assert bundle.frame(TimeType.REAL_TIME, allow_partial=True, lss_ns=False) is frame
+        assert bundle.frame(TimeType.REAL_TIME, allow_partial=True, lss_repr=True) is not frame
+
+    def test_segment_stats(self, livesplit_vicecity):
+        bundle = DashboardBundle.from_bytes(livesplit_vicecity.read_bytes())
+        df = bundle.frame(TimeType.REAL_TIME, allow_partial=True)
+        stats = bundle.segment_stats[TimeType.REAL_TIME]
+
+        for segment_index, segment_name in enumerate(df.index):
+            segment_times = df.iloc[segment_index].dropna()
+            pd.testing.assert_series_equal(bundle.segment_times(TimeType.REAL_TIME, segment_index), segment_times, check_names=False)  # fmt: skip
+            row = stats.iloc[segment_index]
+            assert row["best"] == segment_times.min()
+            assert row["worst"] == segment_times.max()
+            assert row["worst_run_id"] == segment_times.index[segment_times.argmax()]
+
+    def test_resets(self, livesplit_vicecity):
+        bundle = DashboardBundle.from_bytes(livesplit_vicecity.read_bytes())
+        df = bundle.frame(TimeType.REAL_TIME, allow_partial=True)
+        resets = bundle.resets[TimeType.REAL_TIME]
+
+        partial = df.loc[:, df.isna().any()]
+        expected = partial.isna().idxmax().value_counts()
+        assert dict(zip(resets["Segment"], resets["Count"])) == expected.to_dict()
+        assert bundle.run_times(TimeType.REAL_TIME).equals(df.loc[:, ~df.isna().any()].sum())
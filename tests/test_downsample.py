@@ -0,0 +1,59 @@
+import pytest
+import numpy as np
+import pandas as pd
+from saltysplits.enums import DownsampleMethod
+from saltysplits.downsample import (
+    downsample_indices,
+    downsample_series,
+    lttb_indices,
+    minmax_indices,
+    record_indices,
+)
+
+
+def random_times(n: int, seed: int = 0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    return rng.normal(3600 * 10**9, 300 * 10**9, n).astype(np.int64)
+
+
+class TestDownsample:
+    def test_record_indices(self):
+        values = np.array([5, 7, 4, 4, 6, 2, 3, 1], dtype=np.int64)
+        assert record_indices(values).tolist() == [0, 2, 5, 7]
+        assert record_indices(values[:0]).tolist() == []
+
+    def test_lttb(self):
+        values = random_times(10000)
+        indices = lttb_indices(values, 500)
+        assert len(indices) == 500
+        assert indices[0] == 0 and indices[-1] == len(values) - 1
+        assert np.all(np.diff(indices) > 0)
+        # a single spike is always picked by its bucket
+        values[4321] = 10 * values.max()
+        assert 4321 in lttb_indices(values, 500)
+        assert lttb_indices(values[:10], 20).tolist() == list(range(10))
+
+    def test_minmax(self):
+        values = random_times(10000)
+        indices = minmax_indices(values, 500)
+        assert len(indices) <= 500
+        assert np.all(np.diff(indices) > 0)
+        assert {np.argmin(values), np.argmax(values)} <= set(indices)
+
+    @pytest.mark.parametrize("method", list(DownsampleMethod))
+    def test_downsample_indices(self, method):
+        values = random_times(50000)
+        indices = downsample_indices(values, max_points=1000, method=method, keep=[123])
+        assert len(indices) <= 1000
+        assert np.all(np.diff(indices) > 0)
+        required = {0, len(values) - 1, np.argmin(values), np.argmax(values), 123}
+        assert required | set(record_indices(values)) <= set(indices)
+        assert downsample_indices(values[:100], max_points=1000).tolist() == list(range(100))
+
+    def test_downsample_series(self):
+        values = random_times(5000)
+        series = pd.Series(values.view("timedelta64[ns]"), index=[str(i) for i in range(5000)])
+        sampled = downsample_series(series, max_points=200)
+        assert len(sampled) <= 200
+        assert sampled.min() == series.min() and sampled.max() == series.max()
+        pd.testing.assert_series_equal(sampled, series.loc[sampled.index])
@@ -0,0 +1,59 @@
+import pytest  # noqa: F401
+import pickle
+import numpy as np
+import pandas as pd
+from saltysplits import DEMO_SPLITS
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+from saltysplits.history import CompactHistory, encode_ids
+from .conftest import append_attempt
+
+
+class TestCompactHistory:
+    @pytest.mark.parametrize("lss_path", ["vicecity", DEMO_SPLITS])
+    def test_read_lss_compact(self, livesplit_vicecity, lss_path):
+        lss_path = livesplit_vicecity if lss_path == "vicecity" else lss_path
+        splits = ss.read_lss(lss_path)
+        compact = ss.read_lss(lss_path, compact=True)
+
+        assert compact.is_compact and not splits.is_compact
+        assert compact == splits
+        assert compact.to_xml() == splits.to_xml()
+        for segment, compact_segment in zip(splits.segments, compact.segments):
+            assert list(compact_segment.segment_history) == segment.segment_history
+            assert compact_segment.segment_history[-1] == segment.segment_history[-1]
+            assert compact_segment.segment_history[:3] == segment.segment_history[:3]
+
+        for time_type in TimeType:
+            pd.testing.assert_frame_equal(
+                compact.to_df(time_type=time_type, allow_partial=True, allow_empty=True),
+                splits.to_df(time_type=time_type, allow_partial=True, allow_empty=True),
+            )
+
+    def test_refresh_compact(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path, compact=True)
+        splits.to_df()
+
+        new_id = append_attempt(livesplit_vicecity, lss_path)
+        assert splits.refresh(lss_path) == [new_id]
+        assert splits.is_compact
+        assert splits == ss.read_lss(lss_path)
+        pd.testing.assert_frame_equal(splits.to_df(allow_partial=True), ss.read_lss(lss_path).to_df(allow_partial=True))  # fmt: skip
+
+    def test_from_times(self, livesplit_vicecity):
+        history = ss.read_lss(livesplit_vicecity).segments[0].segment_history
+        compact = CompactHistory.from_times(history)
+        assert compact == history
+        assert compact.ids.dtype == np.int64
+        assert compact.nbytes == 24 * len(history)
+        assert pickle.loads(pickle.dumps(compact)) == compact
+
+        compact.extend(history[:2])
+        assert compact == history + history[:2]
+
+    def test_encode_ids(self):
+        assert encode_ids(["1", "-2", "30"]).dtype == np.int64
+        assert encode_ids(["1", "02"]).dtype == object
+        assert encode_ids(["1", "a"]).tolist() == ["1", "a"]
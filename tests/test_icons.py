@@ -0,0 +1,74 @@
+import pytest  # noqa: F401
+from PIL import Image
+from saltysplits import SaltySplits as ss
+from saltysplits.icons import IconRef, decode_icon, load_icon
+
+
+class TestIcons:
+    def test_read_lss_lazy_icons(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity, lazy_icons=True)
+        eager = ss.read_lss(livesplit_vicecity, lazy_icons=False)
+
+        assert splits.has_lazy_icons and not eager.has_lazy_icons
+        assert not ss.read_lss(livesplit_vicecity).has_lazy_icons
+        assert isinstance(splits.game_icon, IconRef)
+        assert str(splits.game_icon) == eager.game_icon
+        for segment, eager_segment in zip(splits.segments, eager.segments):
+            assert segment.icon == eager_segment.icon
+            assert (segment.icon is None) == (eager_segment.icon is None)
+        assert splits == eager
+        assert splits.to_xml() == eager.to_xml()
+
+        # str interface, through the payload
+        icon, payload = splits.game_icon, eager.game_icon
+        assert len(icon) == len(payload) and icon[:8] == payload[:8]
+        assert icon.startswith(payload[:8]) and icon.encode("ascii") == payload.encode("ascii")
+        assert payload[8:16] in icon and icon + "" == payload and "" + icon == payload
+        assert hash(icon) == hash(payload)
+        with pytest.raises(AttributeError):
+            icon.missing
+
+    def test_load_icon(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity, lazy_icons=True)
+        eager = ss.read_lss(livesplit_vicecity, lazy_icons=False)
+
+        image = load_icon(splits.game_icon)
+        assert isinstance(image, Image.Image)
+        assert image.tobytes() == decode_icon(eager.game_icon).tobytes()
+        assert load_icon(eager.game_icon).tobytes() == image.tobytes()
+        assert max(load_icon(splits.game_icon, size=(16, 16)).size) == 16
+        assert load_icon(None) is None
+
+    def test_stale_icons(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_bytes = livesplit_vicecity.read_bytes()
+        lss_path.write_bytes(lss_bytes)
+        splits = ss.read_lss(lss_path, lazy_icons=True)
+        eager = ss.read_lss(livesplit_vicecity, lazy_icons=False)
+
+        # shifts every icon after the AttemptHistory, as saving another attempt does
+        lss_path.write_bytes(lss_bytes.replace(b"<AttemptHistory>", b'<AttemptHistory>\n    <Attempt id="9999" />', 1))  # fmt: skip
+        assert splits == eager
+        assert splits.to_xml() == eager.to_xml()
+        assert all(segment.icon == eager_segment.icon for segment, eager_segment in zip(splits.segments, eager.segments))  # fmt: skip
+        assert load_icon(splits.segments[-1].icon).tobytes() == decode_icon(eager.segments[-1].icon).tobytes()  # fmt: skip
+        splits.write_lss(tmp_path / "written.lss")
+        assert ss.read_lss(tmp_path / "written.lss", lazy_icons=False) == eager
+
+        # icons whose segment was renamed can't be found again
+        segment = next(segment for segment in splits.segments if segment.icon is not None)
+        name = f"<Name>{segment.name}</Name>".encode("utf-8")
+        lss_path.write_bytes(lss_bytes.replace(name, b"<Name>Renamed</Name>"))
+        with pytest.raises(ValueError):
+            segment.icon.payload()
+        assert str(splits.game_icon) == eager.game_icon
+        splits.refresh(lss_path)
+        assert splits.segments[0].icon == ss.read_lss(lss_path, lazy_icons=False).segments[0].icon
+
+        # the file is gone, serializing raises a ValueError instead of a serialization error
+        lss_path.unlink()
+        with pytest.raises(ValueError, match="no longer exists"):
+            splits.to_xml()
+        with pytest.raises(ValueError, match="no longer exists"):
+            splits.write_lss(tmp_path / "missing.lss")
+        assert not (tmp_path / "missing.lss").exists()
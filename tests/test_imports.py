@@ -0,0 +1,45 @@
+import sys
+import pytest  # noqa: F401
+import subprocess
+from typing import Dict
+
+# importing these is what makes `import saltysplits` slow, so they're only loaded on first use
+HEAVY_MODULES = ["pandas", "numpy", "pydantic", "pydantic_xml", "PIL"]
+
+
+def import_times(statement: str) -> Dict[str, int]:
+    # cumulative import time (us) per module, as reported by python -X importtime
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        times[name.strip()] = int(cumulative)
+    return times
+
+
+class TestImports:
+    def test_lazy_import(self, livesplit_vicecity):
+        times = import_times(f"import saltysplits; saltysplits.read_metadata({str(livesplit_vicecity)!r})")  # fmt: skip
+        assert "saltysplits" in times
+        for module in HEAVY_MODULES:
+            assert module not in times
+
+        eager = import_times("import saltysplits; saltysplits.SaltySplits")
+        assert "pandas" in eager and "pydantic_xml" in eager
+        assert times["saltysplits"] < eager["saltysplits.main"]
+
+    def test_lazy_attributes(self):
+        import saltysplits
+
+        assert saltysplits.SaltySplits.__name__ == "SaltySplits"
+        assert saltysplits.read_lss.__doc__ == saltysplits.SaltySplits.read_lss.__doc__
+        assert {"SaltySplits", "read_lss", "SplitsCorpus", "read_metadata"} <= set(dir(saltysplits))
+        with pytest.raises(AttributeError):
+            saltysplits.missing
@@ -0,0 +1,55 @@
+import pytest  # noqa: F401
+import numpy as np
+import pandas as pd
+from saltysplits import SaltySplits as ss
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.kernels import (
+    best_per_segment,
+    cumulative_times,
+    first_missing,
+    run_totals,
+    sum_of_best,
+    valid_mask,
+)
+
+NAT = NANOSECONDS_NAT
+MATRIX = np.array(
+    [
+        [5, 3, NAT, NAT],
+        [2, NAT, NAT, 4],
+        [1, 7, NAT, 6],
+    ],
+    dtype=np.int64,
+)
+
+
+class TestKernels:
+    def test_cumulative_times(self, livesplit_vicecity):
+        np.testing.assert_array_equal(
+            cumulative_times(MATRIX),
+            [[5, 3, NAT, NAT], [7, NAT, NAT, NAT], [8, NAT, NAT, NAT]],
+        )
+
+        matrix = ss.read_lss(livesplit_vicecity).columns.real_time
+        expected = pd.DataFrame(matrix.view("timedelta64[ns]")).apply(lambda column: column.cumsum(skipna=False))  # fmt: skip
+        np.testing.assert_array_equal(cumulative_times(matrix), expected.to_numpy().view(np.int64))
+
+    def test_first_missing(self):
+        valid = valid_mask(MATRIX)
+        np.testing.assert_array_equal(first_missing(valid), [-1, 1, 0, 0])
+        np.testing.assert_array_equal(first_missing(valid[:0]), [-1, -1, -1, -1])
+
+    def test_totals_and_best(self):
+        totals, playtime = run_totals(MATRIX)
+        np.testing.assert_array_equal(totals, [8, NAT, NAT, NAT])
+        np.testing.assert_array_equal(playtime, [8, 10, 0, 10])
+
+        best, positions = best_per_segment(MATRIX)
+        np.testing.assert_array_equal(best, [3, 2, 1])
+        np.testing.assert_array_equal(positions, [1, 0, 0])
+        assert sum_of_best(MATRIX) == 6
+
+        best, positions = best_per_segment(MATRIX[:, 2:3])
+        np.testing.assert_array_equal(best, [NAT, NAT, NAT])
+        np.testing.assert_array_equal(positions, [-1, -1, -1])
+        assert sum_of_best(MATRIX[:, :0]) == 0
@@ -1,8 +1,13 @@
 import pytest  # noqa: F401
+import itertools
 import numpy as np
+import pandas as pd
 import lxml.etree as ET
 from saltysplits import SaltySplits as ss
 from saltysplits.enums import TimeType
+from saltysplits.stream import read_lss_columns
+from saltysplits.annotations import encode_time
+from .conftest import append_attempt
     
 class TestSaltySplits:
     def test_read_lss(self, livesplit_vicecity):
@@ -23,6 +28,16 @@ class TestSaltySplits:
         )
         assert set(splits_df.columns) == set(splits._collect_ids())
 
+    def test_to_df_model_edits(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        splits_df = splits.to_df(allow_partial=True)
+        splits.columns
+        splits.segments[0].segment_history = None
+        # built from the models on every call, not from the cached columns
+        assert splits.to_df(allow_partial=True).iloc[0].isna().all()
+        assert not splits_df.iloc[0].isna().all()
+        pd.testing.assert_frame_equal(splits.columns.to_df(allow_partial=True), splits_df)
+
     def test_to_df_cumulative(self, livesplit_vicecity):
         splits = ss.read_lss(livesplit_vicecity)
         cumulative_splits = splits.to_df(
@@ -41,6 +56,134 @@ class TestSaltySplits:
         
         assert np.array_equal(cumulative_splits.iloc[-1, :].values, isolated_splits.sum().values )
 
+    @pytest.mark.parametrize("time_type", list(TimeType))
+    def test_to_df_matches_reference(self, livesplit_vicecity, time_type):
+        splits = ss.read_lss(livesplit_vicecity)
+
+        # reference implementation, assigns one split at a time through label-based indexing
+        run_ids = splits._collect_ids()
+        segment_names = [segment.name for segment in splits.segments]
+        reference_data = np.full((len(segment_names), len(run_ids)), np.timedelta64("NaT", "ns"))
+        reference_df = pd.DataFrame(reference_data, columns=run_ids, index=segment_names)
+        for segment in splits.segments:
+            for split in segment.segment_history:
+                time = split.game_time if time_type == TimeType.GAME_TIME else split.real_time
+                reference_df.loc[segment.name, split.id] = time
+
+        for allow_partial, allow_empty, cumulative in itertools.product([False, True], repeat=3):
+            expected_df = reference_df
+            if not allow_partial:
+                expected_df = expected_df.loc[:, ~expected_df.isna().any()]
+            if not allow_empty:
+                expected_df = expected_df.loc[:, ~expected_df.isna().all()]
+            if cumulative:
+                expected_df = expected_df.apply(lambda column: column.cumsum(skipna=False))
+
+            splits_df = splits.to_df(
+                time_type=time_type,
+                allow_partial=allow_partial,
+                allow_empty=allow_empty,
+                cumulative=cumulative,
+            )
+            pd.testing.assert_frame_equal(splits_df, expected_df)
+
+    @pytest.mark.parametrize("lss_ns", [True, False])
+    def test_to_df_lss_repr(self, livesplit_vicecity, lss_ns):
+        splits = ss.read_lss(livesplit_vicecity)
+        for allow_partial, cumulative in itertools.product([False, True], repeat=2):
+            splits_df = splits.to_df(allow_partial=allow_partial, cumulative=cumulative)
+            expected_df = splits_df.map(lambda x: encode_time(x, include_ns=lss_ns) if pd.notna(x) else None)  # fmt: skip
+            lss_df = splits.to_df(
+                allow_partial=allow_partial, cumulative=cumulative, lss_repr=True, lss_ns=lss_ns
+            )
+            pd.testing.assert_frame_equal(lss_df, expected_df)
+
+    def test_refresh(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+        splits.to_df()
+
+        new_id = append_attempt(livesplit_vicecity, lss_path)
+        assert splits.refresh(lss_path) == [new_id]
+        assert splits.refresh(lss_path) == []
+
+        reloaded = ss.read_lss(lss_path)
+        assert splits == reloaded
+        for time_type in TimeType:
+            pd.testing.assert_frame_equal(
+                splits.to_df(time_type=time_type, allow_partial=True),
+                reloaded.to_df(time_type=time_type, allow_partial=True),
+            )
+
+    def test_refresh_reordered(self, livesplit_vicecity, tmp_path):
+        splits = ss.read_lss(livesplit_vicecity)
+        splits.to_df()
+
+        tree = ET.parse(livesplit_vicecity)
+        segments = tree.getroot().find("Segments")
+        segments.insert(0, segments[-1])
+        lss_path = tmp_path / "splits.lss"
+        tree.write(lss_path, encoding="utf-8", xml_declaration=True)
+
+        assert splits.refresh(lss_path) == []
+        reloaded = ss.read_lss(lss_path)
+        assert splits == reloaded
+        pd.testing.assert_frame_equal(splits.to_df(allow_partial=True), reloaded.to_df(allow_partial=True))  # fmt: skip
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_refresh_changed_runs(self, livesplit_vicecity, tmp_path, compact):
+        lss_path = tmp_path / "splits.lss"
+        tree = ET.parse(livesplit_vicecity)
+        histories = [history for history in tree.getroot().iter("SegmentHistory") if len(history) > 1]  # fmt: skip
+
+        # a Time removed from a single segment, its run ID is still in the other segments
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path, compact=compact)
+        splits.to_df()
+        removed = histories[0][0].get("id")
+        histories[0].remove(histories[0][0])
+        tree.write(lss_path, encoding="utf-8", xml_declaration=True)
+        assert splits.refresh(lss_path) == []
+        assert removed in splits._collect_ids()
+        assert splits == ss.read_lss(lss_path)
+        pd.testing.assert_frame_equal(splits.to_df(allow_partial=True), ss.read_lss(lss_path).to_df(allow_partial=True))  # fmt: skip
+
+        # an edited Time of a known run
+        histories[1][0].find("RealTime").text = "00:00:01.2345670"
+        tree.write(lss_path, encoding="utf-8", xml_declaration=True)
+        assert splits.refresh(lss_path) == []
+        assert splits == ss.read_lss(lss_path)
+        pd.testing.assert_frame_equal(splits.columns.to_df(allow_partial=True), ss.read_lss(lss_path).to_df(allow_partial=True))  # fmt: skip
+
+    def test_refresh_model_edits(self, livesplit_vicecity, tmp_path):
+        # known runs come from the models, not from the cached columns
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+        splits.columns
+        splits.attempt_history.pop()
+        splits.segments[0].segment_history[0].real_time = None
+
+        new_id = append_attempt(lss_path, lss_path)
+        assert splits.refresh(lss_path) == [new_id]
+        reloaded = ss.read_lss(lss_path)
+        assert splits == reloaded
+        pd.testing.assert_frame_equal(splits.columns.to_df(allow_partial=True), reloaded.to_df(allow_partial=True))  # fmt: skip
+
+    def test_attempts_to_df(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        attempts = splits.attempts_to_df()
+        assert attempts.index.to_list() == [attempt.id for attempt in splits.attempt_history]
 
+        for attempt, (_, row) in zip(splits.attempt_history, attempts.iterrows()):
+            assert row["started"] == pd.Timestamp(attempt.started) if attempt.started else pd.isna(row["started"])  # fmt: skip
+            assert row["real_time"] == attempt.real_time or (attempt.real_time is None and pd.isna(row["real_time"]))  # fmt: skip
+            assert row["started_synced"] is attempt.is_started_synced or (attempt.is_started_synced is None and row["started_synced"] is pd.NA)  # fmt: skip
+        valid = attempts["started"].notna() & attempts["ended"].notna()
+        assert (attempts.loc[valid, "duration"] == attempts.loc[valid, "ended"] - attempts.loc[valid, "started"]).all()  # fmt: skip
 
-        
\ No newline at end of file
+        # joins with the runs of to_df on the index
+        runs = splits.to_df(allow_partial=True).T.join(attempts, how="inner")
+        assert len(runs) == len(set(splits.to_df(allow_partial=True).columns) & set(attempts.index))
+        pd.testing.assert_frame_equal(attempts, read_lss_columns(livesplit_vicecity).attempts_to_df())  # fmt: skip
@@ -0,0 +1,23 @@
+import io
+import pytest  # noqa: F401
+from saltysplits import SaltySplits as ss
+from saltysplits.metadata import read_metadata
+
+
+class TestMetadata:
+    def test_read_metadata(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        metadata = read_metadata(livesplit_vicecity)
+
+        assert metadata.version == splits.version
+        assert metadata.game_name == splits.game_name
+        assert metadata.category_name == splits.category_name
+        assert metadata.layout_path == splits.layout_path
+        assert metadata.attempt_count == splits.attempt_count
+        assert metadata.offset == "00:00:00"
+        assert metadata.segment_names == [segment.name for segment in splits.segments]
+
+    def test_read_metadata_without_segments(self, livesplit_vicecity):
+        metadata = read_metadata(io.BytesIO(livesplit_vicecity.read_bytes()), segments=False)
+        assert metadata.segment_names is None
+        assert metadata._replace(segment_names=None) == read_metadata(livesplit_vicecity)._replace(segment_names=None)  # fmt: skip
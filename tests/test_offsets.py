@@ -0,0 +1,38 @@
+import pytest
+from saltysplits import SaltySplits as ss
+from saltysplits.offsets import INDEX_SUFFIX, index_lss, load_attempts, load_history, load_segment
+from .conftest import append_attempt
+
+
+class TestOffsets:
+    def test_load_segment(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path, lazy_icons=False)
+
+        for i, segment in enumerate(splits.segments):
+            assert load_segment(lss_path, i) == segment
+            assert load_history(lss_path, segment.name) == (segment.segment_history or [])
+        assert load_segment(lss_path, splits.segments[-1].name) == load_segment(lss_path, -1)
+        assert load_attempts(lss_path) == splits.attempt_history
+        with pytest.raises(KeyError):
+            load_segment(lss_path, "missing")
+        with pytest.raises(IndexError):
+            load_segment(lss_path, len(splits.segments))
+
+    def test_sidecar(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        offsets = index_lss(lss_path)
+        assert (tmp_path / f"splits.lss{INDEX_SUFFIX}").exists()
+        assert index_lss(lss_path) == offsets
+
+        # sidecars of files that changed since are rebuilt
+        new_id = append_attempt(livesplit_vicecity, lss_path)
+        assert index_lss(lss_path) != offsets
+        assert load_attempts(lss_path)[-1].id == new_id
+        assert load_segment(lss_path, 0).segment_history[-1].id == new_id
+
+        index_path = tmp_path / "elsewhere.json"
+        assert index_lss(lss_path, index_path=index_path) == index_lss(lss_path)
+        assert index_path.exists()
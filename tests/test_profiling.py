@@ -0,0 +1,66 @@
+import pytest  # noqa: F401
+import logging
+from saltysplits import SaltySplits as ss
+from saltysplits.profiling import _NULL_PHASE, add_hook, log_phase, phase, profile, remove_hook
+
+
+class TestProfiling:
+    def test_read_lss_phases(self, livesplit_vicecity):
+        with profile() as recorded:
+            splits = ss.read_lss(livesplit_vicecity, lazy_icons=True)
+        names = [record.name for record in recorded.records]
+        assert names[-1] == "read_lss"
+        for name in ["read_lss.read", "read_lss.strip_icons", "read_lss.parse", "read_lss.extract", "read_lss.validate"]:  # fmt: skip
+            assert name in names
+
+        records = {record.name: record for record in recorded.records}
+        assert records["read_lss.read"].count == livesplit_vicecity.stat().st_size
+        assert records["read_lss.parse"].count > len(splits.segments)
+        assert records["read_lss.parse"].depth == 1 and records["read_lss"].depth == 0
+        assert records["read_lss"].duration >= records["read_lss.validate"].duration
+        assert all(record.peak_bytes is None for record in recorded.records)
+
+    def test_from_xml_and_to_df_phases(self, livesplit_vicecity):
+        with profile() as recorded:
+            splits = ss.from_xml(livesplit_vicecity.read_bytes())
+            df = splits.to_df(allow_partial=True)
+        names = [record.name for record in recorded.records]
+        assert names[:3] == ["from_xml.parse", "from_xml.validate", "from_xml"]
+        assert "to_df.to_columns.time_matrix" in names
+        assert recorded.to_records()[-1]["name"] == "to_df"
+        assert recorded.to_records()[-2]["name"] == "to_df.frame"
+        assert recorded.to_records()[-2]["count"] == df.size
+
+        # the models may have changed, so a second call builds the columns again
+        with profile() as recorded:
+            splits.to_df()
+        names = [record.name for record in recorded.records]
+        assert names[0] == "to_df.to_columns.run_index" and names[-2:] == ["to_df.frame", "to_df"]
+
+    def test_disabled(self):
+        assert phase("read_lss") is _NULL_PHASE
+        with phase("read_lss") as disabled:
+            disabled.count = 1
+            assert not disabled.active and disabled.count is None
+
+    def test_memory(self, livesplit_vicecity):
+        with profile(memory=True) as recorded:
+            ss.read_lss(livesplit_vicecity)
+        records = {record.name: record for record in recorded.records}
+        assert all(record.peak_bytes >= 0 for record in recorded.records)
+        assert records["read_lss"].peak_bytes >= records["read_lss.validate"].peak_bytes > 0
+
+    def test_hooks(self, livesplit_vicecity, caplog):
+        received = []
+        add_hook(received.append)
+        add_hook(log_phase)
+        try:
+            with caplog.at_level(logging.INFO, logger="saltysplits.profiling"):
+                ss.read_lss(livesplit_vicecity)
+        finally:
+            remove_hook(received.append)
+            remove_hook(log_phase)
+
+        assert received[-1].name == "read_lss"
+        assert [log.saltysplits_phase["name"] for log in caplog.records] == [record.name for record in received]  # fmt: skip
+        assert phase("read_lss") is _NULL_PHASE
@@ -0,0 +1,81 @@
+import pytest
+import numpy as np
+import pandas as pd
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+from saltysplits.rolling import RollingStats
+from saltysplits.constants import NANOSECONDS_NAT
+from .conftest import append_attempt
+
+STATISTICS = ["mean", "minimum", "best", "quantile_values"]
+
+
+def assert_stats_equal(stats: RollingStats, other: RollingStats) -> None:
+    assert stats.run_ids == other.run_ids
+    for statistic in STATISTICS:
+        np.testing.assert_array_equal(getattr(stats, statistic), getattr(other, statistic))
+
+
+class TestRolling:
+    @pytest.mark.parametrize("window", [1, 5, 50])
+    def test_matches_pandas(self, livesplit_vicecity, window):
+        splits = ss.read_lss(livesplit_vicecity)
+        matrix = splits.columns.real_time
+        stats = splits.rolling(window=window, quantiles=(0.1, 0.9))
+
+        # every segment and the run totals (last row) over their own values only
+        totals = splits.summary().run_totals
+        for i, row in enumerate(list(matrix) + [totals]):
+            values = pd.Series(row)[row != NANOSECONDS_NAT].astype(np.float64)
+            rolling = values.rolling(window, min_periods=1)
+            np.testing.assert_allclose(stats.mean[i, values.index], rolling.mean())
+            np.testing.assert_allclose(stats.values("median")[i, values.index], rolling.median())
+            np.testing.assert_allclose(stats.values(0.9)[i, values.index], rolling.quantile(0.9))
+            np.testing.assert_array_equal(stats.minimum[i, values.index], rolling.min())
+            np.testing.assert_array_equal(stats.best[i, values.index], values.cummin())
+            assert np.isnan(stats.mean[i, row == NANOSECONDS_NAT]).all()
+
+        # cached on the columns, the median is always tracked so () and (0.5,) share a single entry
+        cached_stats = splits.columns.rolling(window=window, quantiles=(0.9, 0.1))
+        assert splits.columns.rolling(window=window, quantiles=(0.1, 0.9)) is cached_stats
+        assert_stats_equal(cached_stats, stats)
+        median_stats = splits.columns.rolling(window=window, quantiles=(0.5,))
+        assert splits.columns.rolling(window=window, quantiles=()) is median_stats
+        assert len(splits.columns._rolling) == 2
+        rolling_df = stats.to_df("minimum")
+        assert rolling_df.shape == (len(splits.segments), len(splits.columns.run_ids))
+        assert stats.totals("best").dropna().is_monotonic_decreasing
+
+    def test_append(self, livesplit_vicecity):
+        columns = ss.read_lss(livesplit_vicecity).columns
+        stats = RollingStats.from_matrix(columns.game_time, columns.segment_names, columns.run_ids, window=7, quantiles=(0.25,))  # fmt: skip
+        for split in [0, 1, len(columns.run_ids) // 2, len(columns.run_ids)]:
+            head = RollingStats.from_matrix(columns.game_time[:, :split], columns.segment_names, columns.run_ids[:split], window=7, quantiles=(0.25,))  # fmt: skip
+            appended = head.append(columns.game_time[:, split:], columns.run_ids[split:])
+            assert_stats_equal(appended, stats)
+            # appending leaves the original as is
+            assert head.mean.shape[1] == split
+
+    def test_refresh(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+        splits.columns.rolling(TimeType.GAME_TIME, window=3)
+
+        new_id = append_attempt(livesplit_vicecity, lss_path)
+        splits.refresh(lss_path)
+        assert len(splits.columns._rolling) == 1
+        # continued from the cached windows, same as building it from scratch
+        stats = splits.columns.rolling(TimeType.GAME_TIME, window=3)
+        assert_stats_equal(stats, splits.rolling(TimeType.GAME_TIME, window=3))
+        assert stats.run_ids[-1] == new_id
+        assert_stats_equal(stats, RollingStats.from_matrix(splits.columns.game_time, splits.columns.segment_names, splits.columns.run_ids, window=3))  # fmt: skip
+
+    def test_invalid(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        with pytest.raises(ValueError):
+            splits.rolling(window=0)
+        with pytest.raises(ValueError):
+            splits.rolling(quantiles=(1.5,))
+        with pytest.raises(KeyError):
+            splits.rolling().values(0.9)
@@ -0,0 +1,74 @@
+import pytest
+import numpy as np
+from saltysplits import SaltySplits as ss
+from saltysplits.runs import RunIndex
+from .conftest import append_attempt
+
+
+class TestRuns:
+    def test_run_index(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        index = splits.run_index
+
+        assert index is splits.run_index
+        assert index.run_ids == splits._collect_ids() == splits.columns.run_ids
+        assert [index.run_positions[run_id] for run_id in index.run_ids] == list(range(len(index.run_ids)))  # fmt: skip
+        for attempt in splits.attempt_history:
+            assert splits.attempt_history[index.attempt_positions[attempt.id]] is attempt
+
+    @pytest.mark.parametrize("compact", [False, True])
+    def test_get_run(self, livesplit_vicecity, compact):
+        splits = ss.read_lss(livesplit_vicecity, compact=compact)
+        columns = splits.columns
+
+        for run_id in [columns.run_ids[0], columns.run_ids[-1], splits.summary().best_run_id]:
+            run = splits.get_run(run_id)
+            position = columns.run_ids.index(run_id)
+            assert run.id == run_id
+            assert run.attempt is None or run.attempt.id == run_id
+            np.testing.assert_array_equal(run.real_time, columns.real_time[:, position])
+            np.testing.assert_array_equal(run.game_time, columns.game_time[:, position])
+            assert all(split is None or split.id == run_id for split in run.splits)
+
+        assert splits.get_run(splits.attempt_history[-1].id).attempt is splits.attempt_history[-1]
+        assert [run.id for run in splits.runs(columns.run_ids[:3])] == columns.run_ids[:3]
+        with pytest.raises(KeyError):
+            splits.get_run("missing")
+
+    def test_refresh_run_index(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+        splits.run_index
+
+        new_id = append_attempt(livesplit_vicecity, lss_path)
+        splits.refresh(lss_path)
+        rebuilt = RunIndex.from_splits(splits)
+        assert splits.run_index.run_ids == rebuilt.run_ids
+        assert splits.run_index.run_positions == rebuilt.run_positions
+        assert splits.run_index.attempt_positions == rebuilt.attempt_positions
+        assert splits.run_index.segment_positions == rebuilt.segment_positions
+        assert splits.get_run(new_id).attempt is splits.attempt_history[-1]
+
+        splits.reset_columns()
+        assert "run_index" not in splits.__dict__
+
+    def test_stale_run_index(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        index = splits.run_index
+        first, second, last = splits.attempt_history[0].id, splits.attempt_history[1].id, splits.attempt_history[-1].id  # fmt: skip
+
+        # every later Attempt moves up a position
+        splits.attempt_history.pop(0)
+        with pytest.raises(ValueError):
+            index.run(splits, second)
+        assert splits.get_run(second).attempt is splits.attempt_history[0]
+        assert splits.run_index is not index
+        assert splits.get_run(last).attempt is splits.attempt_history[-1]
+        assert splits.get_run(first).attempt is None
+
+        # same for a Time removed from a single segment
+        history = splits.segments[0].segment_history
+        removed = history.pop(0).id
+        run = splits.runs([removed, history[0].id])
+        assert run[0].splits[0] is None and run[1].splits[0] is history[0]
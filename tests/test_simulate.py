@@ -0,0 +1,83 @@
+import pytest
+import numpy as np
+from saltysplits import SaltySplits as ss
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.simulate import BATCH_RUNS, PBSimulator
+
+SECOND = 10**9
+
+
+class TestSimulate:
+    def test_whole_runs(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        summary = splits.summary()
+        simulation = splits.simulate(n_runs=10_000)
+
+        assert simulation.finish_times.shape == (10_000,)
+        assert simulation.pb_time == summary.best_run_time
+        # every simulated run is a sum of gold-or-slower segments
+        assert (simulation.finish_times >= summary.sum_of_best).all()
+        assert 0.0 <= simulation.pb_probability < 1.0
+        low, median, high = simulation.quantiles((0.1, 0.5, 0.9))
+        assert low <= median <= high
+        counts, edges = simulation.histogram(bins=20)
+        assert counts.sum() == 10_000 and len(edges) == 21
+
+    def test_seeded(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        n_runs = 2 * BATCH_RUNS + 10
+        simulation = splits.simulate(n_runs=n_runs, seed=1)
+        np.testing.assert_array_equal(splits.simulate(n_runs=n_runs, seed=1).finish_times, simulation.finish_times)  # fmt: skip
+        # batches have their own seeds, so spreading them over processes gives the same runs
+        pooled = splits.simulate(n_runs=n_runs, seed=1, workers=2)
+        np.testing.assert_array_equal(pooled.finish_times, simulation.finish_times)
+        assert not np.array_equal(splits.simulate(n_runs=n_runs, seed=2).finish_times, simulation.finish_times)  # fmt: skip
+
+    def test_conditional(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        columns = splits.columns
+        last = len(columns.segment_names) - 1
+        pb_time = splits.summary().best_run_time
+        last_splits = columns.real_time[last][columns.real_time[last] != NANOSECONDS_NAT]
+
+        # only the last segment is left, so finish times are elapsed plus one of its splits
+        elapsed = pb_time - int(np.median(last_splits))
+        simulation = splits.simulate(completed=last, elapsed=elapsed, n_runs=5_000)
+        assert np.isin(simulation.finish_times - elapsed, last_splits).all()
+        assert simulation.pb_probability == pytest.approx(np.mean(last_splits < pb_time - elapsed), abs=0.05)  # fmt: skip
+
+        # far ahead of or behind PB
+        assert splits.simulate(completed=last, elapsed=0, n_runs=100).pb_probability == 1.0
+        assert splits.simulate(completed=last, elapsed=pb_time, n_runs=100).pb_probability == 0.0
+
+        # nothing left to simulate
+        finished = splits.simulate(completed=last + 1, elapsed=pb_time - SECOND, n_runs=10)
+        assert (finished.finish_times == pb_time - SECOND).all()
+        assert finished.pb_probability == 1.0
+
+    def test_half_life(self):
+        # one segment that got 10 seconds faster halfway through
+        matrix = np.array([[20 * SECOND] * 50 + [10 * SECOND] * 50], dtype=np.int64)
+        uniform = PBSimulator.from_matrix(matrix, ["Segment"], pb_time=15 * SECOND)
+        recent = PBSimulator.from_matrix(matrix, ["Segment"], pb_time=15 * SECOND, half_life=5)
+        assert uniform.run(n_runs=10_000).pb_probability == pytest.approx(0.5, abs=0.05)
+        assert recent.run(n_runs=10_000).pb_probability > 0.99
+
+        # no PB yet
+        assert PBSimulator.from_matrix(matrix, ["Segment"]).run(n_runs=10).pb_probability == 1.0
+
+    def test_invalid(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        segments = len(splits.segments)
+        with pytest.raises(ValueError):
+            splits.simulate(n_runs=0)
+        with pytest.raises(ValueError):
+            splits.simulate(completed=segments + 1)
+        with pytest.raises(ValueError):
+            splits.simulate(half_life=0)
+
+        matrix = np.array([[SECOND, SECOND], [NANOSECONDS_NAT, NANOSECONDS_NAT]], dtype=np.int64)
+        simulator = PBSimulator.from_matrix(matrix, ["First", "Second"])
+        with pytest.raises(ValueError, match="Second"):
+            simulator.run(n_runs=10)
+        assert (simulator.run(completed=2, elapsed=SECOND, n_runs=10).finish_times == SECOND).all()
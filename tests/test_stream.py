@@ -0,0 +1,47 @@
+import pytest  # noqa: F401
+import itertools
+import numpy as np
+import pandas as pd
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+from saltysplits.stream import iter_lss, read_lss_columns, read_lss_frame
+
+
+class TestStream:
+    def test_iter_lss(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        records = list(iter_lss(livesplit_vicecity))
+        header = {tag: payload for tag, payload in records if isinstance(payload, str)}
+        attempts = [payload for tag, payload in records if tag == "Attempt"]
+        segments = [payload for tag, payload in records if tag == "Segment"]
+
+        assert header["GameName"] == splits.game_name
+        assert header["CategoryName"] == splits.category_name
+        assert [attempt.id for attempt in attempts] == [attempt.id for attempt in splits.attempt_history]  # fmt: skip
+        assert [segment.name for segment in segments] == [segment.name for segment in splits.segments]  # fmt: skip
+        for record, segment in zip(segments, splits.segments):
+            assert record.ids == [split.id for split in segment.segment_history]
+
+    def test_read_lss_columns(self, livesplit_vicecity):
+        model_columns = ss.read_lss(livesplit_vicecity).to_columns()
+        stream_columns = read_lss_columns(livesplit_vicecity)
+
+        for name, value in vars(model_columns).items():
+            if isinstance(value, np.ndarray):
+                assert np.array_equal(value, getattr(stream_columns, name), equal_nan=value.dtype.kind == "M")  # fmt: skip
+            else:
+                assert value == getattr(stream_columns, name)
+
+    @pytest.mark.parametrize("time_type", list(TimeType))
+    def test_read_lss_frame(self, livesplit_vicecity, time_type):
+        splits = ss.read_lss(livesplit_vicecity)
+        for flags in itertools.product([False, True], repeat=4):
+            allow_partial, allow_empty, cumulative, lss_repr = flags
+            kwargs = dict(
+                time_type=time_type,
+                allow_partial=allow_partial,
+                allow_empty=allow_empty,
+                cumulative=cumulative,
+                lss_repr=lss_repr,
+            )
+            pd.testing.assert_frame_equal(read_lss_frame(livesplit_vicecity, **kwargs), splits.to_df(**kwargs))  # fmt: skip
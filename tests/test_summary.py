@@ -0,0 +1,82 @@
+import pytest  # noqa: F401
+import numpy as np
+import pandas as pd
+from pandas import Timedelta
+from saltysplits import DEMO_SPLITS
+from saltysplits import SaltySplits as ss
+from saltysplits.enums import TimeType
+from saltysplits.constants import NANOSECONDS_NAT
+from saltysplits.summary import RunSummary
+
+
+class TestRunSummary:
+    @pytest.mark.parametrize("time_type", list(TimeType))
+    @pytest.mark.parametrize("lss_path", ["vicecity", DEMO_SPLITS])
+    def test_matches_pandas(self, livesplit_vicecity, lss_path, time_type):
+        splits = ss.read_lss(livesplit_vicecity if lss_path == "vicecity" else lss_path)
+        summary = splits.summary(time_type)
+        partial_runs = splits.to_df(time_type=time_type, allow_partial=True, allow_empty=True)
+        complete_runs = splits.to_df(time_type=time_type)
+        run_times = complete_runs.sum(axis=0)
+        best_segments = partial_runs.min(axis=1)
+
+        assert Timedelta(summary.sum_of_best) == best_segments.sum()
+        assert Timedelta(summary.life_playtime) == partial_runs.sum(axis=0).sum()
+        assert (summary.reset_indices == -1).sum() == complete_runs.shape[1]
+        pd.testing.assert_series_equal(
+            summary.top_k(3), run_times.sort_values(kind="stable").head(3), check_names=False
+        )
+
+        if complete_runs.shape[1]:
+            assert summary.best_run_id == run_times.idxmin()
+            assert Timedelta(summary.best_run_time) == run_times.min()
+            timesave = (complete_runs[run_times.idxmin()] - best_segments).sum()
+            assert Timedelta(summary.possible_timesave) == timesave
+        else:
+            assert summary.best_run_id is None
+            assert summary.possible_timesave == NANOSECONDS_NAT
+
+        stats = summary.segment_stats()
+        pd.testing.assert_series_equal(stats["best"], best_segments, check_names=False)
+        np.testing.assert_array_equal(stats["count"], partial_runs.notna().sum(axis=1))
+        expected_mean = partial_runs.mean(axis=1).round("ns")
+        assert (stats["mean"] - expected_mean).abs().max() <= Timedelta(1) or expected_mean.isna().all()  # fmt: skip
+
+    def test_pb_progression(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        run_times = splits.to_df(TimeType.REAL_TIME).sum(axis=0)
+        expected = run_times[run_times < run_times.cummin().shift(1, fill_value=Timedelta.max)]
+        pd.testing.assert_series_equal(splits.summary().pb_progression(), expected, check_names=False)  # fmt: skip
+
+    def test_cached(self, livesplit_vicecity):
+        splits = ss.read_lss(livesplit_vicecity)
+        summary = splits.columns.summary()
+        assert splits.columns.summary() is summary
+        assert splits.columns.summary(TimeType.GAME_TIME) is not summary
+        assert splits.summary() is summary
+        assert splits.summary(TimeType.GAME_TIME) is splits.columns.summary(TimeType.GAME_TIME)
+
+        splits.reset_columns()
+        assert splits.columns.summary() is not summary
+
+    def test_model_edits(self, livesplit_vicecity):
+        # summaries are cached, edits of the models are included once the run index is dropped
+        splits = ss.read_lss(livesplit_vicecity)
+        summary = splits.summary()
+        splits.attempt_history = splits.attempt_history[:5]
+        for segment in splits.segments:
+            segment.segment_history = [time for time in segment.segment_history if int(time.id) <= 5]
+        run_count = len(splits._collect_ids())
+        assert splits.summary() is summary and len(summary.run_totals) > run_count
+        splits.reset_columns()
+        assert len(splits.summary().run_totals) == run_count
+
+    def test_empty(self):
+        matrix = np.full((2, 3), NANOSECONDS_NAT, dtype=np.int64)
+        summary = RunSummary.from_matrix(matrix, ["a", "b"], ["1", "2", "3"])
+        assert summary.empty.all()
+        assert summary.sum_of_best == 0
+        assert summary.best_run_time == NANOSECONDS_NAT
+        np.testing.assert_array_equal(summary.reset_indices, [0, 0, 0])
+        assert summary.segment_stats()["best"].isna().all()
+
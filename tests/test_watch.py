@@ -0,0 +1,61 @@
+import pytest  # noqa: F401
+import asyncio
+from saltysplits import SaltySplits as ss
+from saltysplits.watch import SplitsWatcher
+from .conftest import append_attempt
+
+
+async def next_update(subscription, timeout: float = 10.0):
+    return await asyncio.wait_for(subscription.__anext__(), timeout)
+
+
+class TestWatch:
+    def test_watch(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+
+        async def main():
+            watcher = SplitsWatcher([lss_path, tmp_path / "missing.lss"], interval=0.01, debounce=0.0)
+            subscription = watcher.subscribe()
+            async with watcher:
+                update = await next_update(subscription)
+                assert update.path == lss_path and update.error is None
+                assert update.attempt_count == splits.attempt_count
+                assert update.best_run_time == splits.summary().best_run_time
+                assert update.sum_of_best == splits.summary().sum_of_best
+
+                append_attempt(livesplit_vicecity, lss_path)
+                update = await next_update(subscription)
+                assert update.attempt_count == splits.attempt_count + 1
+            assert [update async for update in subscription] == []
+
+        asyncio.run(main())
+
+    def test_watch_debounce(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes()[:1000])
+
+        async def main():
+            watcher = SplitsWatcher([lss_path], interval=0.01, debounce=0.0)
+            subscription = watcher.subscribe()
+            await watcher.poll()
+            # a file that keeps changing isn't read
+            lss_path.write_bytes(livesplit_vicecity.read_bytes()[:2000])
+            await watcher.poll()
+            assert subscription._queue.empty()
+
+            await watcher.poll()
+            update = await next_update(subscription)
+            assert update.error is not None and update.stamp[0] == 2000
+
+            # errors aren't retried until the file changes again
+            await watcher.poll()
+            lss_path.write_bytes(livesplit_vicecity.read_bytes())
+            await watcher.poll()
+            await watcher.poll()
+            update = await next_update(subscription)
+            assert update.error is None and update.summary is not None
+            await watcher.stop()
+
+        asyncio.run(main())
@@ -0,0 +1,57 @@
+import pytest  # noqa: F401
+import lxml.etree as ET
+from saltysplits import DEMO_SPLITS
+from saltysplits import SaltySplits as ss
+from saltysplits import writer
+
+
+class TestWriteLss:
+    @pytest.mark.parametrize("lss_path", ["vicecity", DEMO_SPLITS])
+    def test_round_trip(self, livesplit_vicecity, lss_path, tmp_path):
+        lss_path = livesplit_vicecity if lss_path == "vicecity" else lss_path
+        splits = ss.read_lss(lss_path)
+        lss_dst = tmp_path / "splits.lss"
+        splits.write_lss(lss_dst, source=lss_path)
+
+        assert ss.read_lss(lss_dst) == splits
+        # same document as LiveSplit writes, apart from lxml's self-closing tags
+        expected = lss_path.read_text(encoding="utf-8-sig").replace(" />", "/>")
+        assert lss_dst.read_text(encoding="utf-8-sig") == expected
+
+    def test_small_chunks(self, livesplit_vicecity, tmp_path, monkeypatch):
+        monkeypatch.setattr(writer, "WRITE_CHUNK", 7)
+        splits = ss.read_lss(livesplit_vicecity, compact=True)
+        lss_dst = tmp_path / "splits.lss"
+        splits.write_lss(lss_dst, source=livesplit_vicecity)
+        assert ss.read_lss(lss_dst, lazy_icons=False) == ss.read_lss(livesplit_vicecity, lazy_icons=False)  # fmt: skip
+
+    def test_overwrite_source(self, livesplit_vicecity, tmp_path):
+        lss_path = tmp_path / "splits.lss"
+        lss_path.write_bytes(livesplit_vicecity.read_bytes())
+        splits = ss.read_lss(lss_path)
+        splits.attempt_history = splits.attempt_history[:10]
+        splits.write_lss(lss_path, source=lss_path)
+
+        rewritten = ss.read_lss(lss_path)
+        assert len(rewritten.attempt_history) == 10
+        assert rewritten.game_icon == ss.read_lss(livesplit_vicecity).game_icon
+        assert ET.parse(lss_path).getroot().find("AutoSplitterSettings") is not None
+        assert list(tmp_path.iterdir()) == [lss_path]
+
+    def test_default_source(self, livesplit_vicecity, tmp_path):
+        # read_lss records the file it read, so unmodelled sections are kept without passing source
+        splits = ss.read_lss(livesplit_vicecity)
+        assert splits.source_path == livesplit_vicecity
+        lss_dst = tmp_path / "splits.lss"
+        splits.write_lss(lss_dst)
+        assert ET.parse(lss_dst).getroot().find("AutoSplitterSettings") is not None
+        assert lss_dst.read_bytes() == livesplit_vicecity.read_bytes().replace(b" />", b"/>")
+
+    def test_without_source(self, livesplit_vicecity, tmp_path):
+        splits = ss.from_xml(livesplit_vicecity.read_bytes())
+        assert splits.source_path is None
+        lss_dst = tmp_path / "splits.lss"
+        with pytest.warns(UserWarning, match="AutoSplitterSettings"):
+            splits.write_lss(lss_dst)
+        assert ET.parse(lss_dst).getroot().find("Metadata") is None
+        assert ss.read_lss(lss_dst, lazy_icons=False) == splits